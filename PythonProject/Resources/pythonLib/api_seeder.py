@@ -0,0 +1,317 @@
+"""
+API-level test data seeding for Robot Framework
+สร้าง state ฝั่ง server (lockout, OTP reference, test account) ผ่าน HTTP แทนการเล่น flow ผ่าน browser
+ใช้ requests.Session เดียวต่อ process (connection แบบ keep-alive ใน pool) และส่งหลาย request พร้อมกันได้
+
+    Library    api_seeder.ApiSeeder    settings_path=../LDP_UI.yaml
+
+    Suite Setup    Seed Lockout    0829999999
+    ${accounts}=    Seed Test Accounts    ${ACCOUNT_1}    ${ACCOUNT_2}
+
+base URL มาจาก ConfigReader: target ldp = LDP_environment.ldp_base_url, drdb = DRDB_environment.drdb_base_url
+(หรือระบุ URL เต็มเป็น path) endpoint ของ keyword สำเร็จรูปเปลี่ยนได้ใน section api_seeding ของ settings:
+
+    api_seeding:
+      lockout: /api/test/lockout
+      otp: /api/test/otp
+      account: /api/test/accounts
+      reset: /api/test/reset
+"""
+import sys
+import threading
+import time
+from collections.abc import Mapping
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence
+
+_lib_dir = Path(__file__).resolve().parent
+if str(_lib_dir) not in sys.path:
+    sys.path.insert(0, str(_lib_dir))
+from base_library import BaseLibrary, keyword
+from config_reader import ConfigReader
+from settings_schema import LdpEnvironment
+
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+    import requests
+
+# endpoint default ของ keyword สำเร็จรูป (override ได้ใน section api_seeding)
+DEFAULT_ENDPOINTS = {
+    'lockout': '/api/test/lockout',
+    'otp': '/api/test/otp',
+    'account': '/api/test/accounts',
+    'reset': '/api/test/reset',
+}
+POOL_SIZE = 10
+MAX_WORKERS = 8
+METHODS = ('GET', 'POST', 'PUT', 'PATCH', 'DELETE', 'HEAD', 'OPTIONS')
+ITEM_KEYS = ('method', 'path', 'json', 'target', 'expected_status')
+
+
+class SeedingError(AssertionError):
+    """request seeding ที่ไม่สำเร็จ (รวมทุก request ที่ fail ของ bulk ไว้ใน error เดียว)"""
+
+
+class ApiSeeder(BaseLibrary):
+    """
+    Robot Framework library สำหรับ seed ข้อมูลผ่าน HTTP API ของ LDP/DRDB app
+
+    - settings_path: ไฟล์ settings ที่ใช้หา base URL และ endpoint
+    - pool_size: จำนวน keep-alive connection สูงสุดต่อ host
+    - max_workers: จำนวน request ที่ส่งพร้อมกันใน bulk keyword
+    - timeout: timeout ต่อ request (วินาที, default = timeout ใน settings)
+    """
+
+    ROBOT_LIBRARY_SCOPE = 'GLOBAL'
+    ROBOT_LIBRARY_VERSION = '1.0'
+
+    def __init__(self, settings_path: Optional[str] = None, pool_size: int = POOL_SIZE,
+                 max_workers: int = MAX_WORKERS, timeout: Optional[float] = None):
+        self._config = ConfigReader()
+        if settings_path:
+            self._config.DEFAULT_SETTINGS_PATH = settings_path
+        self._pool_size = int(pool_size)
+        self._max_workers = int(max_workers)
+        self._timeout = float(timeout) if timeout else None
+        self._session: Optional["requests.Session"] = None
+        self._executor: Optional["ThreadPoolExecutor"] = None
+        self._lock = threading.Lock()
+        self._stats = {'requests': 0, 'failed': 0, 'bulk_batches': 0, 'request_seconds': 0.0,
+                       'wall_seconds': 0.0}
+        self.ROBOT_LIBRARY_LISTENER = _SeederListener(self)
+
+    # ---------- public keywords ----------
+
+    @keyword
+    def seed_request(self, method: str, path: str, json: Any = None, target: str = 'ldp',
+                     expected_status: str = '2xx') -> Any:
+        """
+        ส่ง request เดียว (path relative กับ base URL ของ target หรือ URL เต็ม) คืนค่า body (JSON ถ้าเป็น JSON)
+        expected_status: status ที่ยอมรับ เช่น 2xx, 201, 200,204
+        """
+        start = time.perf_counter()
+        item = {'method': method, 'path': path, 'json': json, 'target': target, 'expected_status': expected_status}
+        self._validate([item])
+        result = self._send(item)
+        self._add_wall(start)
+        return result
+
+    @keyword
+    def seed_requests(self, *requests: Dict[str, Any]) -> List[Any]:
+        """
+        ส่งหลาย request พร้อมกัน (แต่ละตัวเป็น dict: method, path, json, target, expected_status)
+        คืนค่า body ตามลำดับเดิม; ถ้ามี request ที่ fail จะ fail หลังทุก request เสร็จ โดยรายงานทุกตัวที่ fail
+        request ที่ไม่ถูกต้อง (ไม่ใช่ dict, ไม่มี path, method ไม่รู้จัก) ทำให้ fail ก่อนส่ง request ใดๆ
+        """
+        return self._send_all(list(requests))
+
+    @keyword
+    def seed_lockout(self, phone: str, attempts: int = 5, target: str = 'ldp') -> Any:
+        """สร้าง state lockout ของเบอร์โทร (เหมือนกรอกผิด attempts ครั้ง) โดยไม่ผ่าน UI"""
+        return self.seed_request('POST', self._endpoint('lockout'), {'phone': phone, 'attempts': int(attempts)},
+                                 target)
+
+    @keyword
+    def seed_otp_reference(self, phone: str, target: str = 'ldp') -> Any:
+        """ขอ OTP reference ของเบอร์โทร คืนค่า body ของ response (เช่น reference code และ OTP)"""
+        return self.seed_request('POST', self._endpoint('otp'), {'phone': phone}, target)
+
+    @keyword
+    def seed_test_accounts(self, *accounts: Dict[str, Any], target: str = 'ldp') -> List[Any]:
+        """สร้าง test account หลายรายการพร้อมกัน (แต่ละรายการเป็น dict ของ field) คืนค่า body ตามลำดับ"""
+        endpoint = self._endpoint('account')
+        return self._send_all([{'method': 'POST', 'path': endpoint, 'json': dict(account), 'target': target}
+                               for account in accounts])
+
+    @keyword
+    def reset_seeded_state(self, target: str = 'ldp') -> Any:
+        """ล้าง state ที่ seed ไว้ทั้งหมดบน server"""
+        return self.seed_request('POST', self._endpoint('reset'), None, target)
+
+    @keyword
+    def get_seeding_stats(self) -> Dict[str, Any]:
+        """
+        จำนวน request/ที่ fail/bulk batch, เวลารวมของ request กับ wall time
+        และจำนวน connection ที่เปิดจริง (น้อยกว่า requests = keep-alive ถูกใช้ซ้ำ)
+        """
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+        stats['connections_opened'] = self._connections_opened()
+        return stats
+
+    @keyword
+    def close_seeding_session(self) -> None:
+        """ปิด connection ทั้งหมดใน pool (เรียกอัตโนมัติตอนจบ run)"""
+        with self._lock:
+            session, self._session = self._session, None
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        if session is not None:
+            session.close()
+
+    # ---------- internal helpers ----------
+
+    @staticmethod
+    def _validate(items: List[Any]) -> None:
+        """ตรวจทุก item ก่อนส่ง: รายงานทุกตัวที่ผิดใน SeedingError เดียว"""
+        problems = []
+        for index, item in enumerate(items):
+            if not isinstance(item, Mapping):
+                problems.append(f"#{index + 1} expected a dictionary, got {type(item).__name__}: {item!r}")
+                continue
+            unknown = sorted(str(key) for key in item if key not in ITEM_KEYS)
+            if unknown:
+                problems.append(f"#{index + 1} unknown key(s) {', '.join(unknown)}; expected {', '.join(ITEM_KEYS)}")
+            if not str(item.get('path') or '').strip():
+                problems.append(f"#{index + 1} missing 'path'")
+            method = str(item.get('method') or 'POST').upper()
+            if method not in METHODS:
+                problems.append(f"#{index + 1} unknown method {method!r}; expected one of {', '.join(METHODS)}")
+        if problems:
+            raise SeedingError("Invalid seeding request(s), nothing was sent:\n  " + "\n  ".join(problems))
+
+    def _send_all(self, items: List[Any]) -> List[Any]:
+        if not items:
+            return []
+        self._validate(items)
+        items = [dict(item) for item in items]
+        start = time.perf_counter()
+        outcomes: Sequence[Any]
+        if len(items) == 1 or self._max_workers <= 1:
+            outcomes = [self._outcome(item) for item in items]
+        else:
+            outcomes = list(self._pool().map(self._outcome, items))
+        with self._lock:
+            self._stats['bulk_batches'] += 1
+        self._add_wall(start)
+        failures = [f"#{index + 1} {error}" for index, (ok, error) in enumerate(outcomes) if not ok]
+        if failures:
+            raise SeedingError(f"{len(failures)}/{len(items)} seeding request(s) failed:\n  " + "\n  ".join(failures))
+        return [result for _, result in outcomes]
+
+    def _outcome(self, item: Dict[str, Any]):
+        """(สำเร็จหรือไม่, body หรือข้อความ error) เพื่อให้ bulk รายงานได้ครบทุก request"""
+        try:
+            return True, self._send(item)
+        except SeedingError as error:
+            return False, str(error)
+        except Exception as error:
+            # error ที่ไม่คาดไว้ของ request หนึ่งต้องไม่ทำให้ผลของ request อื่นใน bulk หายไป
+            return False, f"{item.get('method', 'POST')} {item.get('path')}: {type(error).__name__}: {error}"
+
+    def _send(self, item: Dict[str, Any]) -> Any:
+        import requests
+
+        method = str(item.get('method') or 'POST').upper()
+        url = self._url(item.get('target', 'ldp'), str(item['path']))
+        start = time.perf_counter()
+        try:
+            response = self._get_session().request(method, url, json=item.get('json'),
+                                                   timeout=self._request_timeout())
+        except requests.RequestException as error:
+            self._count(start, failed=True)
+            raise SeedingError(f"{method} {url}: {error}") from None
+        if not self._status_ok(response.status_code, str(item.get('expected_status') or '2xx')):
+            self._count(start, failed=True)
+            raise SeedingError(f"{method} {url}: HTTP {response.status_code} {response.text[:200]}")
+        body: Any = None
+        if response.content:
+            if 'json' in response.headers.get('Content-Type', ''):
+                try:
+                    body = response.json()
+                except ValueError as error:
+                    self._count(start, failed=True)
+                    raise SeedingError(f"{method} {url}: invalid JSON response ({error}): "
+                                       f"{response.text[:200]}") from None
+            else:
+                body = response.text
+        self._count(start)
+        return body
+
+    @staticmethod
+    def _status_ok(status: int, expected: str) -> bool:
+        for part in expected.split(','):
+            part = part.strip().lower()
+            if part.endswith('xx') and str(status)[0] == part[0]:
+                return True
+            if part.isdigit() and int(part) == status:
+                return True
+        return False
+
+    def _url(self, target: str, path: str) -> str:
+        if '://' in path:
+            return path
+        target = str(target).lower()
+        if target == 'ldp':
+            base = self._config.get_ldp_base_url()
+        elif target == 'drdb':
+            base = self._config.get_drdb_base_url()
+        else:
+            base = target
+        if '://' not in base:
+            raise SeedingError(f"Base URL for target '{target}' is not an http(s) URL: {base!r}")
+        return base.rstrip('/') + '/' + path.lstrip('/')
+
+    def _endpoint(self, name: str) -> str:
+        return self._config.get_setting('api_seeding', name, default=DEFAULT_ENDPOINTS[name])
+
+    def _request_timeout(self) -> float:
+        if self._timeout is not None:
+            return self._timeout
+        return float(LdpEnvironment.coerce_field('timeout', self._config.get_timeout()))
+
+    def _get_session(self) -> "requests.Session":
+        if self._session is None:
+            # import ตอนใช้ครั้งแรก (requests ใช้เวลา import นาน)
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            with self._lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self._pool_size, pool_block=True)
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    self._session = session
+        return self._session
+
+    def _pool(self) -> "ThreadPoolExecutor":
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            with self._lock:
+                if self._executor is None:
+                    # ไม่เกินขนาด connection pool: thread ที่เกินจะรอ connection อยู่ดี
+                    self._executor = ThreadPoolExecutor(max_workers=min(self._max_workers, self._pool_size),
+                                                        thread_name_prefix='api-seeder')
+        return self._executor
+
+    def _connections_opened(self) -> int:
+        session = self._session
+        if session is None:
+            return 0
+        adapters = {id(adapter): adapter for adapter in session.adapters.values()}.values()
+        return sum(pool.num_connections for adapter in adapters
+                   for pool in list(adapter.poolmanager.pools._container.values()))
+
+    def _count(self, start: float, failed: bool = False) -> None:
+        with self._lock:
+            self._stats['requests'] += 1
+            self._stats['request_seconds'] += time.perf_counter() - start
+            if failed:
+                self._stats['failed'] += 1
+
+    def _add_wall(self, start: float) -> None:
+        with self._lock:
+            self._stats['wall_seconds'] += time.perf_counter() - start
+
+
+class _SeederListener:
+    """library listener: ปิด connection pool ตอนจบ run"""
+    ROBOT_LISTENER_API_VERSION = 3
+
+    def __init__(self, seeder: ApiSeeder):
+        self.seeder = seeder
+
+    def close(self):
+        self.seeder.close_seeding_session()
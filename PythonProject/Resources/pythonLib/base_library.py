@@ -2,18 +2,162 @@
 Base Library for Robot Framework
 Contains shared functionality for configuration and settings management
 """
-import yaml
+import hashlib
+import itertools
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+import instrumentation
+from settings_layers import (LAYERS_ENV, FrozenSettings, deep_merge, describe_layers, env_layer_data,
+                             env_layer_items, env_layer_prefix, layer_list, parse_layers)
+from settings_schema import SchemaSection, compile_settings
+from shared_settings import (SnapshotSettings, attach_snapshot, private_dir, shared_snapshot_dir,
+                             snapshot_file, write_snapshot)
+
+_yaml_loader_class = None
+
+
+def keyword(func):
+    """
+    เทียบเท่า robot.api.decorators.keyword แบบไม่มี argument
+    (ไม่ต้อง import robot ตอนโหลด library: CLI/benchmark/variable file import ได้เร็ว)
+    """
+    func.robot_name = None
+    func.robot_tags = ()
+    func.robot_types = ()
+    return func
+
+
+# ไม่ให้ตัว decorator เองกลายเป็น keyword เมื่อ library ถูก import เป็น module (by path)
+keyword.robot_not_keyword = True
+
+
+def _yaml_loader():
+    """
+    YAML loader class; yaml ถูก import ตอน parse ไฟล์ครั้งแรก (ไม่ใช่ตอน import library)
+    ใช้ libyaml (C) loader ถ้ามี ซึ่งเร็วกว่า pure-Python หลายเท่า
+    """
+    global _yaml_loader_class
+    if _yaml_loader_class is None:
+        import yaml
+        _yaml_loader_class = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    return _yaml_loader_class
+
+
+def _load_yaml(raw: bytes) -> Any:
+    import yaml
+    return yaml.load(raw, Loader=_yaml_loader()) or {}
+
+_MISSING = object()
+# เปิดใช้ snapshot ของ settings ที่ parse แล้ว: "1"/"true" = เก็บข้างไฟล์ YAML, ค่าอื่น = path ของ cache dir
+SNAPSHOT_ENV = 'ROBOT_SETTINGS_SNAPSHOT'
+_SNAPSHOT_SUBDIR = '.settings_snapshot'
+# เลข version ของ settings ที่โหลด (เพิ่มขึ้นทุกครั้งที่ parse ใหม่) ใช้ตรวจว่าค่าที่ได้มาจากการโหลดรอบเดียวกันหรือไม่
+_settings_versions = itertools.count(1)
+
+
+def _flatten_settings(data: Any) -> Tuple[Dict[str, Any], bool]:
+    """
+    Compile nested settings into a flat {"Section.key.sub": value} index
+    (list items are indexed by position, e.g. "Section.items.0").
+
+    Returns (index, exact). exact is False when some key cannot be expressed
+    unambiguously as a dotted path (non-string key or key containing '.');
+    lookups then fall back to walking the nested dicts.
+    """
+    index: Dict[str, Any] = {}
+    exact = True
+    stack = [('', data)]
+    while stack:
+        prefix, value = stack.pop()
+        if isinstance(value, dict):
+            items = value.items()
+        elif isinstance(value, (list, tuple)):
+            items = enumerate(value)
+        else:
+            continue
+        for key, child in items:
+            if isinstance(key, str):
+                if '.' in key:
+                    exact = False
+            elif not isinstance(key, int) or isinstance(value, dict):
+                exact = False
+            path = f"{prefix}.{key}" if prefix else str(key)
+            index[path] = child
+            stack.append((path, child))
+    return index, exact
+
+
+class _SettingsEntry:
+    """Parsed settings file together with the stat() signature it was loaded from"""
+    __slots__ = ('_data', 'signature', 'checked_at', 'index', 'exact', 'version', 'typed')
+
+    def __init__(self, data: Mapping, signature: Tuple[int, int, int],
+                 index: Optional[Dict[str, Any]] = None, exact: bool = True):
+        self._data = data
+        self.signature = signature
+        self.checked_at = time.monotonic()
+        if index is None:
+            index, exact = _flatten_settings(data)
+        self.index, self.exact = index, exact
+        self.version = next(_settings_versions)
+        # schema -> {section: SchemaSection} ที่ compile แล้ว (ดู BaseLibrary.SETTINGS_SCHEMA)
+        self.typed: Dict[Any, Any] = {}
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        """
+        Top-level settings as a real dict. A shared snapshot (SnapshotSettings) is turned into
+        a dict on first use only: dotted-path lookups go through the index and never need it.
+        """
+        if not isinstance(self._data, dict):
+            self._data = dict(self._data)
+        return self._data
+
 
 class BaseLibrary:
     ROBOT_LIBRARY_SCOPE = 'GLOBAL'
     ROBOT_LIBRARY_VERSION = '1.0'
-    
+
+    DEFAULT_SETTINGS_PATH = "Environment/DRDB_Config.yaml"
+    # จำนวนไฟล์ settings สูงสุดที่เก็บไว้ใน cache (LRU)
+    SETTINGS_CACHE_SIZE = 8
+    # ตรวจ stat() ไฟล์ซ้ำได้ไม่เกินทุกกี่วินาที (0 = ตรวจทุกครั้งที่เรียก)
+    SETTINGS_CHECK_INTERVAL = 1.0
+    # โฟลเดอร์เก็บ snapshot (pickle) ของ settings ที่ parse แล้ว; None = ใช้ค่าจาก ROBOT_SETTINGS_SNAPSHOT
+    SETTINGS_SNAPSHOT_DIR: Optional[str] = None
+    # schema ของ section แบบ typed (settings_schema) เช่น CONFIG_SCHEMA; None = ไม่ compile/validate
+    SETTINGS_SCHEMA: Optional[Tuple[Tuple[str, type], ...]] = None
+    # จำนวนผล merge ของ layer (ต่อ prefix ของ layer) ที่เก็บไว้ใช้ซ้ำ
+    SETTINGS_MERGE_CACHE_SIZE = 32
+
     # ใช้ Class Variables เก็บ Cache เพื่อให้ทุก Instance ใช้ร่วมกันได้
-    _settings_cache: Optional[Dict[str, Any]] = None
+    # key = resolved path ของไฟล์ settings, value = _SettingsEntry
+    _settings_cache: "OrderedDict[Path, _SettingsEntry]" = OrderedDict()
+    _settings_files: Dict[str, Path] = {}
+    _cache_stats: Dict[str, int] = {'hits': 0, 'misses': 0, 'reloads': 0, 'evictions': 0,
+                                    'snapshot_loads': 0, 'shared_attaches': 0, 'layer_merges': 0}
+    # overlay บนไฟล์ settings (ดู settings_layers); None = ยังไม่ได้อ่าน ROBOT_SETTINGS_LAYERS
+    _settings_layers: Optional[Tuple[str, ...]] = None
+    # layer (Path ของไฟล์ หรือ "env:PREFIX") -> (signature, ข้อมูลที่ parse แล้ว)
+    _layer_data: Dict[Any, Tuple[Any, Dict[str, Any]]] = {}
+    # prefix ของ layer ((layer, signature), ...) -> ผล merge ถึง layer นั้น
+    _merged_prefixes: "OrderedDict[Tuple[Tuple[Any, Any], ...], FrozenSettings]" = OrderedDict()
+    _cache_lock = threading.RLock()
     _project_root: Optional[Path] = None
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # instrumentation เป็น opt-in: ถ้าไม่ได้เปิดไว้ method จะไม่ถูกห่อเลย
+        if instrumentation.enabled():
+            instrumentation.instrument_class(cls)
+
     def get_project_root(self) -> Path:
         """Get project root directory (Instance Method)"""
         if BaseLibrary._project_root is None:
@@ -21,37 +165,40 @@ class BaseLibrary:
             BaseLibrary._project_root = Path(__file__).resolve().parent.parent.parent
         return BaseLibrary._project_root
 
-    def load_settings(self, settings_path: str = "Environment/DRDB_Config.yaml") -> Dict[str, Any]:
-        """Load settings from YAML file (cached)"""
-        if BaseLibrary._settings_cache is not None:
-            return BaseLibrary._settings_cache
-        
-        settings_file = self.resolve_path(settings_path)
-        
-        if not settings_file.exists():
-            raise FileNotFoundError(f"Settings file not found: {settings_file}")
-        
-        with open(settings_file, 'r', encoding='utf-8') as f:
-            BaseLibrary._settings_cache = yaml.safe_load(f)
-        
-        return BaseLibrary._settings_cache
-
-    def get_setting(self, *keys: str, default: Any = None) -> Any:
+    def load_settings(self, settings_path: Optional[str] = None) -> Dict[str, Any]:
+        """Load settings from YAML file (cached per file, reloaded only when the file changes on disk)"""
+        return self._get_settings_entry(settings_path).data
+
+    def get_setting(self, *keys: str, default: Any = None, settings_path: Optional[str] = None) -> Any:
         """Get nested setting value by keys"""
-        value = self.load_settings()
-        for key in keys:
-            if isinstance(value, dict):
-                value = value.get(key, default)
-            else:
-                return default
-        return value
+        if not keys:
+            return self.load_settings(settings_path)
+        try:
+            path = '.'.join(keys)
+        except TypeError:
+            path = '.'.join(map(str, keys))
+        return self._lookup_setting(path, default, settings_path, keys)
+
+    def get_typed_section(self, name: str, settings_path: Optional[str] = None) -> SchemaSection:
+        """Get a settings section as a read-only object with typed fields (requires SETTINGS_SCHEMA)"""
+        if self.SETTINGS_SCHEMA is None:
+            raise ValueError(f"{type(self).__name__} has no SETTINGS_SCHEMA")
+        sections = self._typed_settings(settings_path)
+        try:
+            return sections[name]
+        except KeyError:
+            raise KeyError(f"Section '{name}' is not in the settings schema") from None
 
     def get_timeout(self) -> int:
         """Get timeout from settings"""
+        if self.SETTINGS_SCHEMA is not None:
+            return self._typed_settings(None)['LDP_environment'].timeout
         return self.get_setting('LDP_environment', 'timeout', default=30)
 
     def get_implicit_wait(self) -> int:
         """Get implicit wait from settings"""
+        if self.SETTINGS_SCHEMA is not None:
+            return self._typed_settings(None)['LDP_environment'].implicit_wait
         return self.get_setting('LDP_environment', 'implicit_wait', default=10)
 
     def resolve_path(self, relative_path: str) -> Path:
@@ -61,6 +208,292 @@ class BaseLibrary:
             return path
         return self.get_project_root() / relative_path
 
-    def clear_cache(self) -> None:
-        """Clear settings cache"""
-        BaseLibrary._settings_cache = None
\ No newline at end of file
+    def set_settings_layers(self, *layers: str) -> None:
+        """
+        Set the overlays merged on top of the settings file, in order (files relative to the
+        project root, or env:PREFIX for PREFIX__Section__key variables); no arguments = no overlays
+        """
+        with BaseLibrary._cache_lock:
+            BaseLibrary._settings_layers = tuple(layer_list(layers))
+
+    def get_settings_layers(self) -> List[Dict[str, Any]]:
+        """Get the active overlays (from Set Settings Layers or ROBOT_SETTINGS_LAYERS)"""
+        return list(describe_layers(self._active_layers()))
+
+    def clear_cache(self, settings_path: Optional[str] = None) -> None:
+        """Clear settings cache (all files, or only the given settings file)"""
+        with BaseLibrary._cache_lock:
+            if settings_path is None:
+                BaseLibrary._settings_cache.clear()
+                BaseLibrary._settings_files.clear()
+                BaseLibrary._layer_data.clear()
+                BaseLibrary._merged_prefixes.clear()
+            else:
+                settings_file = self._settings_file(settings_path)
+                for key in [k for k in BaseLibrary._settings_cache
+                            if k == settings_file or (isinstance(k, tuple) and k[0] == settings_file)]:
+                    del BaseLibrary._settings_cache[key]
+                BaseLibrary._layer_data.pop(settings_file, None)
+
+    def get_settings_cache_stats(self, reset: bool = False) -> Dict[str, Any]:
+        """Get hit/miss/reload/eviction counters of the settings cache"""
+        with BaseLibrary._cache_lock:
+            stats: Dict[str, Any] = dict(BaseLibrary._cache_stats)
+            stats['size'] = len(BaseLibrary._settings_cache)
+            stats['files'] = [str(key) if isinstance(key, Path) else f"{key[0]} + {', '.join(key[1])}"
+                              for key in BaseLibrary._settings_cache]
+            if reset:
+                for name in BaseLibrary._cache_stats:
+                    BaseLibrary._cache_stats[name] = 0
+        return stats
+
+    def get_library_metrics(self, reset: bool = False) -> Dict[str, Any]:
+        """
+        Get call counts/timings of library methods and settings cache hit ratio
+        (requires ROBOT_LIBRARY_METRICS=1 or the instrumentation.MetricsListener listener)
+        """
+        metrics = instrumentation.diff(instrumentation.snapshot(), {'timers': {}, 'cache': {}})
+        metrics['enabled'] = instrumentation.enabled()
+        if reset:
+            instrumentation.reset()
+        return metrics
+
+    # ---------- internal helpers ----------
+
+    def _settings_file(self, settings_path: Optional[str]) -> Path:
+        """Resolved absolute path of a settings file (memoized per path string)"""
+        settings_path = settings_path or self.DEFAULT_SETTINGS_PATH
+        settings_file = BaseLibrary._settings_files.get(settings_path)
+        if settings_file is None:
+            settings_file = self.resolve_path(settings_path).resolve()
+            BaseLibrary._settings_files[settings_path] = settings_file
+        return settings_file
+
+    def _lookup_setting(self, path: str, default: Any = None, settings_path: Optional[str] = None,
+                        keys: Optional[Tuple[Any, ...]] = None) -> Any:
+        """Look up a dotted path in the flat index (walk the dicts only if the index is not exact)"""
+        entry = self._get_settings_entry(settings_path)
+        value = entry.index.get(path, _MISSING)
+        if value is not _MISSING:
+            return value
+        if keys is None:
+            # normalize paths such as ".Section..key"
+            keys = tuple(p for p in path.split('.') if p)
+            if not keys:
+                return entry.data
+            value = entry.index.get('.'.join(keys), _MISSING)
+            if value is not _MISSING:
+                return value
+        if entry.exact:
+            return default
+        value = entry.data
+        for key in keys:
+            if isinstance(value, Mapping):
+                value = value.get(key, default)
+            else:
+                return default
+        return value
+
+    def _typed_settings(self, settings_path: Optional[str]) -> Dict[str, SchemaSection]:
+        """Sections compiled with SETTINGS_SCHEMA (compiled once per loaded file, normally at load time)"""
+        entry = self._get_settings_entry(settings_path)
+        sections = entry.typed.get(self.SETTINGS_SCHEMA)
+        if sections is None:
+            # entry ถูกโหลดโดย library อื่นที่ไม่มี schema หรือใช้ schema ต่างกัน
+            sections = self._compile_typed(entry, self._settings_file(settings_path))
+        return sections
+
+    def _compile_typed(self, entry: _SettingsEntry, settings_file: Path) -> Dict[str, SchemaSection]:
+        sections = compile_settings(entry.data, self.SETTINGS_SCHEMA, settings_file)
+        entry.typed[self.SETTINGS_SCHEMA] = sections
+        return sections
+
+    def _active_layers(self) -> Tuple[str, ...]:
+        layers = BaseLibrary._settings_layers
+        if layers is None:
+            layers = BaseLibrary._settings_layers = parse_layers(os.environ.get(LAYERS_ENV))
+        return layers
+
+    def _get_settings_entry(self, settings_path: Optional[str]) -> _SettingsEntry:
+        settings_file = self._settings_file(settings_path)
+        layers = BaseLibrary._settings_layers
+        if layers is None:
+            layers = self._active_layers()
+        # settings แบบมี overlay ถูก cache แยกตามชุดของ layer (สลับ environment ไปมาได้โดยไม่ merge ใหม่)
+        key = (settings_file, layers) if layers else settings_file
+        entry = BaseLibrary._settings_cache.get(key)
+        if entry is not None and time.monotonic() - entry.checked_at < self.SETTINGS_CHECK_INTERVAL:
+            BaseLibrary._cache_stats['hits'] += 1
+            return entry
+        if layers:
+            signature = self._layered_signature(settings_file, layers)
+        else:
+            signature = self._file_signature(settings_file)
+
+        cache = BaseLibrary._settings_cache
+        stats = BaseLibrary._cache_stats
+        with BaseLibrary._cache_lock:
+            entry = cache.get(key)
+            if entry is not None and entry.signature == signature:
+                stats['hits'] += 1
+                entry.checked_at = time.monotonic()
+                cache.move_to_end(key)
+                return entry
+            stats['reloads' if entry is not None else 'misses'] += 1
+
+            if layers:
+                entry = self._load_layered_entry(signature)
+            else:
+                entry = self._load_settings_entry(settings_file, signature)
+            if self.SETTINGS_SCHEMA is not None:
+                # validate ตอนโหลด: ค่าผิด type error ที่นี่ (และไม่ถูกเก็บใน cache) ไม่ใช่กลาง run
+                self._compile_typed(entry, settings_file)
+            cache[key] = entry
+            cache.move_to_end(key)
+            while len(cache) > self.SETTINGS_CACHE_SIZE:
+                cache.popitem(last=False)
+                stats['evictions'] += 1
+        return entry
+
+    @staticmethod
+    def _file_signature(settings_file: Path) -> Tuple[int, int, int]:
+        try:
+            st = settings_file.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Settings file not found: {settings_file}") from None
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def _layered_signature(self, settings_file: Path, layers: Tuple[str, ...]) -> Tuple[Tuple[Any, Any], ...]:
+        """((layer, signature), ...) ของไฟล์หลักและทุก overlay (ไฟล์ overlay ที่ไม่มีอยู่ = signature None)"""
+        parts = [(settings_file, self._file_signature(settings_file))]
+        for layer in layers:
+            prefix = env_layer_prefix(layer)
+            if prefix is not None:
+                parts.append((layer, env_layer_items(prefix)))
+                continue
+            path = self.resolve_path(layer)
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                parts.append((path, None))
+            else:
+                parts.append((path, (st.st_mtime_ns, st.st_size, st.st_ino)))
+        return tuple(parts)
+
+    def _load_layered_entry(self, signature: Tuple[Tuple[Any, Any], ...]) -> _SettingsEntry:
+        """
+        Deep-merge the layers in order. The merge up to every layer is memoized by the
+        signatures of the layers so far, so only the changed layer and those after it are re-merged.
+        """
+        merged_prefixes = BaseLibrary._merged_prefixes
+        merged: Optional[FrozenSettings] = None
+        for i, (layer, layer_signature) in enumerate(signature):
+            prefix = signature[:i + 1]
+            cached = merged_prefixes.get(prefix)
+            if cached is None:
+                cached = deep_merge(merged, self._layer_settings(layer, layer_signature))
+                BaseLibrary._cache_stats['layer_merges'] += 1
+                merged_prefixes[prefix] = cached
+                while len(merged_prefixes) > self.SETTINGS_MERGE_CACHE_SIZE:
+                    merged_prefixes.popitem(last=False)
+            else:
+                merged_prefixes.move_to_end(prefix)
+            merged = cached
+        return _SettingsEntry(merged, signature)
+
+    def _layer_settings(self, layer: Any, signature: Any) -> Dict[str, Any]:
+        """Parsed data of one layer (re-parsed only when its signature changes)"""
+        cached = BaseLibrary._layer_data.get(layer)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        if isinstance(layer, str):
+            data = env_layer_data(env_layer_prefix(layer), signature)
+        elif signature is None:
+            data = {}
+        else:
+            data = self._parse_settings_file(layer)
+        if not isinstance(data, dict):
+            raise ValueError(f"Settings layer {layer} must contain a mapping, got {type(data).__name__}")
+        BaseLibrary._layer_data[layer] = (signature, data)
+        return data
+
+    def _load_settings_entry(self, settings_file: Path, signature: Tuple[int, int, int]) -> _SettingsEntry:
+        """
+        Parse a settings file into a cache entry. With ROBOT_SETTINGS_SHARED set, the
+        flat index is attached from (or first written to) a shared mmap snapshot.
+        """
+        shared_dir = shared_snapshot_dir()
+        if shared_dir is None:
+            return _SettingsEntry(self._parse_settings_file(settings_file), signature)
+
+        snapshot = snapshot_file(shared_dir, settings_file)
+        index = attach_snapshot(snapshot, signature)
+        if index is None:
+            entry = _SettingsEntry(self._parse_settings_file(settings_file), signature)
+            try:
+                write_snapshot(snapshot, signature, entry.data, entry.index, entry.exact)
+            except OSError:
+                return entry
+            index = attach_snapshot(snapshot, signature)
+            if index is None:
+                return entry
+        else:
+            BaseLibrary._cache_stats['shared_attaches'] += 1
+        return _SettingsEntry(SnapshotSettings(index), signature, index=index, exact=index.exact)
+
+    def _snapshot_dir(self, settings_file: Path) -> Optional[Path]:
+        """
+        Directory for parsed-settings snapshots, or None when snapshots are disabled
+        or the directory is not private to the current user (pickles are only loaded from there)
+        """
+        option = self.SETTINGS_SNAPSHOT_DIR or os.environ.get(SNAPSHOT_ENV, '')
+        if not option or option.lower() in ('0', 'false', 'no'):
+            return None
+        if option.lower() in ('1', 'true', 'yes'):
+            path = settings_file.parent / _SNAPSHOT_SUBDIR
+        else:
+            path = self.resolve_path(option)
+        return path if private_dir(path) else None
+
+    def _parse_settings_file(self, settings_file: Path) -> Dict[str, Any]:
+        """
+        Parse a YAML settings file. When snapshots are enabled the parsed tree is
+        pickled under the content hash of the file, so later processes that see
+        the same content skip YAML parsing entirely.
+        """
+        raw = settings_file.read_bytes()
+        snapshot_dir = self._snapshot_dir(settings_file)
+        if snapshot_dir is None:
+            return _load_yaml(raw)
+
+        # ชื่อ snapshot ผูกกับ path เต็มของ YAML: ไฟล์ชื่อเดียวกันคนละ directory ที่ใช้ snapshot dir ร่วมกันไม่ลบของกันและกัน
+        path_digest = hashlib.blake2b(str(settings_file.resolve()).encode('utf-8'), digest_size=8).hexdigest()
+        prefix = f"{settings_file.name}.{path_digest}"
+        digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+        snapshot = snapshot_dir / f"{prefix}.{digest}.pickle"
+        try:
+            with open(snapshot, 'rb') as f:
+                if not hasattr(os, 'getuid') or os.fstat(f.fileno()).st_uid == os.getuid():
+                    data = pickle.load(f)
+                    BaseLibrary._cache_stats['snapshot_loads'] += 1
+                    return data
+        except Exception:
+            # ไม่มีไฟล์ หรือ snapshot เสีย (truncate, class ที่ไม่มีแล้ว ฯลฯ) = cache miss: parse YAML แล้วเขียนทับ
+            pass
+
+        data = _load_yaml(raw)
+        try:
+            for stale in snapshot_dir.glob(f"{prefix}.*.pickle"):
+                stale.unlink(missing_ok=True)
+            tmp = snapshot.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp, 'wb') as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, snapshot)
+        except OSError:
+            # snapshot เป็นแค่ตัวเร่ง ถ้าเขียนไม่ได้ (read-only share ฯลฯ) ก็ใช้ค่าที่ parse แล้วต่อ
+            pass
+        return data
+
+
+if instrumentation.enabled():
+    instrumentation.instrument_class(BaseLibrary)
@@ -0,0 +1,227 @@
+"""
+Browser state snapshots for Robot Framework
+เก็บ state ของ browser (cookies, localStorage, sessionStorage, URL ปัจจุบัน และ JavaScript global ที่ระบุ)
+หลัง setup ที่แพง (เช่น login หรือกรอกผิดจน lockout) แล้ว restore เข้า browser ใหม่หรือจาก pool ในขั้นเดียว
+test ถัดไปจึงเริ่มจาก state ที่รู้แน่นอนโดยไม่ต้องเล่น flow ผ่าน UI ซ้ำ
+
+    Library    browser_state.BrowserState    settings_path=../LDP_UI.yaml
+
+    Restore Or Create Browser State    locked_out    Trigger Phone Lockout    globals=attemptCount,lockoutTime
+    Go To    ${BASE_URL}account_locked.html
+
+snapshot ถูก cache ในหน่วยความจำตลอด run (ใช้ร่วมกันทุก suite ใน process) และถูกทิ้งทั้งหมดเมื่อ base URL
+เปลี่ยน (${BASE_URL} ถ้ามี ไม่งั้น LDP_environment.ldp_base_url ของ settings_path)
+"""
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+
+_lib_dir = Path(__file__).resolve().parent
+if str(_lib_dir) not in sys.path:
+    sys.path.insert(0, str(_lib_dir))
+from base_library import BaseLibrary, keyword
+from config_reader import ConfigReader
+
+# อ่าน URL, storage ทั้งสองแบบ และ global ที่ระบุใน round trip เดียว
+_CAPTURE_JS = """
+function dump(storage) {
+    var data = {};
+    try {
+        for (var i = 0; i < storage.length; i++) { var k = storage.key(i); data[k] = storage.getItem(k); }
+    } catch (e) {}
+    return data;
+}
+var globals = {};
+arguments[0].forEach(function(name) {
+    if (typeof window[name] !== 'undefined') { globals[name] = JSON.stringify(window[name]); }
+});
+return {url: window.location.href, local: dump(window.localStorage), session: dump(window.sessionStorage),
+        globals: globals};
+"""
+
+# แทน storage ทั้งหมดของ origin ด้วยค่าใน snapshot
+_RESTORE_STORAGE_JS = """
+function load(storage, data) {
+    storage.clear();
+    Object.keys(data).forEach(function(k) { storage.setItem(k, data[k]); });
+}
+load(window.localStorage, arguments[0]);
+load(window.sessionStorage, arguments[1]);
+"""
+
+_RESTORE_GLOBALS_JS = """
+var globals = arguments[0];
+Object.keys(globals).forEach(function(name) { window[name] = JSON.parse(globals[name]); });
+"""
+
+# field ของ cookie ที่ add_cookie รับ (get_cookies อาจคืน field อื่นที่บาง driver ไม่รับ)
+_COOKIE_FIELDS = ('name', 'value', 'path', 'domain', 'secure', 'httpOnly', 'expiry', 'sameSite')
+
+
+class BrowserSnapshot(NamedTuple):
+    name: str
+    base_url: str
+    url: str
+    cookies: Tuple[Dict[str, Any], ...]
+    local_storage: Dict[str, str]
+    session_storage: Dict[str, str]
+    # ชื่อ global -> ค่าแบบ JSON
+    globals: Dict[str, str]
+    captured: float
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+class BrowserState(BaseLibrary):
+    """
+    Robot Framework library สำหรับ capture/restore state ของ browser ปัจจุบันของ SeleniumLibrary
+    base URL มาจาก ${BASE_URL} หรือ ConfigReader (LDP_environment.ldp_base_url) ของ settings_path
+    """
+
+    ROBOT_LIBRARY_SCOPE = 'GLOBAL'
+    ROBOT_LIBRARY_VERSION = '1.0'
+
+    # snapshot ใช้ร่วมกันทุก instance/suite ใน process
+    _snapshots: Dict[str, BrowserSnapshot] = {}
+    _snapshots_base_url: Optional[str] = None
+    _snapshots_lock = threading.Lock()
+
+    def __init__(self, settings_path: Optional[str] = None):
+        self._config = ConfigReader()
+        if settings_path:
+            self._config.DEFAULT_SETTINGS_PATH = settings_path
+        self._stats = {'captured': 0, 'restored': 0, 'misses': 0, 'invalidated': 0, 'restore_seconds': 0.0}
+
+    # ---------- public keywords ----------
+
+    @keyword
+    def capture_browser_state(self, name: str, globals: Optional[str] = None) -> Dict[str, Any]:
+        """
+        เก็บ state ของ browser ปัจจุบันเป็น snapshot ชื่อ name (แทน snapshot ชื่อเดิม)
+        globals: ชื่อ JavaScript global ของหน้า (comma separated เช่น attemptCount,lockoutTime) ที่ต้องเก็บด้วย
+        คืนค่าสรุปของ snapshot
+        """
+        driver = self._selenium().driver
+        state = driver.execute_script(_CAPTURE_JS, self._names(globals)) or {}
+        cookies = tuple({key: cookie[key] for key in _COOKIE_FIELDS if key in cookie}
+                        for cookie in driver.get_cookies())
+        snapshot = BrowserSnapshot(name, self._base_url(), state.get('url') or driver.current_url, cookies,
+                                   dict(state.get('local') or {}), dict(state.get('session') or {}),
+                                   dict(state.get('globals') or {}), time.time())
+        with BrowserState._snapshots_lock:
+            self._check_base_url(snapshot.base_url)
+            BrowserState._snapshots[name] = snapshot
+            self._stats['captured'] += 1
+        return self._summary(snapshot)
+
+    @keyword
+    def restore_browser_state(self, name: str, url: Optional[str] = None) -> str:
+        """
+        restore snapshot ชื่อ name เข้า browser ปัจจุบัน (browser ใหม่หรือจาก pool ก็ได้):
+        แทน cookies และ storage ของ origin ด้วยค่าใน snapshot แล้วเปิด URL ของ snapshot (หรือ url ถ้ากำหนด)
+        คืนค่า URL ที่เปิด; fail ถ้าไม่มี snapshot (หรือถูกทิ้งเพราะ base URL เปลี่ยน)
+        """
+        snapshot = self._get_snapshot(name)
+        if snapshot is None:
+            raise AssertionError(f"No browser state snapshot named '{name}' for base URL {self._base_url()}")
+        start = time.perf_counter()
+        target = url or snapshot.url
+        driver = self._selenium().driver
+        origin = _origin(snapshot.url)
+        # cookies/storage ตั้งได้เฉพาะตอนอยู่ใน origin เดียวกัน; ถ้าอยู่แล้วไม่ต้องโหลดหน้าเพิ่ม
+        if _origin(driver.current_url) != origin:
+            driver.get(origin + '/')
+        driver.delete_all_cookies()
+        for cookie in snapshot.cookies:
+            driver.add_cookie(dict(cookie))
+        driver.execute_script(_RESTORE_STORAGE_JS, snapshot.local_storage, snapshot.session_storage)
+        driver.get(target)
+        if snapshot.globals:
+            driver.execute_script(_RESTORE_GLOBALS_JS, snapshot.globals)
+        self._stats['restored'] += 1
+        self._stats['restore_seconds'] += time.perf_counter() - start
+        return target
+
+    @keyword
+    def restore_or_create_browser_state(self, name: str, setup_keyword: str, *args: Any,
+                                        globals: Optional[str] = None) -> str:
+        """
+        restore snapshot ชื่อ name ถ้ามี; ถ้าไม่มีให้รัน setup_keyword (พร้อม args) แล้ว capture เป็น snapshot
+        คืนค่า 'restored' หรือ 'created'
+        """
+        if self.has_browser_state(name):
+            self.restore_browser_state(name)
+            return 'restored'
+        from robot.libraries.BuiltIn import BuiltIn
+        BuiltIn().run_keyword(setup_keyword, *args)
+        self.capture_browser_state(name, globals)
+        return 'created'
+
+    @keyword
+    def has_browser_state(self, name: str) -> bool:
+        """มี snapshot ชื่อ name ที่ใช้กับ base URL ปัจจุบันได้หรือไม่"""
+        return self._get_snapshot(name) is not None
+
+    @keyword
+    def clear_browser_states(self, *names: str) -> None:
+        """ทิ้ง snapshot ตามชื่อ (ไม่ระบุ = ทิ้งทั้งหมด)"""
+        with BrowserState._snapshots_lock:
+            if names:
+                for name in names:
+                    BrowserState._snapshots.pop(name, None)
+            else:
+                BrowserState._snapshots.clear()
+
+    @keyword
+    def get_browser_state_stats(self) -> Dict[str, Any]:
+        """จำนวน capture/restore/miss/invalidate, เวลา restore รวม และสรุปของ snapshot ที่มีอยู่"""
+        with BrowserState._snapshots_lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats['snapshots'] = [self._summary(s) for s in BrowserState._snapshots.values()]
+        return stats
+
+    # ---------- internal helpers ----------
+
+    def _get_snapshot(self, name: str) -> Optional[BrowserSnapshot]:
+        base_url = self._base_url()
+        with BrowserState._snapshots_lock:
+            self._check_base_url(base_url)
+            snapshot = BrowserState._snapshots.get(name)
+            if snapshot is None:
+                self._stats['misses'] += 1
+            return snapshot
+
+    def _check_base_url(self, base_url: str) -> None:
+        """ต้องถือ _snapshots_lock: base URL เปลี่ยน -> snapshot เดิมทั้งหมดใช้ไม่ได้"""
+        if BrowserState._snapshots_base_url != base_url:
+            if BrowserState._snapshots:
+                self._stats['invalidated'] += len(BrowserState._snapshots)
+                BrowserState._snapshots.clear()
+            BrowserState._snapshots_base_url = base_url
+
+    def _base_url(self) -> str:
+        from robot.libraries.BuiltIn import BuiltIn
+        base_url = BuiltIn().get_variable_value('${BASE_URL}')
+        return str(base_url) if base_url else self._config.get_ldp_base_url()
+
+    @staticmethod
+    def _names(value: Optional[str]) -> List[str]:
+        return [name.strip() for name in (value or '').split(',') if name.strip()]
+
+    @staticmethod
+    def _summary(snapshot: BrowserSnapshot) -> Dict[str, Any]:
+        return {'name': snapshot.name, 'url': snapshot.url, 'base_url': snapshot.base_url,
+                'cookies': len(snapshot.cookies), 'local_storage': sorted(snapshot.local_storage),
+                'session_storage': sorted(snapshot.session_storage),
+                'globals': {name: json.loads(value) for name, value in snapshot.globals.items()}}
+
+    def _selenium(self):
+        from robot.libraries.BuiltIn import BuiltIn
+        return BuiltIn().get_library_instance('SeleniumLibrary')
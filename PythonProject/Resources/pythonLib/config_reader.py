@@ -4,6 +4,7 @@ Handles reading LDP_UI.yaml and configuring browser
 """
 from typing import Any, Dict, List, Optional
 from base_library import BaseLibrary
+from settings_schema import CONFIG_SCHEMA
 
 
 class ConfigReader(BaseLibrary):
@@ -11,7 +12,7 @@ class ConfigReader(BaseLibrary):
 
     def get_browser_name(self) -> str:
         """Get default browser name from settings"""
-        return self.get_setting('browser', 'name', default='Chrome')
+        return self._section_value('browser', 'name', 'Chrome')
 
     def get_browser_options(self, browser_name: Optional[str] = None) -> Dict[str, Any]:
         """Get browser options"""
@@ -20,6 +21,8 @@ class ConfigReader(BaseLibrary):
             if browser_name in browsers:
                 return browsers[browser_name].get('options', {})
             return {}
+        if self.SETTINGS_SCHEMA is not None:
+            return dict(self.get_typed_section('browser').options)
         return self.get_setting('browser', 'options', default={})
 
     def get_test_data_file(self) -> str:
@@ -27,48 +30,79 @@ class ConfigReader(BaseLibrary):
         return self.get_setting('Input_Test_Data', 'excel_file', default='1st_rewrite_InputFileName')
     
     def get_sms_smart_username(self) -> str:
-        return self.get_setting('SMSSmart_environment', 'username', default='')
+        return self._section_value('SMSSmart_environment', 'username', '')
 
     def get_sms_smart_password(self) -> str:
-        return self.get_setting('SMSSmart_environment', 'password', default='')
+        return self._section_value('SMSSmart_environment', 'password', '')
     
     # แก้ไขจาก @classmethod เป็น Instance Method
     def get_sms_smart_url(self) -> str:
-        return self.get_setting('SMSSmart_environment', 'sms_url', default='')
+        return self._section_value('SMSSmart_environment', 'sms_url', '')
 
     def get_ldp_base_url(self) -> str:
         """Get LDP base URL from settings"""
-        return self.get_setting('LDP_environment', 'ldp_base_url', default='')
+        return self._section_value('LDP_environment', 'ldp_base_url', '')
     
     def get_drdb_base_url(self) -> str:
         """Get base URL from settings"""
-        return self.get_setting('DRDB_environment', 'drdb_base_url', default='')
+        return self._section_value('DRDB_environment', 'drdb_base_url', '')
+
+    def _section_value(self, section: str, key: str, default: Any) -> Any:
+        """อ่านจาก section แบบ typed ถ้ามี SETTINGS_SCHEMA (TypedConfigReader) ไม่งั้นอ่านค่าใน YAML ตรงๆ"""
+        if self.SETTINGS_SCHEMA is not None:
+            return getattr(self.get_typed_section(section), key)
+        return self.get_setting(section, key, default=default)
+
+
+class TypedConfigReader(ConfigReader):
+    """
+    ConfigReader ที่ validate settings ตาม CONFIG_SCHEMA ตอนโหลดไฟล์ (opt-in):
+    ค่าผิด type error ทันที และ getter คืนค่าแบบ typed (เช่น Get Timeout เป็น int)
+
+        Library    config_reader.TypedConfigReader
+    """
+
+    SETTINGS_SCHEMA = CONFIG_SCHEMA
 
 # ---------- Module-level keyword wrappers ----------
 # ส่วนนี้จะช่วยให้เรียกใช้ Keyword ได้โดยตรงหาก Import แบบ Module
+# instance ถูกสร้างตอนเรียก keyword ครั้งแรก ไม่ใช่ตอน import (libdoc/dry-run ไม่ต้องสร้าง)
+_instance: Optional[ConfigReader] = None
+
+
+def _config_reader() -> ConfigReader:
+    global _instance
+    if _instance is None:
+        _instance = ConfigReader()
+    return _instance
+
 
-_config_reader_instance = ConfigReader()
+def __getattr__(name: str) -> Any:
+    # compatibility: _config_reader_instance เคยเป็นตัวแปร module-level
+    if name == '_config_reader_instance':
+        return _config_reader()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def get_browser_name() -> str:
-    return _config_reader_instance.get_browser_name()
+    return _config_reader().get_browser_name()
 
 def get_ldp_base_url() -> str:
-    return _config_reader_instance.get_ldp_base_url()
+    return _config_reader().get_ldp_base_url()
 
 def get_drdb_base_url() -> str:
-    return _config_reader_instance.get_drdb_base_url()
+    return _config_reader().get_drdb_base_url()
 
 def get_timeout() -> int:
-    return _config_reader_instance.get_timeout()
+    return _config_reader().get_timeout()
 
 def get_implicit_wait() -> int:
-    return _config_reader_instance.get_implicit_wait()
+    return _config_reader().get_implicit_wait()
 
 def get_sms_smart_url() -> str:
-    return _config_reader_instance.get_sms_smart_url()
+    return _config_reader().get_sms_smart_url()
 
 def get_sms_smart_username() -> str:
-    return _config_reader_instance.get_sms_smart_username()
+    return _config_reader().get_sms_smart_username()
 
 def get_sms_smart_password() -> str:
-    return _config_reader_instance.get_sms_smart_password()
\ No newline at end of file
+    return _config_reader().get_sms_smart_password()
\ No newline at end of file
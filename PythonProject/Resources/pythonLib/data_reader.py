@@ -1,23 +1,56 @@
+import functools
+import hashlib
+import os
 import sys
 from pathlib import Path
-from typing import Dict, Any, Iterable, Optional
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 import re
 
 # Ensure this directory is on path so base_library can be imported when loaded by path
 _lib_dir = Path(__file__).resolve().parent
 if str(_lib_dir) not in sys.path:
     sys.path.insert(0, str(_lib_dir))
-from base_library import BaseLibrary
-try:
-    from xReader import excel  # type: ignore[import-untyped]
-except ImportError:
-    excel = None
-try:
-    from robot.api.decorators import keyword
-except ImportError:
-    def keyword(func):
-        return func
-from robot.libraries.BuiltIn import BuiltIn
+from base_library import BaseLibrary, keyword
+from path_resolver import PathResolver
+from settings_layers import env_layer_items as _env_layer_items, env_layer_prefix as _env_layer_prefix
+
+# import ของหนัก (xReader/Excel stack, robot BuiltIn) ถูกเลื่อนไปตอนใช้ครั้งแรก
+# เพื่อให้การ import library (libdoc, dry-run, CLI) เร็ว
+BuiltIn = None
+
+
+def _builtin() -> "BuiltIn":
+    global BuiltIn
+    if BuiltIn is None:
+        from robot.libraries.BuiltIn import BuiltIn
+    return BuiltIn()
+
+
+def __getattr__(name: str) -> Any:
+    """data_reader.excel (xReader) ถูก import เมื่อถูกเรียกใช้ครั้งแรก; None ถ้าไม่ได้ติดตั้ง"""
+    if name == "excel":
+        try:
+            from xReader import excel  # type: ignore[import-untyped]
+        except ImportError:
+            excel = None
+        globals()["excel"] = excel
+        return excel
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+_NON_ALNUM_RE = re.compile(r"[^A-Z0-9]+")
+_LEADING_DIGIT_RE = re.compile(r"^[0-9]")
+# บรรทัดแรกของ variable file ที่ generate จะเก็บ hash ของ YAML ต้นทางไว้ตรวจว่าต้อง generate ใหม่หรือไม่
+_VARIABLE_FILE_HASH_PREFIX = "# settings-sha256: "
+
+
+@functools.lru_cache(maxsize=4096)
+def _sanitize_name(text: str) -> str:
+    """memoized key -> ชื่อตัวแปร Robot (ดู DataReader._sanitize_key)"""
+    cleaned = _NON_ALNUM_RE.sub("_", text.upper()).strip("_")
+    if _LEADING_DIGIT_RE.match(cleaned):
+        cleaned = "_" + cleaned
+    return cleaned
 
 
 class DataReader(BaseLibrary):
@@ -26,7 +59,7 @@ class DataReader(BaseLibrary):
 
     แหล่งที่มาของคอนฟิก:
         - ใช้ BaseLibrary.load_settings(settings_path="Environment/DRDB_Config.yaml")
-          (มี cache ให้อยู่แล้ว)
+          (cache แยกตามไฟล์ และโหลดใหม่เฉพาะเมื่อไฟล์บนดิสก์เปลี่ยน)
 
     Keywords หลัก:
         - Load All Sections From Settings         -> โหลดทุก section (หรือเฉพาะที่ระบุ)
@@ -38,6 +71,13 @@ class DataReader(BaseLibrary):
     ROBOT_LIBRARY_SCOPE = 'GLOBAL'
     ROBOT_LIBRARY_VERSION = '1.0'
 
+    # (scope, section, prefix) -> settings version ที่ publish เป็นตัวแปร Robot ไปแล้ว
+    # ถ้าเรียก loader ซ้ำใน scope เดิมด้วย settings version เดิม จะข้ามการตั้งตัวแปรทั้งหมด
+    _published_versions: Dict[Tuple[str, str, Optional[str]], int] = {}
+    # อายุ (วินาที) ของ listing โฟลเดอร์ที่ build_section_paths_from_settings ใช้ตรวจไฟล์ (ใช้ร่วมกันทุก suite)
+    PATH_CACHE_TTL = 5.0
+    _path_resolver: Optional[PathResolver] = None
+
     # ---------- internal helpers (ปรับเป็น instance methods เพื่อให้ Robot สแกนเจอได้ง่าย) ----------
     
     def _sanitize_key(self, text: str) -> str:
@@ -48,21 +88,22 @@ class DataReader(BaseLibrary):
           - ตัด '_' ต้น/ท้าย
           - ถ้าขึ้นต้นด้วยตัวเลข เติม '_' นำหน้า
         """
-        up = str(text).upper()
-        cleaned = re.sub(r"[^A-Z0-9]+", "_", up).strip("_")
-        if re.match(r"^[0-9]", cleaned or ""):
-            cleaned = "_" + cleaned
-        return cleaned
+        return _sanitize_name(str(text))
 
     def _var_prefix(self, section_name: str, prefix: Optional[str]) -> str:
         return (prefix or self._sanitize_key(section_name))
 
-    def _set_robot_var(self, name: str, value: Any, scope: str = "suite"):
-        bi = BuiltIn()
+    def _scope_key(self, bi: "BuiltIn", scope: str) -> str:
+        """ระบุ scope ที่ตัวแปรจะถูกตั้ง: 'global' หรือชื่อเต็มของ suite ปัจจุบัน (${SUITE_NAME})"""
         if scope.lower() == "global":
-            bi.set_global_variable(f"${{{name}}}", value)
-        else:
-            bi.set_suite_variable(f"${{{name}}}", value)
+            return "global"
+        return str(bi.get_variable_value("${SUITE_NAME}"))
+
+    def _publish_variables(self, bi: "BuiltIn", variables: Dict[str, Any], scope: str = "suite"):
+        """ตั้งตัวแปรทั้งหมดผ่าน Set Suite/Global Variable (การข้ามตัวแปรที่ตั้งไปแล้วอยู่ที่ _set_section_variables)"""
+        setter = bi.set_global_variable if scope.lower() == "global" else bi.set_suite_variable
+        for name, value in variables.items():
+            setter(f"${{{name}}}", value)
 
     def _ensure_mapping_section(self, settings: Dict[str, Any], section: str) -> Dict[str, Any]:
         data = settings.get(section)
@@ -70,21 +111,41 @@ class DataReader(BaseLibrary):
             raise KeyError(f"Section '{section}' not found or not a mapping in settings.")
         return data
 
+    def _section_variable_table(
+        self,
+        section_name: str,
+        section_dict: Dict[str, Any],
+        prefix: Optional[str],
+    ) -> Dict[str, Any]:
+        """ชื่อตัวแปร -> ค่า ของ section: dict ทั้งก้อน (PREFIX) + รายคีย์ (PREFIX_KEY)"""
+        var_prefix = self._var_prefix(section_name, prefix)
+        variables: Dict[str, Any] = {var_prefix: section_dict}
+        for k, v in section_dict.items():
+            variables[f"{var_prefix}_{self._sanitize_key(k)}"] = v
+        return variables
+
     def _set_section_variables(
         self,
         section_name: str,
         section_dict: Dict[str, Any],
         prefix: Optional[str],
         scope: str = "suite",
+        version: Optional[int] = None,
     ):
-        """ตั้งตัวแปรให้ Robot ทั้ง dict และ each key"""
-        var_prefix = self._var_prefix(section_name, prefix)
-        # dict ทั้งก้อน
-        self._set_robot_var(var_prefix, section_dict, scope)
-        # รายคีย์
-        for k, v in section_dict.items():
-            var_name = f"{var_prefix}_{self._sanitize_key(k)}"
-            self._set_robot_var(var_name, v, scope)
+        """ตั้งตัวแปรให้ Robot ทั้ง dict และ each key (ข้ามถ้า scope นี้ได้ settings version นี้ไปแล้ว)"""
+        bi = _builtin()
+        guard = (self._scope_key(bi, scope), section_name, prefix)
+        if version is not None and DataReader._published_versions.get(guard) == version:
+            return
+        variables = self._section_variable_table(section_name, section_dict, prefix)
+        self._publish_variables(bi, variables, scope)
+        if version is not None:
+            DataReader._published_versions[guard] = version
+
+    def _get_path_resolver(self) -> PathResolver:
+        if DataReader._path_resolver is None:
+            DataReader._path_resolver = PathResolver(ttl=self.PATH_CACHE_TTL)
+        return DataReader._path_resolver
 
     # ---------- public keywords ----------
 
@@ -99,9 +160,9 @@ class DataReader(BaseLibrary):
         """
         โหลดเฉพาะ section จากไฟล์คอนฟิกของ BaseLibrary แล้วตั้งตัวแปร
         """
-        settings = self.load_settings(settings_path) if settings_path else self.load_settings()
-        section_dict = self._ensure_mapping_section(settings, section)
-        self._set_section_variables(section, section_dict, prefix, scope)
+        entry = self._get_settings_entry(settings_path)
+        section_dict = self._ensure_mapping_section(entry.data, section)
+        self._set_section_variables(section, section_dict, prefix, scope, entry.version)
         return section_dict
 
     @keyword
@@ -114,14 +175,14 @@ class DataReader(BaseLibrary):
         """
         โหลดทุก top-level section (ที่เป็น dict) จากคอนฟิก แล้วตั้งตัวแปรให้หมด
         """
-        settings = self.load_settings(settings_path) if settings_path else self.load_settings()
+        entry = self._get_settings_entry(settings_path)
         loaded: Dict[str, Dict[str, Any]] = {}
 
-        for sec, val in settings.items():
+        for sec, val in entry.data.items():
             if only_sections and sec not in only_sections:
                 continue
             if isinstance(val, dict):
-                self._set_section_variables(sec, val, None, scope)
+                self._set_section_variables(sec, val, None, scope, entry.version)
                 loaded[sec] = val
 
         if not loaded:
@@ -142,22 +203,27 @@ class DataReader(BaseLibrary):
         """
         สร้างตัวแปร PATH ให้คีย์ทุกตัวใน section โดยเอา base_dir มาต่อหน้า value
         """
-        settings = self.load_settings(settings_path) if settings_path else self.load_settings()
+        settings = self.load_settings(settings_path)
         sec_dict = self._ensure_mapping_section(settings, section)
 
         var_prefix = self._var_prefix(section, prefix)
         base = self.resolve_path(base_dir)  # ใช้ของ BaseLibrary ให้ชี้จาก project root
 
+        # resolve ทุกไฟล์ในครั้งเดียว: scandir ครั้งเดียวต่อโฟลเดอร์ (cache ไว้ PATH_CACHE_TTL วินาที)
+        resolved = self._get_path_resolver().resolve_all(
+            str(base), ((k, str(v)) for k, v in sec_dict.items() if v is not None))
+        if ensure_exists:
+            missing = [f"  {r.key}: {r.path}" for r in resolved if not r.exists]
+            if missing:
+                raise FileNotFoundError(f"{len(missing)} file(s) not found in section '{section}':\n"
+                                        + "\n".join(missing))
+
         paths: Dict[str, str] = {}
-        for k, v in sec_dict.items():
-            if v is None:
-                continue
-            p = (base / str(v)).resolve()
-            var_name = f"{var_prefix}_{self._sanitize_key(k)}{suffix}"
-            self._set_robot_var(var_name, str(p), scope)
-            paths[k] = str(p)
-            if ensure_exists and not p.exists():
-                raise FileNotFoundError(f"File not found for key '{k}': {p}")
+        variables: Dict[str, Any] = {}
+        for r in resolved:
+            variables[f"{var_prefix}_{self._sanitize_key(r.key)}{suffix}"] = r.path
+            paths[r.key] = r.path
+        self._publish_variables(_builtin(), variables, scope)
         return paths
 
     @keyword
@@ -170,10 +236,111 @@ class DataReader(BaseLibrary):
         """
         ดึงค่าแบบ dot path จากคอนฟิกของ BaseLibrary
         """
-        # ใช้ get_setting ของ BaseLibrary
-        parts = [p for p in dotted_path.split(".") if p]
-        
-        if settings_path:
-            self.load_settings(settings_path)
-            
-        return self.get_setting(*parts, default=default)
\ No newline at end of file
+        # ใช้ flat index ของ BaseLibrary (อ่านจากไฟล์ settings_path ถ้าระบุ)
+        return self._lookup_setting(dotted_path, default, settings_path)
+
+    @keyword
+    def generate_variable_file(
+        self,
+        output_path: Optional[str] = None,
+        sections: Optional[Iterable[str]] = None,
+        settings_path: Optional[str] = None,
+        force: bool = False,
+    ) -> str:
+        """
+        สร้าง Robot variable file (Python) จากคอนฟิก ให้ suite โหลดผ่าน ``Variables`` ได้ตั้งแต่ตอน parse
+        ตัวแปรมีชื่อเดียวกับที่ Load All Sections From Settings ตั้ง (เช่น INPUT_TEST_DATA_GDR_INPUTFILENAME)
+
+        ไฟล์จะถูกเขียนใหม่เฉพาะเมื่อ hash ของ YAML + overlay ที่ active (Set Settings Layers) + sections เปลี่ยน
+        (หรือ force=True); คืนค่า path ของไฟล์
+        """
+        settings_file = self._settings_file(settings_path)
+        output = Path(output_path) if output_path else settings_file.with_name(f"{settings_file.stem}_variables.py")
+        if not output.is_absolute():
+            output = self.resolve_path(str(output))
+        if isinstance(sections, str):
+            sections = [sections]
+        sections = sorted(sections) if sections else None
+        digest = self._variable_file_digest(settings_file, sections)
+        if not force and _variable_file_hash(output) == digest:
+            return str(output)
+
+        import pprint
+
+        settings = self.load_settings(settings_path)
+        variables: Dict[str, Any] = {}
+        for sec, val in settings.items():
+            if sections and sec not in sections:
+                continue
+            if isinstance(val, dict):
+                variables.update(self._section_variable_table(sec, val, None))
+            elif not sections:
+                variables[self._sanitize_key(sec)] = val
+
+        lines: List[str] = [
+            f"{_VARIABLE_FILE_HASH_PREFIX}{digest}",
+            f"# Generated by DataReader.generate_variable_file from {settings_file.name} -- do not edit.",
+            "import datetime  # noqa: F401  (repr ของค่า date/datetime จาก YAML)",
+            "",
+            f"__all__ = {pprint.pformat(sorted(variables))}",
+            "",
+        ]
+        lines += [f"{name} = {pprint.pformat(value)}" for name, value in variables.items()]
+        output.parent.mkdir(parents=True, exist_ok=True)
+        # ชื่อ temp แยกต่อ process: worker ของ pabot ทุกตัว generate ไฟล์เดียวกันพร้อมกันได้
+        tmp = output.with_name(f".{output.name}.{os.getpid()}.tmp")
+        tmp.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        tmp.replace(output)
+        return str(output)
+
+    def _variable_file_digest(self, settings_file: Path, sections: Optional[List[str]]) -> str:
+        """sha256 ของเนื้อหาที่ merge เป็น settings: ไฟล์หลัก, ทุก overlay ตามลำดับ (ไฟล์หรือ env:) และ sections"""
+        sha = hashlib.sha256(settings_file.read_bytes())
+        for layer in self._active_layers():
+            prefix = _env_layer_prefix(layer)
+            if prefix is not None:
+                sha.update(repr((layer, _env_layer_items(prefix))).encode("utf-8"))
+                continue
+            path = self.resolve_path(layer)
+            sha.update(repr(str(path)).encode("utf-8"))
+            # overlay ที่ไม่มีอยู่ถูกข้ามตอน merge แต่ยังต้องแยก hash จากตอนที่มีไฟล์
+            sha.update(path.read_bytes() if path.is_file() else b"\0missing")
+        sha.update(repr(sections).encode("utf-8"))
+        return sha.hexdigest()
+
+
+def _variable_file_hash(path: Path) -> Optional[str]:
+    """hash ของ settings ที่ใช้ generate variable file นี้ (None ถ้าไม่มีไฟล์หรือไม่ใช่ไฟล์ที่ generate)"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            first_line = f.readline().rstrip("\n")
+    except OSError:
+        return None
+    if first_line.startswith(_VARIABLE_FILE_HASH_PREFIX):
+        return first_line[len(_VARIABLE_FILE_HASH_PREFIX):]
+    return None
+
+
+def _main(argv: Optional[List[str]] = None) -> int:
+    """CLI: python data_reader.py generate-variables [--settings PATH] [--output PATH] [--section NAME ...]"""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="data_reader.py", description="DataReader command line tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    gen = commands.add_parser("generate-variables", help="write a Robot variable file from the settings YAML")
+    gen.add_argument("--settings", dest="settings_path", default=None,
+                     help=f"settings file (default: {BaseLibrary.DEFAULT_SETTINGS_PATH} under project root)")
+    gen.add_argument("--output", dest="output_path", default=None,
+                     help="output .py file (default: <settings stem>_variables.py next to the YAML)")
+    gen.add_argument("--section", dest="sections", action="append", default=None,
+                     help="only include this section (repeatable)")
+    gen.add_argument("--force", action="store_true", help="regenerate even if the YAML hash is unchanged")
+    args = parser.parse_args(argv)
+
+    output = DataReader().generate_variable_file(args.output_path, args.sections, args.settings_path, args.force)
+    print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main())
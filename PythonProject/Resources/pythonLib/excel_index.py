@@ -0,0 +1,368 @@
+"""
+Indexed Excel test-data reader for Robot Framework
+อ่าน sheet ครั้งเดียว (openpyxl read-only) แล้วสร้าง index ตาม ID column ให้ Get Test Case Data By ID เป็น O(1)
+
+Prefetch Test Data (เช่นใน Suite Setup ก่อนเปิด browser) เริ่ม parse ทุก workbook ของ section ใน thread pool
+การอ่านครั้งแรกจะรอเฉพาะเมื่อไฟล์นั้นยัง parse ไม่เสร็จ; Get Test Data Prefetch Report บอกเวลาที่ถูกซ่อนไว้
+
+    Suite Setup    Run Keywords    Prefetch Test Data    Input_Test_Data    AND    Open Browser ...
+"""
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+_lib_dir = Path(__file__).resolve().parent
+if str(_lib_dir) not in sys.path:
+    sys.path.insert(0, str(_lib_dir))
+from base_library import BaseLibrary, keyword
+from config_reader import ConfigReader
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+
+def _normalize_id(value: Any) -> str:
+    """ID จาก cell -> string สำหรับใช้เป็น key (1.0 -> '1', ตัดช่องว่างหัวท้าย)"""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+class _SheetIndex:
+    """
+    ข้อมูลทั้ง sheet เก็บแบบ column-oriented (tuple ต่อ column) + dict ID -> row number
+    ใช้หน่วยความจำน้อยกว่าเก็บ dict ต่อแถว และสร้าง dict ของแถวเฉพาะตอนถูกเรียกใช้
+    """
+    __slots__ = ('headers', 'columns', 'row_of', 'signature')
+
+    def __init__(self, headers: Tuple[str, ...], columns: Tuple[Tuple[Any, ...], ...],
+                 row_of: Dict[str, int], signature: Tuple[int, int]):
+        self.headers = headers
+        self.columns = columns
+        self.row_of = row_of
+        self.signature = signature
+
+    def row(self, row_number: int) -> Dict[str, Any]:
+        return {header: column[row_number] for header, column in zip(self.headers, self.columns)}
+
+
+class _PrefetchRecord:
+    """เวลาของ workbook ที่ prefetch: parse ใน background เท่าไร และ test ต้องรอเท่าไร"""
+    __slots__ = ('source', 'started', 'finished', 'parse_seconds', 'waited_seconds', 'status')
+
+    def __init__(self, source: str):
+        self.source = source
+        self.started = self.finished = 0.0
+        self.parse_seconds = 0.0
+        self.waited_seconds = 0.0
+        self.status = 'pending'
+
+
+class ExcelIndex(BaseLibrary):
+    """
+    Robot Framework library สำหรับอ่าน test data จาก Excel ด้วย index ที่สร้างครั้งเดียวต่อไฟล์
+
+    - ไฟล์ default มาจาก ConfigReader.get_test_data_file(), sheet default มาจาก DRDB_environment.sheet_name
+    - ID column default คือ DEFAULT_ID_COLUMN (ถ้า sheet ไม่มี column นี้จะใช้ column แรก);
+      id_column ที่ระบุเองแต่ไม่มีใน sheet จะ fail ด้วย KeyError
+    - index ถูก cache ข้าม suite (class-level, LRU ไม่เกิน INDEX_CACHE_SIZE sheet)
+      และสร้างใหม่เมื่อ mtime/size ของไฟล์เปลี่ยน
+    - Prefetch Test Data สร้าง index ของทุกไฟล์ใน section ล่วงหน้าใน background
+      (thread: openpyxl ปล่อย GIL ระหว่าง I/O และ browser startup ส่วนใหญ่เป็นการรอ process/socket)
+    """
+
+    ROBOT_LIBRARY_SCOPE = 'GLOBAL'
+    ROBOT_LIBRARY_VERSION = '1.0'
+
+    DEFAULT_ID_COLUMN = 'Test_Case_ID'
+    INDEX_CACHE_SIZE = 8
+    # parse เป็นงาน CPU ของ openpyxl (ติด GIL) จึงไม่ต้องใช้หลาย thread มาก: จุดประสงค์คือ overlap กับ browser startup
+    PREFETCH_WORKERS = 2
+
+    # (file, sheet, id_column) -> _SheetIndex
+    _indexes: "OrderedDict[Tuple[str, Optional[str], Optional[str]], _SheetIndex]" = OrderedDict()
+    _index_lock = threading.Lock()
+    # index ที่กำลัง parse ใน background และเวลาของแต่ละไฟล์ที่ prefetch
+    _prefetches: Dict[Tuple[str, Optional[str], Optional[str]], "Future[_SheetIndex]"] = {}
+    _prefetch_records: Dict[Tuple[str, Optional[str], Optional[str]], _PrefetchRecord] = {}
+    _prefetch_executor: Optional["ThreadPoolExecutor"] = None
+
+    @keyword
+    def get_test_case_data_by_id(
+        self,
+        test_case_id: str,
+        file_path: Optional[str] = None,
+        sheet_name: Optional[str] = None,
+        id_column: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        คืนค่าแถวของ test case เป็น dict (header -> value) เช่น ${test_data}[ID_Card]
+        """
+        index, source = self._get_index(file_path, sheet_name, id_column)
+        row_number = index.row_of.get(_normalize_id(test_case_id))
+        if row_number is None:
+            raise KeyError(f"Test case '{test_case_id}' not found in {source}")
+        return index.row(row_number)
+
+    @keyword
+    def get_test_case_ids(
+        self,
+        file_path: Optional[str] = None,
+        sheet_name: Optional[str] = None,
+        id_column: Optional[str] = None,
+    ) -> List[str]:
+        """คืนรายการ ID ทั้งหมดใน sheet ตามลำดับแถว"""
+        index, _ = self._get_index(file_path, sheet_name, id_column)
+        return list(index.row_of)
+
+    @keyword
+    def prefetch_test_data(
+        self,
+        section: str = "Input_Test_Data",
+        base_dir: str = ".",
+        sheet_name: Optional[str] = None,
+        id_column: Optional[str] = None,
+        settings_path: Optional[str] = None,
+    ) -> List[str]:
+        """
+        เริ่มสร้าง index ของทุก workbook ใน section (ค่าเป็น path relative กับ base_dir) ใน background แล้วคืนทันที
+        ไฟล์ที่ไม่มีอยู่ถูกข้าม และ workbook ที่เกิน INDEX_CACHE_SIZE ไม่ถูก prefetch (ทั้งสองแบบแสดงใน report
+        เป็น status missing / skipped); คืนรายการไฟล์ที่เริ่ม parse
+        """
+        entries = self.get_setting(section, settings_path=settings_path)
+        if not isinstance(entries, dict):
+            raise KeyError(f"Section '{section}' not found or not a mapping in settings.")
+        base = self.resolve_path(base_dir)
+        candidates = []
+        for value in entries.values():
+            if value is None:
+                continue
+            workbook, key = self._index_key(str(base / str(value)), sheet_name, id_column)
+            source = f"{workbook} [{sheet_name or 'default sheet'}]"
+            try:
+                st = workbook.stat()
+            except FileNotFoundError:
+                self._record_unprefetched(key, source, 'missing')
+                continue
+            candidates.append((workbook, key, source, (st.st_mtime_ns, st.st_size)))
+        # index ที่ parse เสร็จเกิน INDEX_CACHE_SIZE จะถูก evict (LRU) ก่อนถูกใช้: นับเฉพาะไฟล์ที่มีอยู่จริง
+        for _, key, source, _ in candidates[self.INDEX_CACHE_SIZE:]:
+            self._record_unprefetched(key, source, 'skipped')
+        started: List[str] = []
+        for workbook, key, source, signature in candidates[:self.INDEX_CACHE_SIZE]:
+            with ExcelIndex._index_lock:
+                index = ExcelIndex._indexes.get(key)
+                if key in ExcelIndex._prefetches or (index is not None and index.signature == signature):
+                    continue
+                record = ExcelIndex._prefetch_records[key] = _PrefetchRecord(source)
+                future = self._executor().submit(self._prefetch_index, workbook, sheet_name, key[2],
+                                                 signature, record)
+                ExcelIndex._prefetches[key] = future
+            future.add_done_callback(lambda f, key=key: self._prefetch_done(key, f))
+            started.append(str(workbook))
+        return started
+
+    @keyword
+    def get_test_data_prefetch_report(self) -> Dict[str, Any]:
+        """
+        เวลาของ prefetch: background_seconds = เวลาจริง (wall clock) ที่ pool ใช้ parse,
+        waited_seconds = เวลาที่ test ต้องรอ index, hidden_seconds = background - waited
+        คือเวลา parse ที่ถูกซ่อนไว้หลัง browser startup ฯลฯ (parse_seconds ต่อไฟล์นับเวลาที่ thread แย่ง GIL กันด้วย)
+        """
+        with ExcelIndex._index_lock:
+            records = list(ExcelIndex._prefetch_records.values())
+        files = [{'source': r.source, 'status': r.status, 'parse_seconds': round(r.parse_seconds, 4),
+                  'waited_seconds': round(r.waited_seconds, 4)} for r in records]
+        background_seconds = 0.0
+        busy_until = 0.0
+        for r in sorted((r for r in records if r.finished), key=lambda r: r.started):
+            # ความยาวของ union ของช่วงเวลาที่มีไฟล์กำลัง parse อยู่
+            if r.finished > busy_until:
+                background_seconds += r.finished - max(r.started, busy_until)
+                busy_until = r.finished
+        waited_seconds = sum(r.waited_seconds for r in records)
+        return {
+            'files': files,
+            'background_seconds': round(background_seconds, 4),
+            'waited_seconds': round(waited_seconds, 4),
+            'hidden_seconds': round(max(background_seconds - waited_seconds, 0.0), 4),
+        }
+
+    @keyword
+    def clear_test_data_cache(self) -> None:
+        """ล้าง index ของทุก workbook (และยกเลิก prefetch ที่ยังไม่เริ่ม)"""
+        with ExcelIndex._index_lock:
+            ExcelIndex._indexes.clear()
+            for future in ExcelIndex._prefetches.values():
+                future.cancel()
+            ExcelIndex._prefetches.clear()
+            ExcelIndex._prefetch_records.clear()
+
+    # ---------- internal helpers ----------
+
+    def _test_data_file(self, file_path: Optional[str]) -> Path:
+        return self.resolve_path(file_path or ConfigReader().get_test_data_file()).resolve()
+
+    def _index_key(
+        self,
+        file_path: Optional[str],
+        sheet_name: Optional[str],
+        id_column: Optional[str],
+    ) -> Tuple[Path, Tuple[str, Optional[str], Optional[str]]]:
+        workbook = self._test_data_file(file_path)
+        return workbook, (str(workbook), sheet_name, id_column or None)
+
+    def _get_index(
+        self,
+        file_path: Optional[str],
+        sheet_name: Optional[str],
+        id_column: Optional[str],
+    ) -> Tuple[_SheetIndex, str]:
+        workbook, key = self._index_key(file_path, sheet_name, id_column)
+        try:
+            st = workbook.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Test data file not found: {workbook}") from None
+        signature = (st.st_mtime_ns, st.st_size)
+        source = f"{workbook} [{sheet_name or 'default sheet'}]"
+
+        with ExcelIndex._index_lock:
+            index = ExcelIndex._indexes.get(key)
+            if index is not None and index.signature == signature:
+                ExcelIndex._indexes.move_to_end(key)
+                return index, source
+            future = ExcelIndex._prefetches.get(key)
+
+        index = self._prefetched_index(key, future) if future is not None else None
+        if index is None or index.signature != signature:
+            index = self._build_index(workbook, sheet_name, key[2], signature)
+        self._store_index(key, index)
+        return index, source
+
+    def _store_index(self, key: Tuple[str, Optional[str], Optional[str]], index: _SheetIndex) -> None:
+        with ExcelIndex._index_lock:
+            ExcelIndex._indexes[key] = index
+            ExcelIndex._indexes.move_to_end(key)
+            while len(ExcelIndex._indexes) > self.INDEX_CACHE_SIZE:
+                ExcelIndex._indexes.popitem(last=False)
+
+    def _executor(self) -> "ThreadPoolExecutor":
+        if ExcelIndex._prefetch_executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            ExcelIndex._prefetch_executor = ThreadPoolExecutor(max_workers=self.PREFETCH_WORKERS,
+                                                               thread_name_prefix='excel-prefetch')
+        return ExcelIndex._prefetch_executor
+
+    @staticmethod
+    def _record_unprefetched(key: Tuple[str, Optional[str], Optional[str]], source: str, status: str) -> None:
+        record = _PrefetchRecord(source)
+        record.status = status
+        with ExcelIndex._index_lock:
+            ExcelIndex._prefetch_records[key] = record
+
+    def _prefetch_index(self, workbook: Path, sheet_name: Optional[str], id_column: Optional[str],
+                        signature: Tuple[int, int], record: _PrefetchRecord) -> _SheetIndex:
+        record.started = time.perf_counter()
+        record.status = 'parsing'
+        try:
+            index = self._build_index(workbook, sheet_name, id_column, signature)
+        except Exception:
+            record.status = 'failed'
+            raise
+        finally:
+            record.finished = time.perf_counter()
+            record.parse_seconds = record.finished - record.started
+        record.status = 'done'
+        return index
+
+    def _prefetch_done(self, key: Tuple[str, Optional[str], Optional[str]], future: "Future[_SheetIndex]") -> None:
+        """เก็บ index ที่ prefetch เสร็จเข้า cache (LRU) ทันที ไม่ต้องรอให้ test เรียกใช้"""
+        with ExcelIndex._index_lock:
+            if ExcelIndex._prefetches.get(key) is not future:
+                return
+            del ExcelIndex._prefetches[key]
+        if not future.cancelled() and future.exception() is None:
+            self._store_index(key, future.result())
+
+    def _prefetched_index(self, key: Tuple[str, Optional[str], Optional[str]],
+                          future: "Future[_SheetIndex]") -> Optional[_SheetIndex]:
+        """รอ index ที่กำลัง prefetch (บันทึกเวลารอ); None ถ้า prefetch ล้มเหลว (parse ใหม่เพื่อให้ได้ error เดิม)"""
+        start = time.perf_counter()
+        try:
+            index = future.result()
+        except Exception:
+            return None
+        finally:
+            record = ExcelIndex._prefetch_records.get(key)
+            if record is not None:
+                record.waited_seconds += time.perf_counter() - start
+        return index
+
+    def _build_index(
+        self,
+        workbook_path: Path,
+        sheet_name: Optional[str],
+        id_column: Optional[str],
+        signature: Tuple[int, int],
+    ) -> _SheetIndex:
+        """
+        อ่าน sheet แบบ streaming ครั้งเดียว แล้วสร้าง column store + ID index
+        id_column ที่ระบุต้องมีใน header; ไม่ระบุ = DEFAULT_ID_COLUMN ถ้ามี ไม่งั้น column แรก
+        """
+        try:
+            import openpyxl
+        except ImportError:
+            raise ImportError("ExcelIndex requires openpyxl (pip install openpyxl)") from None
+
+        wb = openpyxl.load_workbook(workbook_path, read_only=True, data_only=True)
+        try:
+            ws = self._select_sheet(wb, sheet_name)
+            rows = ws.iter_rows(values_only=True)
+            header_row = next(rows, None)
+            if header_row is None:
+                raise ValueError(f"Sheet '{ws.title}' in {workbook_path} is empty")
+            # ตัด column ที่ไม่มี header ออก
+            positions = [i for i, h in enumerate(header_row) if h is not None]
+            headers = tuple(str(header_row[i]).strip() for i in positions)
+            if not headers:
+                raise ValueError(f"Sheet '{ws.title}' in {workbook_path} has no header row")
+            if id_column is None:
+                id_position = headers.index(self.DEFAULT_ID_COLUMN) if self.DEFAULT_ID_COLUMN in headers else 0
+            elif id_column in headers:
+                id_position = headers.index(id_column)
+            else:
+                raise KeyError(f"ID column '{id_column}' not found in sheet '{ws.title}' of {workbook_path}. "
+                               f"Available: {', '.join(headers)}")
+
+            columns: List[List[Any]] = [[] for _ in headers]
+            row_of: Dict[str, int] = {}
+            width = len(header_row)
+            for values in rows:
+                if len(values) < width:
+                    values = tuple(values) + (None,) * (width - len(values))
+                picked = [values[i] for i in positions]
+                row_id = picked[id_position]
+                if row_id is None:
+                    continue
+                row_id = _normalize_id(row_id)
+                if row_id in row_of:
+                    continue  # ใช้แถวแรกของ ID ที่ซ้ำ
+                row_of[row_id] = len(columns[0])
+                for column, value in zip(columns, picked):
+                    column.append(value)
+        finally:
+            wb.close()
+        return _SheetIndex(headers, tuple(tuple(c) for c in columns), row_of, signature)
+
+    def _select_sheet(self, wb, sheet_name: Optional[str]):
+        if sheet_name:
+            if sheet_name not in wb.sheetnames:
+                raise KeyError(f"Sheet '{sheet_name}' not found. Available: {', '.join(wb.sheetnames)}")
+            return wb[sheet_name]
+        configured = self.get_setting('DRDB_environment', 'sheet_name')
+        if configured in wb.sheetnames:
+            return wb[configured]
+        return wb.worksheets[0]
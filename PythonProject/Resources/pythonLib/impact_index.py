@@ -0,0 +1,722 @@
+"""
+Static config/locator dependency index for impacted-test selection
+parse ไฟล์ .robot/.resource (robot.api.get_model) และ library .py (ast) แล้วหาว่าแต่ละ test ไปถึง
+config key และตัวแปร (เช่น locator ใน locators.robot) ตัวไหนบ้าง ผ่าน keyword ทุกชั้น:
+
+    - Get From Settings    Section.key         -> Section.key
+    - Load Section From Settings    Section    -> Section (ทั้ง section)
+    - ConfigReader getter (เช่น Get Ldp Base Url) -> key ที่ getter อ่าน (จาก AST: get_typed_section/get_setting)
+    - ${VARIABLE} ใน test/keyword (ตัวแปรที่นิยามจาก variable อื่นถูกเชื่อมต่อกัน)
+
+จาก diff ของ DRDB_Config.yaml / LDP_UI.yaml / locators.robot (หรือ .robot/.py อื่น) เลือกเฉพาะ test ที่ได้รับผลกระทบ:
+
+    python impact_index.py build test.robot tests/ [--cache .impact_index.json]
+    git diff | python impact_index.py affected test.robot tests/ --diff - [--format names|argfile|json]
+    python impact_index.py deps test.robot tests/ [--test NAME]
+
+ไฟล์ใน diff ถูกสร้างเวอร์ชันเก่าคืนจาก working tree (diff ต้อง apply กับไฟล์ปัจจุบันได้ เช่น git diff, git diff HEAD~1)
+แล้วเทียบ key/ตัวแปร/keyword ก่อนและหลังแก้ ตัวแปรที่ตั้งจาก settings (${SECTION_KEY} ของ settings_variables.py
+หรือ Load Section From Settings) ถูกนับเป็น config key นั้นด้วย; path ที่อ่านไม่ได้แบบ static (เช่น
+Get From Settings    ${path}) ถือว่าขึ้นกับทุก key
+
+summary ต่อไฟล์ถูก cache พร้อม signature (mtime, size): build ครั้งถัดไป parse ใหม่เฉพาะไฟล์ที่เปลี่ยน
+"""
+import argparse
+import ast
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+_lib_dir = Path(__file__).resolve().parent
+if str(_lib_dir) not in sys.path:
+    sys.path.insert(0, str(_lib_dir))
+
+DEFAULT_CACHE = '.impact_index.json'
+CACHE_VERSION = 1
+ROBOT_SUFFIXES = ('.robot', '.resource')
+CONFIG_SUFFIXES = ('.yaml', '.yml')
+# key ที่หาแบบ static ไม่ได้: test ที่มี key นี้ได้รับผลจากทุกการแก้ config
+ANY_KEY = '*'
+
+# keyword ที่อ่าน config: ชื่อ (normalized) -> วิธีแปลง argument เป็น key
+_CONFIG_KEYWORDS = {
+    'getfromsettings': 'dotted',
+    'loadsectionfromsettings': 'section',
+    'gettypedsection': 'section',
+    'getsetting': 'keys',
+}
+# method ใน library ที่อ่าน config ด้วย string literal
+_PY_SETTING_CALLS = ('get_setting', 'get_from_settings', '_lookup_setting', 'load_section_from_settings')
+_PY_SECTION_CALLS = ('get_typed_section', 'get_settings_section')
+# method ที่ argument 2 ตัวแรกเป็น section, key (ตัวถัดไปเป็น default)
+_PY_SECTION_KEY_CALLS = ('_section_value',)
+_PY_TYPED_MAPPINGS = ('_typed_settings',)
+
+_VARIABLE = re.compile(r'[$@&%]\{([^{}]+)\}')
+_BARE_VARIABLE = re.compile(r'\$([A-Za-z_]\w*)')
+_NAMED_ARGUMENT = re.compile(r'^\w+=')
+_HUNK = re.compile(r'^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@')
+
+
+def normalize(name: str) -> str:
+    """ชื่อ keyword/ตัวแปรแบบที่ Robot เทียบ (ไม่สนตัวพิมพ์, ช่องว่าง, underscore)"""
+    return re.sub(r'[\s_]', '', name).lower()
+
+
+def _variable_name(reference: str) -> str:
+    """${obj.attr} / ${list}[0] / ${var}=default -> ชื่อตัวแปรหลักแบบ normalized"""
+    return normalize(re.split(r'[.\[=+\-*/ ]', reference.strip(), maxsplit=1)[0] or reference)
+
+
+def _config_variable(key: str) -> str:
+    """config key -> ชื่อตัวแปรที่ settings_variables/Load Section From Settings ตั้ง (SECTION_KEY) แบบ normalized"""
+    return re.sub(r'[^0-9a-z]', '', key.lower())
+
+
+def _digest(parts: Iterable[str]) -> str:
+    return hashlib.blake2b('\x1f'.join(parts).encode('utf-8'), digest_size=8).hexdigest()
+
+
+def _keys_overlap(a: str, b: str) -> bool:
+    """Section กับ Section.key ขึ้นต่อกัน (prefix ตามขอบ '.')"""
+    if a == ANY_KEY or b == ANY_KEY or a == b:
+        return True
+    short, long = sorted((a, b), key=len)
+    return long.startswith(short + '.')
+
+
+# ---------- robot files ----------
+
+def _references(values: Iterable[str]) -> Set[str]:
+    refs: Set[str] = set()
+    for value in values:
+        refs.update(_variable_name(match) for match in _VARIABLE.findall(value))
+        refs.update(normalize(match) for match in _BARE_VARIABLE.findall(value))
+    return refs
+
+
+def _config_keys(call: str, args: List[str]) -> List[str]:
+    """key ที่ keyword อ่าน config (Get From Settings / Load Section From Settings / ...) ใช้"""
+    kind = _CONFIG_KEYWORDS.get(call)
+    if kind is None:
+        return []
+    positional = [arg for arg in args if not _NAMED_ARGUMENT.match(arg)]
+    if kind == 'keys':
+        literal = []
+        for arg in positional:
+            if _VARIABLE.search(arg):
+                break
+            literal.append(arg)
+        return ['.'.join(literal)] if literal and len(literal) == len(positional) else [ANY_KEY]
+    if not positional or _VARIABLE.search(positional[0]):
+        return [ANY_KEY]
+    return [positional[0]]
+
+
+def _call_names(call: str) -> List[str]:
+    """ชื่อ keyword ที่เรียก: ทั้งชื่อเต็ม (Library.Keyword) และชื่อหลัง prefix"""
+    names = [normalize(call)]
+    if '.' in call:
+        names.append(normalize(call.rsplit('.', 1)[1]))
+    return names
+
+
+def _block_summary(statements: Iterable[Any]) -> Dict[str, Any]:
+    """calls/keys/vars/digest ของ test, keyword หรือ setting ของไฟล์"""
+    from robot.api import Token
+
+    calls: Set[str] = set()
+    keys: Set[str] = set()
+    values: List[str] = []
+    parts: List[str] = []
+    for statement in statements:
+        tokens = [token for token in statement.tokens
+                  if token.type not in (Token.SEPARATOR, Token.EOL, Token.EOS, Token.COMMENT, Token.CONTINUATION)]
+        parts.append(' '.join(f"{token.type}:{token.value}" for token in tokens))
+        keyword, args = _statement_call(statement)
+        if keyword:
+            calls.update(_call_names(keyword))
+            keys.update(_config_keys(normalize(keyword.rsplit('.', 1)[-1]), args))
+            # Run Keyword / Wait Until Keyword Succeeds ฯลฯ: argument อาจเป็นชื่อ keyword
+            calls.update(normalize(arg) for arg in args if arg and not _VARIABLE.search(arg))
+        values.extend(token.value for token in tokens if token.type in (Token.ARGUMENT, Token.NAME))
+    return {'calls': sorted(calls), 'keys': sorted(keys), 'vars': sorted(_references(values)),
+            'digest': _digest(parts)}
+
+
+def _statement_call(statement: Any) -> Tuple[Optional[str], List[str]]:
+    kind = type(statement).__name__
+    if kind == 'KeywordCall':
+        return statement.keyword, list(statement.args)
+    if kind in ('Setup', 'Teardown', 'SuiteSetup', 'SuiteTeardown', 'TestSetup', 'TestTeardown'):
+        return statement.name, list(statement.args)
+    if kind in ('Template', 'TestTemplate') and statement.value:
+        return statement.value, []
+    return None, []
+
+
+def _statements(node: Any) -> Iterator[Any]:
+    """statement ทั้งหมดใน block (รวม FOR/IF/TRY ที่ซ้อนอยู่)"""
+    from robot.parsing.model.statements import Statement
+
+    for child in ast.walk(node):
+        if isinstance(child, Statement):
+            yield child
+
+
+def _resolve_import(name: str, base: Path, pythonpath: List[Path]) -> Optional[Path]:
+    name = name.replace('${CURDIR}', str(base)).replace('/', os.sep)
+    if _VARIABLE.search(name):
+        return None
+    for directory in [base] + pythonpath:
+        candidate = (directory / name)
+        if candidate.is_file():
+            return candidate.resolve()
+    return None
+
+
+def _resolve_library(name: str, base: Path, pythonpath: List[Path]) -> Optional[Path]:
+    if name.endswith('.py') or '/' in name or '${CURDIR}' in name:
+        return _resolve_import(name, base, pythonpath)
+    module = name.split('.')[0]
+    return _resolve_import(f"{module}.py", base, pythonpath)
+
+
+def summarize_robot(path: Path, text: Optional[str], pythonpath: List[Path]) -> Dict[str, Any]:
+    """
+    summary ของไฟล์ .robot/.resource (text = เนื้อหาเวอร์ชันอื่น เช่นก่อนแก้; None = อ่านจากไฟล์)
+    {'tests': {name: block}, 'keywords': {normalized: block}, 'variables': {normalized: {...}},
+     'settings': block, 'resources': [...], 'libraries': [...]}
+    """
+    from robot.api import get_model
+
+    summary: Dict[str, Any] = {'kind': 'robot', 'tests': {}, 'keywords': {}, 'variables': {},
+                               'settings': _block_summary([]), 'resources': [], 'libraries': []}
+    if text is None:
+        model = get_model(str(path), data_only=True)
+    elif text.strip():
+        model = get_model(io.StringIO(text), data_only=True)
+    else:
+        return summary
+    base = path.parent
+    for section in model.sections:
+        kind = type(section).__name__
+        if kind == 'SettingSection':
+            setting_statements = []
+            for statement in section.body:
+                statement_kind = type(statement).__name__
+                if statement_kind == 'ResourceImport' and statement.name:
+                    resolved = _resolve_import(statement.name, base, pythonpath)
+                    if resolved:
+                        summary['resources'].append(str(resolved))
+                elif statement_kind == 'LibraryImport' and statement.name:
+                    resolved = _resolve_library(statement.name, base, pythonpath)
+                    if resolved:
+                        summary['libraries'].append(str(resolved))
+                setting_statements.append(statement)
+            summary['settings'] = _block_summary(setting_statements)
+        elif kind == 'VariableSection':
+            for statement in section.body:
+                if type(statement).__name__ == 'Variable' and statement.name:
+                    values = list(statement.value)
+                    summary['variables'][_variable_name(statement.name[2:-1] if statement.name.endswith('}')
+                                                        else statement.name)] = {
+                        'name': statement.name, 'digest': _digest(values), 'vars': sorted(_references(values))}
+        elif kind == 'TestCaseSection':
+            for test in section.body:
+                if type(test).__name__ == 'TestCase':
+                    summary['tests'][test.name] = _block_summary(_statements(test))
+        elif kind == 'KeywordSection':
+            for keyword in section.body:
+                if type(keyword).__name__ == 'Keyword':
+                    block = _block_summary(_statements(keyword))
+                    block['name'] = keyword.name
+                    summary['keywords'][normalize(keyword.name)] = block
+    return summary
+
+
+# ---------- python libraries ----------
+
+class _PythonKeys(ast.NodeVisitor):
+    """config key ที่ function หนึ่งอ่านด้วย string literal และชื่อ function ที่มันเรียกต่อ"""
+
+    def __init__(self):
+        self.keys: Set[str] = set()
+        self.calls: Set[str] = set()
+        self._section_names: Dict[str, str] = {}
+        self._used_attrs: Set[int] = set()
+        self._assigned: Set[int] = set()
+
+    def collect(self, function: ast.AST) -> None:
+        for node in ast.walk(function):
+            # settings = self.get_typed_section('X') ... settings.attr
+            if (isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name)
+                    and self._section_call(node.value)):
+                self._section_names[node.targets[0].id] = self._section_call(node.value)
+                self._assigned.add(id(node.value))
+        self.visit(function)
+        # get_typed_section('X') ที่ไม่ได้อ่าน .attr และไม่ได้เก็บใส่ตัวแปร -> ทั้ง section
+        for node in ast.walk(function):
+            if id(node) not in self._used_attrs and id(node) not in self._assigned:
+                section = self._section_call(node)
+                if section is not None:
+                    self.keys.add(section)
+
+    @staticmethod
+    def _literal(node: ast.AST) -> Optional[str]:
+        return node.value if isinstance(node, ast.Constant) and isinstance(node.value, str) else None
+
+    @staticmethod
+    def _func_name(call: ast.Call) -> Optional[str]:
+        if isinstance(call.func, ast.Attribute):
+            return call.func.attr
+        if isinstance(call.func, ast.Name):
+            return call.func.id
+        return None
+
+    def _section_call(self, node: ast.AST) -> Optional[str]:
+        """get_typed_section('X') หรือ _typed_settings(...)['X'] -> 'X'"""
+        if isinstance(node, ast.Call) and self._func_name(node) in _PY_SECTION_CALLS and node.args:
+            return self._literal(node.args[0])
+        if (isinstance(node, ast.Subscript) and isinstance(node.value, ast.Call)
+                and self._func_name(node.value) in _PY_TYPED_MAPPINGS):
+            return self._literal(node.slice)
+        return None
+
+    def visit_Attribute(self, node: ast.Attribute) -> None:
+        section = self._section_call(node.value)
+        if section is None and isinstance(node.value, ast.Name):
+            section = self._section_names.get(node.value.id)
+        if section is not None:
+            self.keys.add(f"{section}.{node.attr}")
+            self._used_attrs.add(id(node.value))
+        self.generic_visit(node)
+
+    def visit_Name(self, node: ast.Name) -> None:
+        # ตัวแปร section ที่ถูกส่งต่อทั้งก้อน (ไม่ใช่ .attr) -> ทั้ง section
+        if (isinstance(node.ctx, ast.Load) and node.id in self._section_names
+                and id(node) not in self._used_attrs):
+            self.keys.add(self._section_names[node.id])
+
+    def visit_Call(self, node: ast.Call) -> None:
+        name = self._func_name(node)
+        if name:
+            self.calls.add(name)
+        if name in _PY_SETTING_CALLS or name in _PY_SECTION_KEY_CALLS:
+            literal = []
+            for arg in node.args[:2] if name in _PY_SECTION_KEY_CALLS else node.args:
+                value = self._literal(arg)
+                if value is None:
+                    break
+                literal.append(value)
+            # argument ที่ไม่ใช่ literal มาจากผู้เรียก (key ถูกนับที่ call site ใน .robot แล้ว)
+            if literal:
+                self.keys.add('.'.join(literal))
+        self.generic_visit(node)
+
+
+def summarize_python(path: Path, text: Optional[str]) -> Dict[str, Any]:
+    """
+    summary ของ library .py: function/method (รวมตามชื่อ) -> keys ที่อ่าน, function ที่เรียก, digest
+    """
+    source = path.read_text(encoding='utf-8') if text is None else text
+    functions: Dict[str, Dict[str, Any]] = {}
+    try:
+        tree = ast.parse(source) if source.strip() else ast.Module(body=[], type_ignores=[])
+    except SyntaxError:
+        return {'kind': 'python', 'functions': {}}
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            visitor = _PythonKeys()
+            visitor.collect(node)
+            entry = functions.setdefault(node.name, {'keys': set(), 'calls': set(), 'parts': []})
+            entry['keys'] |= visitor.keys
+            entry['calls'] |= visitor.calls - {node.name}
+            entry['parts'].append(ast.dump(node))
+    return {'kind': 'python', 'functions': {
+        name: {'keys': sorted(entry['keys']), 'calls': sorted(entry['calls']), 'digest': _digest(entry['parts'])}
+        for name, entry in functions.items()}}
+
+
+# ---------- index ----------
+
+class ImpactIndex:
+    """
+    index ของ test -> config key / ตัวแปร / keyword / ไฟล์ ที่ test ไปถึง
+    summary ต่อไฟล์อยู่ใน cache (JSON) และถูก parse ใหม่เฉพาะไฟล์ที่ signature เปลี่ยน
+    """
+
+    def __init__(self, paths: Iterable[str], cache: Optional[str] = DEFAULT_CACHE,
+                 pythonpath: Iterable[str] = (), suite_root: Optional[str] = None):
+        self.paths = [Path(p).resolve() for p in paths]
+        self.cache = Path(cache) if cache else None
+        self.pythonpath = [Path(p).resolve() for p in pythonpath]
+        roots = [p if p.is_dir() else p.parent for p in self.paths]
+        self.suite_root = Path(suite_root).resolve() if suite_root else Path(os.path.commonpath(roots or ['.']))
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.stats = {'parsed': 0, 'reused': 0, 'removed': 0}
+
+    # ----- build -----
+
+    def build(self) -> "ImpactIndex":
+        cached = self._read_cache()
+        pending = [str(path) for path in self._robot_files()]
+        seen: Set[str] = set()
+        while pending:
+            name = pending.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            path = Path(name)
+            try:
+                signature = [path.stat().st_mtime_ns, path.stat().st_size]
+            except OSError:
+                continue
+            entry = cached.get(name)
+            if entry is not None and entry['signature'] == signature:
+                self.stats['reused'] += 1
+            else:
+                entry = {'signature': signature, 'summary': self._summarize(path, None)}
+                self.stats['parsed'] += 1
+            self.files[name] = entry
+            summary = entry['summary']
+            if summary['kind'] == 'robot':
+                pending.extend(summary['resources'])
+                # library และ module ข้างๆ (base_library ฯลฯ) ที่ library ใช้
+                for library in summary['libraries']:
+                    pending.extend(str(p.resolve()) for p in Path(library).parent.glob('*.py'))
+        self.stats['removed'] = len(set(cached) - seen)
+        self._write_cache()
+        return self
+
+    def _robot_files(self) -> Iterator[Path]:
+        for path in self.paths:
+            if path.is_dir():
+                for suffix in ROBOT_SUFFIXES:
+                    yield from (p.resolve() for p in sorted(path.rglob(f"*{suffix}")))
+            elif path.suffix in ROBOT_SUFFIXES:
+                yield path
+
+    def _summarize(self, path: Path, text: Optional[str]) -> Dict[str, Any]:
+        if path.suffix == '.py':
+            return summarize_python(path, text)
+        return summarize_robot(path, text, self.pythonpath)
+
+    def _read_cache(self) -> Dict[str, Dict[str, Any]]:
+        if self.cache is None or not self.cache.exists():
+            return {}
+        try:
+            data = json.loads(self.cache.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+        if data.get('version') != CACHE_VERSION or data.get('pythonpath') != [str(p) for p in self.pythonpath]:
+            return {}
+        return data.get('files', {})
+
+    def _write_cache(self) -> None:
+        if self.cache is None or not self.stats['parsed'] and not self.stats['removed']:
+            return
+        data = {'version': CACHE_VERSION, 'pythonpath': [str(p) for p in self.pythonpath], 'files': self.files}
+        tmp = self.cache.with_name(f".{self.cache.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False, separators=(',', ':')), encoding='utf-8')
+        os.replace(tmp, self.cache)
+
+    # ----- dependencies -----
+
+    def tests(self) -> Iterator[Tuple[str, str]]:
+        """(ไฟล์, ชื่อ test) ของทุก test ใน path ที่ index"""
+        roots = {str(p) for p in self._robot_files()}
+        for name, entry in sorted(self.files.items()):
+            if name in roots and entry['summary']['kind'] == 'robot':
+                for test in entry['summary']['tests']:
+                    yield name, test
+
+    def dependencies(self) -> Dict[Tuple[str, str], Dict[str, Set[str]]]:
+        """
+        (ไฟล์, test) -> {'keys', 'vars', 'keywords', 'files'} ที่ไปถึงได้ผ่าน keyword ทุกชั้น
+        keywords = ชื่อ user keyword ที่ถูกเรียก และ function ใน library แบบ 'ไฟล์::ชื่อ'
+        (keyword ของ library match ตามชื่อทุกไฟล์ ส่วน function ที่ library เรียกต่อ match เฉพาะในไฟล์เดียวกัน)
+        """
+        keywords: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+        functions: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+        for name, entry in self.files.items():
+            summary = entry['summary']
+            if summary['kind'] == 'robot':
+                for key, block in summary['keywords'].items():
+                    keywords.setdefault(key, []).append((name, block))
+            else:
+                for function, block in summary['functions'].items():
+                    functions.setdefault(normalize(function), []).append((name, block))
+
+        def reach(block: Dict[str, Any], owner: str) -> Dict[str, Set[str]]:
+            result = {'keys': set(block['keys']), 'vars': set(block['vars']), 'keywords': set(),
+                      'files': {owner}}
+            stack = [(None, call) for call in block['calls']]
+            while stack:
+                python_file, call = stack.pop()
+                if python_file is None:
+                    targets = keywords.get(call, []) + functions.get(call, [])
+                else:
+                    targets = [(python_file, self.files[python_file]['summary']['functions'][call])]
+                for file_name, target in targets:
+                    is_python = 'functions' in self.files[file_name]['summary']
+                    key = f"{file_name}::{normalize(call)}" if is_python else call
+                    if key in result['keywords']:
+                        continue
+                    result['keywords'].add(key)
+                    result['files'].add(file_name)
+                    result['keys'].update(target['keys'])
+                    result['vars'].update(target.get('vars', ()))
+                    if is_python:
+                        local = self.files[file_name]['summary']['functions']
+                        stack.extend((file_name, c) for c in target['calls'] if c in local)
+                    else:
+                        stack.extend((None, c) for c in target['calls'])
+            return result
+
+        dependencies = {}
+        for file_name, test in self.tests():
+            summary = self.files[file_name]['summary']
+            result = reach(summary['tests'][test], file_name)
+            for settings_file in self._settings_files(file_name):
+                settings = reach(self.files[settings_file]['summary']['settings'], settings_file)
+                for kind in result:
+                    result[kind] |= settings[kind]
+            dependencies[(file_name, test)] = result
+        return dependencies
+
+    def _settings_files(self, file_name: str) -> List[str]:
+        """ไฟล์ที่ setting (Suite/Test Setup, Resource, Library) มีผลกับ test: ตัวไฟล์เองและ __init__ ของโฟลเดอร์แม่"""
+        files = [file_name]
+        directory = Path(file_name).parent
+        while True:
+            for suffix in ROBOT_SUFFIXES:
+                init = str(directory / f"__init__{suffix}")
+                if init in self.files:
+                    files.append(init)
+            if directory == self.suite_root or directory.parent == directory:
+                break
+            directory = directory.parent
+        return files
+
+    # ----- impact -----
+
+    def affected(self, diff_text: str, base: Optional[str] = None) -> Dict[str, Any]:
+        """
+        test ที่ได้รับผลจาก diff (unified diff ที่ apply กับไฟล์ปัจจุบันแล้ว)
+        คืนค่า {'tests': [...], 'changes': {...}, 'unindexed': [...]}
+        """
+        base_dir = Path(base).resolve() if base else _diff_root()
+        changes: Dict[str, Set[str]] = {'keys': set(), 'vars': set(), 'keywords': set(), 'files': set(),
+                                        'tests': set()}
+        unindexed = []
+        for relative, hunks in parse_diff(diff_text):
+            path = (base_dir / relative).resolve()
+            new_text = path.read_text(encoding='utf-8') if path.exists() else ''
+            old_text = reverse_patch(new_text, hunks)
+            if path.suffix in CONFIG_SUFFIXES:
+                changes['keys'] |= changed_config_keys(old_text, new_text)
+            elif path.suffix in ROBOT_SUFFIXES or (path.suffix == '.py' and str(path) in self.files):
+                self._compare_summaries(path, old_text, new_text, changes)
+            else:
+                unindexed.append(str(relative))
+
+        # ตัวแปรที่ตั้งจาก settings และตัวแปรที่นิยามจากตัวแปรที่เปลี่ยน
+        changes['vars'] |= {_config_variable(key) for key in changes['keys']}
+        changes['vars'] = self._propagate_variables(changes['vars'])
+
+        selected = []
+        for (file_name, test), deps in self.dependencies().items():
+            if ((file_name, test) in changes['tests']
+                    or deps['keywords'] & changes['keywords']
+                    or deps['vars'] & changes['vars']
+                    or deps['files'] & changes['files']
+                    or any(_keys_overlap(a, b) for a in deps['keys'] for b in changes['keys'])):
+                selected.append((file_name, test))
+        return {'tests': [self.test_info(file_name, test) for file_name, test in selected],
+                'changes': {kind: sorted(map(str, values)) for kind, values in changes.items()},
+                'unindexed': unindexed}
+
+    def _compare_summaries(self, path: Path, old_text: str, new_text: str, changes: Dict[str, Set[str]]) -> None:
+        old = self._summarize(path, old_text)
+        new = self._summarize(path, new_text)
+        if new['kind'] == 'python':
+            before, after = old['functions'], new['functions']
+            changes['keywords'] |= {f"{path}::{normalize(name)}" for name in set(before) | set(after)
+                                    if (before.get(name) or {}).get('digest') != (after.get(name) or {}).get('digest')}
+            return
+        for kind, target in (('keywords', 'keywords'), ('variables', 'vars')):
+            before, after = old[kind], new[kind]
+            changes[target] |= {name for name in set(before) | set(after)
+                                if (before.get(name) or {}).get('digest') != (after.get(name) or {}).get('digest')}
+        for test in set(old['tests']) | set(new['tests']):
+            if (old['tests'].get(test) or {}).get('digest') != (new['tests'].get(test) or {}).get('digest'):
+                changes['tests'].add((str(path), test))
+        if old['settings']['digest'] != new['settings']['digest']:
+            changes['files'].add(str(path))
+
+    def _propagate_variables(self, names: Set[str]) -> Set[str]:
+        """ตัวแปรที่ค่าอ้างถึงตัวแปรที่เปลี่ยน (เช่น ${URL}    ${BASE_URL}login) ถือว่าเปลี่ยนด้วย"""
+        users: Dict[str, Set[str]] = {}
+        for entry in self.files.values():
+            for name, variable in entry['summary'].get('variables', {}).items():
+                for ref in variable['vars']:
+                    users.setdefault(ref, set()).add(name)
+        result, stack = set(names), list(names)
+        while stack:
+            for user in users.get(stack.pop(), ()):
+                if user not in result:
+                    result.add(user)
+                    stack.append(user)
+        return result
+
+    def test_info(self, file_name: str, test: str) -> Dict[str, str]:
+        return {'source': os.path.relpath(file_name), 'test': test, 'full_name': self.full_name(file_name, test)}
+
+    def full_name(self, file_name: str, test: str) -> str:
+        """ชื่อเต็มแบบที่ robot ตั้งเมื่อรันจาก suite_root (หรือจากไฟล์เดียว ถ้า index ไฟล์เดียว)"""
+        from robot.running import TestSuite
+
+        path = Path(file_name)
+        if len(self.paths) == 1 and self.paths[0].is_file():
+            parts = [path]
+        else:
+            relative = path.relative_to(self.suite_root).parts
+            parts = [self.suite_root] + [self.suite_root.joinpath(*relative[:i + 1]) for i in range(len(relative))]
+        return '.'.join(TestSuite.name_from_source(p) for p in parts) + '.' + test
+
+
+# ---------- diff handling ----------
+
+def _diff_root() -> Path:
+    """path ใน git diff เป็น relative กับ root ของ repository (นอก git ใช้ cwd)"""
+    import subprocess
+
+    try:
+        top = subprocess.run(['git', 'rev-parse', '--show-toplevel'], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return Path.cwd()
+    return Path(top.stdout.strip()).resolve()
+
+
+def parse_diff(text: str) -> List[Tuple[Path, List[Tuple[int, List[str], List[str]]]]]:
+    """unified diff -> [(path ใหม่, [(บรรทัดเริ่มในไฟล์ใหม่, บรรทัดเก่า, บรรทัดใหม่), ...])]"""
+    files: List[Tuple[Path, List[Tuple[int, List[str], List[str]]]]] = []
+    old_name: Optional[str] = None
+    hunks: Optional[List[Tuple[int, List[str], List[str]]]] = None
+    for line in text.splitlines():
+        if line.startswith('--- '):
+            old_name = line[4:].split('\t')[0].strip()
+            hunks = None
+        elif line.startswith('+++ ') and old_name is not None:
+            new_name = line[4:].split('\t')[0].strip()
+            name = old_name if new_name == '/dev/null' else new_name
+            name = name[2:] if name[:2] in ('a/', 'b/') else name
+            hunks = []
+            files.append((Path(name), hunks))
+            old_name = None
+        elif hunks is not None and line.startswith('@@'):
+            match = _HUNK.match(line)
+            if match:
+                hunks.append((max(int(match.group(3)), 1) if match.group(4) != '0' else int(match.group(3)) + 1,
+                              [], []))
+        elif hunks:
+            start, old, new = hunks[-1]
+            if line.startswith('-'):
+                old.append(line[1:])
+            elif line.startswith('+'):
+                new.append(line[1:])
+            elif line.startswith(' ') or line == '':
+                old.append(line[1:])
+                new.append(line[1:])
+    return files
+
+
+def reverse_patch(new_text: str, hunks: List[Tuple[int, List[str], List[str]]]) -> str:
+    """สร้างเนื้อหาก่อนแก้คืนจากไฟล์ปัจจุบัน (แทนบรรทัดของแต่ละ hunk ในไฟล์ใหม่ด้วยบรรทัดเดิม)"""
+    lines = new_text.splitlines()
+    for start, old, new in sorted(hunks, key=lambda hunk: hunk[0], reverse=True):
+        index = start - 1
+        if lines[index:index + len(new)] != new:
+            raise ValueError(f"Diff does not apply to the current file at line {start}")
+        lines[index:index + len(new)] = old
+    return '\n'.join(lines) + ('\n' if lines else '')
+
+
+def _flatten(data: Any, prefix: str = '') -> Dict[str, Any]:
+    if isinstance(data, dict):
+        flat: Dict[str, Any] = {}
+        for key, value in data.items():
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        if not data and prefix:
+            flat[prefix[:-1]] = {}
+        return flat
+    return {prefix[:-1]: data} if prefix else {}
+
+
+def changed_config_keys(old_text: str, new_text: str) -> Set[str]:
+    """dotted key ที่ถูกเพิ่ม/ลบ/เปลี่ยนค่าระหว่าง YAML สองเวอร์ชัน"""
+    import yaml
+
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    old = _flatten(yaml.load(old_text, Loader=loader) or {})
+    new = _flatten(yaml.load(new_text, Loader=loader) or {})
+    return {key for key in set(old) | set(new) if old.get(key, ANY_KEY) != new.get(key, ANY_KEY)
+            or (key in old) != (key in new)}
+
+
+# ---------- CLI ----------
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI: python impact_index.py build|affected|deps ... (ดู --help)"""
+    parser = argparse.ArgumentParser(prog="impact_index.py", description="Config/locator impact index for Robot tests")
+    commands = parser.add_subparsers(dest="command", required=True)
+    bld = commands.add_parser("build", help="build or incrementally update the index cache")
+    aff = commands.add_parser("affected", help="tests affected by a diff of config/locator/robot files")
+    aff.add_argument("--diff", required=True, help="unified diff file ('-' = stdin)")
+    aff.add_argument("--base", default=None, help="directory the diff paths are relative to (default: git top level, else cwd)")
+    aff.add_argument("--format", choices=("names", "argfile", "json"), default="names")
+    dep = commands.add_parser("deps", help="config keys and variables each test depends on")
+    dep.add_argument("--test", default=None, help="only tests whose name contains this text")
+    for command in (bld, aff, dep):
+        command.add_argument("paths", nargs="+", help="suite files/directories")
+        command.add_argument("--cache", default=DEFAULT_CACHE, help=f"index cache file (default: {DEFAULT_CACHE})")
+        command.add_argument("--pythonpath", action="append", default=[], help="extra import directory (repeatable)")
+        command.add_argument("--suite-root", default=None, help="path given to robot (for full test names)")
+    args = parser.parse_args(argv)
+
+    index = ImpactIndex(args.paths, args.cache, args.pythonpath, args.suite_root).build()
+    if args.command == "build":
+        tests = sum(1 for _ in index.tests())
+        print(f"{len(index.files)} files, {tests} tests: {index.stats['parsed']} parsed, "
+              f"{index.stats['reused']} from cache -> {args.cache}")
+    elif args.command == "affected":
+        diff = sys.stdin.read() if args.diff == '-' else Path(args.diff).read_text(encoding='utf-8')
+        result = index.affected(diff, args.base)
+        if args.format == "json":
+            print(json.dumps(result, indent=2, ensure_ascii=False))
+        else:
+            for test in result['tests']:
+                if args.format == "argfile":
+                    print('--test ' + ''.join(f"[{c}]" if c in '*?[' else c for c in test['full_name']))
+                else:
+                    print(test['full_name'])
+            for name in result['unindexed']:
+                print(f"warning: {name} is not indexed; tests depending on it were not selected", file=sys.stderr)
+    else:
+        for (file_name, test), deps in sorted(index.dependencies().items()):
+            if args.test and args.test.lower() not in test.lower():
+                continue
+            print(index.full_name(file_name, test))
+            print(f"  keys: {', '.join(sorted(deps['keys'])) or '-'}")
+            print(f"  vars: {', '.join(sorted(deps['vars'])) or '-'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+"""
+Opt-in instrumentation for BaseLibrary-derived libraries
+นับจำนวนครั้งและเวลา (monotonic, ns) ของทุก public keyword และ hot path ภายใน
+(_lookup_setting, _set_section_variables, _parse_settings_file = YAML parse ฯลฯ) ของ ConfigReader/DataReader
+
+ปิดอยู่ default: method ไม่ถูกห่อเลย จึงไม่มี overhead
+เปิดได้ 2 แบบ:
+    - listener (dump ต่อ suite เป็น JSON หรือ Prometheus text format ตอนจบ run)
+        robot --pythonpath Resources/pythonLib --listener instrumentation.MetricsListener:metrics.json ...
+        robot --pythonpath Resources/pythonLib --listener instrumentation.MetricsListener:metrics.prom:prometheus ...
+    - environment variable ROBOT_LIBRARY_METRICS=1 (ดูค่าด้วย keyword Get Library Metrics)
+"""
+import functools
+import json
+import os
+import threading
+import time
+import types
+from typing import Any, Callable, Dict, List, Optional
+
+METRICS_ENV = 'ROBOT_LIBRARY_METRICS'
+
+# method ภายในที่เป็น hot path (นอกเหนือจาก public keyword)
+HOT_PATHS = ('_lookup_setting', '_get_settings_entry', '_load_settings_entry', '_parse_settings_file',
+             '_compile_typed', '_load_layered_entry', '_layer_settings', '_set_section_variables',
+             '_publish_variables')
+
+_enabled = os.environ.get(METRICS_ENV, '').lower() in ('1', 'true', 'yes')
+_lock = threading.Lock()
+# "Class.method" -> [calls, total_ns, max_ns]
+_timers: Dict[str, List[int]] = {}
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable() -> None:
+    """เปิด instrumentation: ห่อ method ของ BaseLibrary และ subclass ที่มีอยู่แล้ว (class ที่สร้างทีหลังถูกห่อใน __init_subclass__)"""
+    global _enabled
+    _enabled = True
+    import sys
+    base_module = sys.modules.get('base_library')
+    if base_module is not None:
+        pending = [base_module.BaseLibrary]
+        while pending:
+            cls = pending.pop()
+            instrument_class(cls)
+            pending.extend(cls.__subclasses__())
+
+
+def instrument_class(cls: type) -> None:
+    """ห่อ public method และ HOT_PATHS ที่ class นี้ประกาศเอง (method ที่สืบทอดมาถูกห่อที่ class แม่)"""
+    for name, member in list(vars(cls).items()):
+        if not isinstance(member, types.FunctionType) or getattr(member, '_instrumented', False):
+            continue
+        if name.startswith('_') and name not in HOT_PATHS:
+            continue
+        setattr(cls, name, _timed(member))
+
+
+def _timed(func: Callable) -> Callable:
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        start = time.perf_counter_ns()
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            key = f"{type(self).__name__}.{name}"
+            with _lock:
+                timer = _timers.get(key)
+                if timer is None:
+                    _timers[key] = [1, elapsed, elapsed]
+                else:
+                    timer[0] += 1
+                    timer[1] += elapsed
+                    if elapsed > timer[2]:
+                        timer[2] = elapsed
+
+    wrapper._instrumented = True
+    return wrapper
+
+
+def snapshot() -> Dict[str, Any]:
+    """ค่าสะสมปัจจุบัน: timers ต่อ method และ counter ของ settings cache"""
+    with _lock:
+        timers = {key: list(value) for key, value in _timers.items()}
+    import sys
+    base_module = sys.modules.get('base_library')
+    cache = dict(base_module.BaseLibrary._cache_stats) if base_module is not None else {}
+    return {'timers': timers, 'cache': cache}
+
+
+def reset() -> None:
+    with _lock:
+        _timers.clear()
+
+
+def diff(after: Dict[str, Any], before: Dict[str, Any]) -> Dict[str, Any]:
+    """metrics ระหว่างสอง snapshot ในรูปที่อ่านง่าย (วินาที + cache hit ratio)"""
+    methods = {}
+    for key, (calls, total_ns, max_ns) in after['timers'].items():
+        prev_calls, prev_total, _ = before['timers'].get(key, (0, 0, 0))
+        if calls == prev_calls:
+            continue
+        # max_seconds เป็นค่าสูงสุดตั้งแต่เริ่ม run (ไม่ใช่เฉพาะช่วงนี้)
+        methods[key] = {'calls': calls - prev_calls,
+                        'seconds': (total_ns - prev_total) / 1e9,
+                        'max_seconds': max_ns / 1e9}
+    cache = {name: value - before['cache'].get(name, 0) for name, value in after['cache'].items()}
+    lookups = cache.get('hits', 0) + cache.get('misses', 0) + cache.get('reloads', 0)
+    cache['hit_ratio'] = cache.get('hits', 0) / lookups if lookups else None
+    yaml_seconds = sum(m['seconds'] for key, m in methods.items() if key.endswith('._parse_settings_file'))
+    methods = dict(sorted(methods.items(), key=lambda item: -item[1]['seconds']))
+    return {'methods': methods, 'cache': cache, 'yaml_parse_seconds': yaml_seconds}
+
+
+def to_prometheus(suites: List[Dict[str, Any]]) -> str:
+    """Prometheus text exposition format (label suite = full name ของ suite)"""
+    lines = [
+        '# HELP robot_library_calls_total Calls of instrumented library methods',
+        '# TYPE robot_library_calls_total counter',
+    ]
+    seconds = ['# HELP robot_library_seconds_total Time spent in instrumented library methods',
+               '# TYPE robot_library_seconds_total counter']
+    cache = ['# HELP robot_settings_cache_events_total Settings cache events',
+             '# TYPE robot_settings_cache_events_total counter']
+    ratio = ['# HELP robot_settings_cache_hit_ratio Settings cache hit ratio',
+             '# TYPE robot_settings_cache_hit_ratio gauge']
+    parse = ['# HELP robot_settings_yaml_parse_seconds Time spent parsing settings files',
+             '# TYPE robot_settings_yaml_parse_seconds gauge']
+    for suite in suites:
+        label = _escape_label(suite['suite'])
+        for method, m in suite['methods'].items():
+            labels = f'suite="{label}",method="{_escape_label(method)}"'
+            lines.append(f"robot_library_calls_total{{{labels}}} {m['calls']}")
+            seconds.append(f"robot_library_seconds_total{{{labels}}} {m['seconds']:.9f}")
+        for event, value in suite['cache'].items():
+            if event == 'hit_ratio':
+                if value is not None:
+                    ratio.append(f'robot_settings_cache_hit_ratio{{suite="{label}"}} {value:.6f}')
+                continue
+            cache.append(f'robot_settings_cache_events_total{{suite="{label}",event="{event}"}} {value}')
+        parse.append(f'robot_settings_yaml_parse_seconds{{suite="{label}"}} {suite["yaml_parse_seconds"]:.9f}')
+    return '\n'.join(lines + seconds + cache + ratio + parse) + '\n'
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class MetricsListener:
+    """
+    Robot listener ที่เปิด instrumentation และเก็บ metrics ของแต่ละ suite (รวม suite ลูก)
+    เขียนไฟล์ตอนจบ run: format = json (default) หรือ prometheus
+    """
+
+    ROBOT_LISTENER_API_VERSION = 2
+
+    def __init__(self, output: str = 'library_metrics.json', format: Optional[str] = None):
+        self._output = output
+        self._format = (format or ('prometheus' if output.endswith(('.prom', '.txt')) else 'json')).lower()
+        self._started: List[Dict[str, Any]] = []
+        self.suites: List[Dict[str, Any]] = []
+        enable()
+
+    def start_suite(self, name, attrs):
+        self._started.append(snapshot())
+
+    def end_suite(self, name, attrs):
+        before = self._started.pop() if self._started else {'timers': {}, 'cache': {}}
+        metrics = diff(snapshot(), before)
+        self.suites.append(dict(suite=attrs.get('longname', name), elapsed=attrs.get('elapsedtime', 0) / 1000,
+                                **metrics))
+
+    def close(self):
+        with open(self._output, 'w', encoding='utf-8') as f:
+            if self._format == 'prometheus':
+                f.write(to_prometheus(self.suites))
+            else:
+                json.dump({'suites': self.suites}, f, indent=2, ensure_ascii=False)
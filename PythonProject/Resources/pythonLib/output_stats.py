@@ -0,0 +1,243 @@
+"""
+Streaming output.xml analyzer
+อ่าน output.xml ของ Robot Framework แบบ incremental (iterparse) โดยไม่โหลด result model ทั้งไฟล์
+หน่วยความจำขึ้นกับความลึกของ keyword ไม่ใช่ขนาดไฟล์: element ที่อ่านจบแล้วถูกทิ้งทันที
+
+    python output_stats.py output.xml [--format json|csv] [--output FILE] [--top N] [--sort total|p95|count]
+
+รายงานต่อ test และต่อ keyword: count, pass/fail/skip, total, mean, min, max, p50/p95/p99 (วินาที)
+percentile คำนวณจาก log-bucket histogram (คลาดเคลื่อนสัมพัทธ์ไม่เกิน ~1%) เพื่อให้หน่วยความจำคงที่ต่อ key
+
+รองรับทั้ง schema ของ RF 7 (status start/elapsed) และ RF 4-6 (status starttime/endtime)
+iter_output() ใช้ซ้ำได้สำหรับเครื่องมืออื่นที่ต้องการ record ของ test/keyword แบบ stream
+"""
+import argparse
+import csv
+import json
+import math
+import sys
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+_CONTAINERS = ('suite', 'test', 'kw')
+_LEGACY_TIME_FORMAT = '%Y%m%d %H:%M:%S.%f'
+_COLUMNS = ('kind', 'name', 'count', 'pass', 'fail', 'skip', 'total', 'mean', 'min', 'max', 'p50', 'p95', 'p99')
+
+
+class OutputRecord(NamedTuple):
+    """test/keyword/suite หนึ่งรายการจาก output.xml"""
+    kind: str            # 'suite' | 'test' | 'kw'
+    name: str            # keyword: owner.name (เช่น BuiltIn.Log); test/suite: full name
+    status: str          # PASS | FAIL | SKIP | NOT RUN
+    start: Optional[datetime]
+    elapsed: float       # วินาที
+    tags: tuple          # tags ของ test (ว่างสำหรับ kw/suite)
+    source: str          # suite: ไฟล์ .robot; test: source ของ suite ที่อยู่
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """timestamp ของ RF 7 (ISO 8601) หรือ RF 4-6 (20240101 12:00:00.000); 'N/A' -> None"""
+    if not value or value == 'N/A':
+        return None
+    if 'T' in value or '-' in value:
+        return datetime.fromisoformat(value)
+    return datetime.strptime(value, _LEGACY_TIME_FORMAT)
+
+
+def _status_times(attrib: Dict[str, str]):
+    """(start, elapsed seconds) จาก attribute ของ <status> ทั้งสอง schema"""
+    if 'elapsed' in attrib or 'start' in attrib:
+        return parse_timestamp(attrib.get('start')), float(attrib.get('elapsed') or 0.0)
+    start = parse_timestamp(attrib.get('starttime'))
+    end = parse_timestamp(attrib.get('endtime'))
+    if start is None or end is None:
+        return start, 0.0
+    return start, (end - start).total_seconds()
+
+
+def _in_statistics(stack: List[ET.Element]) -> bool:
+    """<statistics><suite> เป็นสถิติรวม ไม่ใช่ suite ที่รันจริง"""
+    return bool(stack) and stack[-1].tag == 'statistics'
+
+
+def iter_output(source) -> Iterator[OutputRecord]:
+    """
+    Stream suite/test/keyword records from output.xml (path or file object) in document end order.
+    Finished elements are removed from the tree, so memory stays bounded by nesting depth.
+    """
+    stack: List[ET.Element] = []
+    suites: List[str] = []
+    sources: List[str] = []
+    statuses: Dict[int, Dict[str, str]] = {}
+    tags: Dict[int, List[str]] = {}
+
+    for event, elem in ET.iterparse(source, events=('start', 'end')):
+        tag = elem.tag
+        if event == 'start':
+            if tag == 'suite' and not _in_statistics(stack):
+                parent_name = suites[-1] + '.' if suites else ''
+                suites.append(parent_name + elem.get('name', ''))
+                sources.append(elem.get('source') or (sources[-1] if sources else ''))
+            stack.append(elem)
+            continue
+
+        stack.pop()
+        parent = stack[-1] if stack else None
+        if tag == 'status':
+            if parent is not None and parent.tag in _CONTAINERS:
+                statuses[id(parent)] = dict(elem.attrib)
+        elif tag == 'tag':
+            # RF 4+: <test><tag>, ก่อนหน้านั้น: <test><tags><tag>
+            owner = parent if parent is not None and parent.tag == 'test' else (
+                stack[-2] if parent is not None and parent.tag == 'tags' and len(stack) > 1 else None)
+            if owner is not None and owner.tag == 'test':
+                tags.setdefault(id(owner), []).append(elem.text or '')
+        elif tag in _CONTAINERS and not (tag == 'suite' and _in_statistics(stack)):
+            attrib = statuses.pop(id(elem), {})
+            start, elapsed = _status_times(attrib)
+            status = attrib.get('status', 'NOT RUN')
+            if tag == 'kw':
+                owner = elem.get('owner') or elem.get('library')
+                name = elem.get('name', '')
+                yield OutputRecord('kw', f"{owner}.{name}" if owner else name, status, start, elapsed, (), '')
+            elif tag == 'test':
+                name = f"{suites[-1]}.{elem.get('name', '')}" if suites else elem.get('name', '')
+                yield OutputRecord('test', name, status, start, elapsed,
+                                   tuple(tags.pop(id(elem), ())), sources[-1] if sources else '')
+            else:
+                yield OutputRecord('suite', suites.pop(), status, start, elapsed, (), sources.pop())
+            if parent is not None:
+                parent.remove(elem)
+        elem.clear()
+
+
+class LatencyStats:
+    """
+    count/total/min/max แบบ exact และ percentile แบบ log-bucket histogram
+    (bucket กว้าง 2% -> ค่าที่ประมาณคลาดเคลื่อนสัมพัทธ์ไม่เกิน ~1%)
+    """
+
+    __slots__ = ('count', 'total', 'min', 'max', 'statuses', '_buckets', '_zeros')
+
+    _GAMMA = 1.02
+    _LOG_GAMMA = math.log(_GAMMA)
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.statuses: Dict[str, int] = {}
+        self._buckets: Dict[int, int] = {}
+        self._zeros = 0
+
+    def add(self, value: float, status: str = 'PASS') -> None:
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if value <= 0:
+            self._zeros += 1
+        else:
+            bucket = math.ceil(math.log(value) / self._LOG_GAMMA)
+            self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+
+    def percentile(self, q: float) -> float:
+        """ค่าประมาณ percentile q (0-100) แบบ nearest-rank (ค่าลำดับที่ ceil(q/100 x n))"""
+        if not self.count:
+            return 0.0
+        # round กัน error ของ float เช่น 95 x 20 / 100 = 19.000000000000004
+        rank = max(1, math.ceil(round(q * self.count / 100.0, 9)))
+        seen = self._zeros
+        if rank <= seen:
+            return 0.0
+        for bucket in sorted(self._buckets):
+            seen += self._buckets[bucket]
+            if rank <= seen:
+                estimate = 2 * self._GAMMA ** bucket / (self._GAMMA + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'pass': self.statuses.get('PASS', 0),
+            'fail': self.statuses.get('FAIL', 0),
+            'skip': self.statuses.get('SKIP', 0),
+            'total': round(self.total, 6),
+            'mean': round(self.total / self.count, 6) if self.count else 0.0,
+            'min': round(self.min, 6) if self.count else 0.0,
+            'max': round(self.max, 6),
+            'p50': round(self.percentile(50), 6),
+            'p95': round(self.percentile(95), 6),
+            'p99': round(self.percentile(99), 6),
+        }
+
+
+def analyze_output(source, kinds=('test', 'kw')) -> Dict[str, Dict[str, LatencyStats]]:
+    """{kind: {name: LatencyStats}} ของ record ชนิดที่ต้องการจาก output.xml"""
+    stats: Dict[str, Dict[str, LatencyStats]] = {kind: {} for kind in kinds}
+    for record in iter_output(source):
+        by_name = stats.get(record.kind)
+        if by_name is None:
+            continue
+        entry = by_name.get(record.name)
+        if entry is None:
+            entry = by_name[record.name] = LatencyStats()
+        entry.add(record.elapsed, record.status)
+    return stats
+
+
+def summarize(stats: Dict[str, Dict[str, LatencyStats]], sort: str = 'total',
+              top: Optional[int] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """แปลงผลของ analyze_output เป็น rows (เรียงจากมากไปน้อยตาม sort) แยกตาม kind"""
+    report = {}
+    for kind, by_name in stats.items():
+        rows = [dict(name=name, **entry.as_dict()) for name, entry in by_name.items()]
+        rows.sort(key=lambda r: (-r[sort], r['name']))
+        report[kind] = rows[:top] if top else rows
+    return report
+
+
+def write_report(report: Dict[str, List[Dict[str, Any]]], output, fmt: str = 'json') -> None:
+    """เขียน report เป็น JSON ({"test": [...], "kw": [...]}) หรือ CSV (คอลัมน์ kind แยกชนิด)"""
+    if fmt == 'json':
+        json.dump(report, output, indent=2, ensure_ascii=False)
+        output.write('\n')
+        return
+    writer = csv.DictWriter(output, fieldnames=_COLUMNS)
+    writer.writeheader()
+    for kind, rows in report.items():
+        for row in rows:
+            writer.writerow(dict(kind=kind, **row))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI: python output_stats.py output.xml [--format json|csv] [--output FILE] [--top N] [--sort KEY]"""
+    parser = argparse.ArgumentParser(prog="output_stats.py",
+                                     description="Per-test and per-keyword duration statistics from output.xml")
+    parser.add_argument("output_xml", help="Robot Framework output.xml")
+    parser.add_argument("--format", dest="fmt", choices=("json", "csv"), default="json")
+    parser.add_argument("--output", default=None, help="write the report to this file (default: stdout)")
+    parser.add_argument("--top", type=int, default=None, help="only the N highest rows per kind")
+    parser.add_argument("--sort", choices=("total", "count", "mean", "max", "p50", "p95", "p99"), default="total")
+    parser.add_argument("--kind", choices=("all", "test", "kw"), default="all",
+                        help="report tests, keywords or both (default: all)")
+    args = parser.parse_args(argv)
+
+    kinds = ('test', 'kw') if args.kind == 'all' else (args.kind,)
+    report = summarize(analyze_output(args.output_xml, kinds), args.sort, args.top)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as f:
+            write_report(report, f, args.fmt)
+    else:
+        write_report(report, sys.stdout, args.fmt)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
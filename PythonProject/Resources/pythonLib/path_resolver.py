@@ -0,0 +1,119 @@
+"""
+Batch path resolution for DataReader.build_section_paths_from_settings
+ตรวจว่าไฟล์มีอยู่จาก listing ของโฟลเดอร์ (scandir ครั้งเดียวต่อโฟลเดอร์) แทน resolve()/exists() ทีละไฟล์
+โฟลเดอร์หลายโฟลเดอร์ถูก list พร้อมกันใน thread pool (เหมาะกับ network share ที่ latency สูง)
+ผลของ realpath/listing ถูก cache ไว้ TTL วินาที ใช้ร่วมกันทุก suite ใน process
+ไฟล์ที่ไม่มีใน listing ถูกตรวจซ้ำด้วยการ list โฟลเดอร์ใหม่หนึ่งครั้งก่อนรายงานว่าไม่มี
+(ไฟล์ที่ setup เพิ่งสร้างหลัง suite อื่น list โฟลเดอร์ไปแล้วต้องไม่ถูกรายงานว่าหาย)
+"""
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+
+# จำนวน thread สูงสุดที่ใช้ list โฟลเดอร์พร้อมกัน
+MAX_WORKERS = 8
+
+
+class ResolvedPath(NamedTuple):
+    key: str
+    path: str
+    exists: bool
+
+
+class _DirectoryListing(NamedTuple):
+    expires: float
+    real_dir: str
+    # normcase(ชื่อไฟล์) -> เป็น symlink หรือไม่ (None = list โฟลเดอร์ไม่ได้ / ไม่มีโฟลเดอร์)
+    entries: Optional[Dict[str, bool]]
+
+
+class PathResolver:
+    """resolve path หลายไฟล์ในครั้งเดียว พร้อม cache แบบ TTL ของ listing ต่อโฟลเดอร์"""
+
+    def __init__(self, ttl: float = 5.0, max_workers: int = MAX_WORKERS):
+        self.ttl = ttl
+        self.max_workers = max_workers
+        self._listings: Dict[str, _DirectoryListing] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional["ThreadPoolExecutor"] = None
+        self.stats = {'listings': 0, 'listing_hits': 0}
+
+    def resolve_all(self, base: str, items: Iterable[Tuple[str, str]]) -> List[ResolvedPath]:
+        """
+        (key, relative path) -> ResolvedPath(key, path แบบ absolute ที่ resolve symlink แล้ว, มีไฟล์อยู่หรือไม่)
+        ผลเหมือน (Path(base) / value).resolve() / exists() แต่ stat โฟลเดอร์ละครั้ง
+        """
+        pending: List[Tuple[str, str, str]] = []
+        for key, value in items:
+            joined = os.path.join(base, value)
+            directory, name = os.path.split(joined)
+            pending.append((key, directory, name))
+
+        directories = list(dict.fromkeys(directory for _, directory, _ in pending))
+        if len(directories) > 1 and self.max_workers > 1:
+            listings = dict(zip(directories, self._pool().map(self._listing, directories)))
+        else:
+            listings = {directory: self._listing(directory) for directory in directories}
+
+        results: List[ResolvedPath] = []
+        refreshed = set()
+        for key, directory, name in pending:
+            listing = listings[directory]
+            if name in ('', '.', '..') or listing.entries is None:
+                # path แปลก (ลงท้ายด้วย / หรือ ..) หรือโฟลเดอร์ที่ list ไม่ได้: ใช้วิธีเดิม
+                path = os.path.realpath(os.path.join(directory, name))
+                results.append(ResolvedPath(key, path, os.path.exists(path)))
+                continue
+            is_symlink = listing.entries.get(os.path.normcase(name))
+            if is_symlink is None and directory not in refreshed:
+                # miss อาจมาจาก listing ที่ cache ไว้ก่อนไฟล์ถูกสร้าง: list ใหม่ (ครั้งเดียวต่อโฟลเดอร์ต่อการเรียก)
+                refreshed.add(directory)
+                listing = listings[directory] = self._listing(directory, refresh=True)
+                if listing.entries is not None:
+                    is_symlink = listing.entries.get(os.path.normcase(name))
+            path = os.path.join(listing.real_dir, name)
+            if is_symlink is None:
+                results.append(ResolvedPath(key, path, False))
+            elif is_symlink:
+                path = os.path.realpath(path)
+                results.append(ResolvedPath(key, path, os.path.exists(path)))
+            else:
+                results.append(ResolvedPath(key, path, True))
+        return results
+
+    def clear(self) -> None:
+        with self._lock:
+            self._listings.clear()
+
+    def _listing(self, directory: str, refresh: bool = False) -> _DirectoryListing:
+        now = time.monotonic()
+        listing = self._listings.get(directory)
+        if not refresh and listing is not None and listing.expires > now:
+            self.stats['listing_hits'] += 1
+            return listing
+
+        real_dir = os.path.realpath(directory)
+        try:
+            with os.scandir(real_dir) as it:
+                entries: Optional[Dict[str, bool]] = {os.path.normcase(e.name): e.is_symlink() for e in it}
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            entries = None
+        listing = _DirectoryListing(now + self.ttl, real_dir, entries)
+        with self._lock:
+            self._listings[directory] = listing
+            self.stats['listings'] += 1
+        return listing
+
+    def _pool(self) -> "ThreadPoolExecutor":
+        if self._executor is None:
+            # import ตอนใช้ครั้งแรก (section ส่วนใหญ่อยู่ในโฟลเดอร์เดียว ไม่ต้องใช้ pool)
+            from concurrent.futures import ThreadPoolExecutor
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                        thread_name_prefix='path-resolver')
+        return self._executor
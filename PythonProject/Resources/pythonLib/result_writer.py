@@ -0,0 +1,281 @@
+"""
+Buffered test-result writer for Robot Framework
+Update Test Result จะไม่เปิด/บันทึก workbook ทุกครั้ง แต่เก็บผลไว้ในหน่วยความจำ + journal (append-only)
+แล้วเขียนลง workbook ครั้งเดียวตอนจบ suite/run (หรือเมื่อเรียก Flush Test Results)
+
+    Library    result_writer.ResultWriter    flush_on=close
+
+ภายใต้ pabot แต่ละ process เขียน journal ของตัวเอง (results.<pid>.jsonl) และไม่ flush เอง
+จากนั้นรวมทุก journal ลง workbook ครั้งเดียวด้วย:
+
+    python result_writer.py merge [--workbook PATH] [--journal-dir DIR]
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+_lib_dir = Path(__file__).resolve().parent
+if str(_lib_dir) not in sys.path:
+    sys.path.insert(0, str(_lib_dir))
+from base_library import BaseLibrary, keyword
+
+_JOURNAL_SUBDIR = '.result_journal'
+_LOCK_STALE_SECONDS = 300
+
+
+class ResultWriter(BaseLibrary):
+    """
+    Robot Framework library สำหรับบันทึกผลเทสต์ลง Excel แบบ batch
+
+    - workbook default: DRDB_environment.rewrite_file (relative จาก project root)
+    - flush_on: ``close`` (จบ run), ``suite`` (จบทุก suite) หรือ ``manual`` (เรียก Flush Test Results เอง)
+    """
+
+    ROBOT_LIBRARY_SCOPE = 'GLOBAL'
+    ROBOT_LIBRARY_VERSION = '1.0'
+
+    ID_COLUMN = 'Test_Case_ID'
+    RESULT_COLUMN = 'Result'
+    MESSAGE_COLUMN = 'Result_Message'
+    TIME_COLUMN = 'Result_Time'
+
+    def __init__(
+        self,
+        workbook_path: Optional[str] = None,
+        sheet_name: Optional[str] = None,
+        journal_dir: Optional[str] = None,
+        flush_on: str = 'close',
+    ):
+        self.ROBOT_LIBRARY_LISTENER = _ResultWriterListener(self)
+        self._workbook_path = workbook_path
+        self._sheet_name = sheet_name
+        self._journal_dir = journal_dir
+        self._flush_on = flush_on.lower()
+        self._pending: List[Dict[str, Any]] = []
+        self._journal = None
+        self._lock = threading.Lock()
+
+    # ---------- public keywords ----------
+
+    @keyword
+    def update_test_result(self, test_case_id: str, status: str, message: str = '') -> None:
+        """
+        บันทึกผลของ test case (เก็บในคิว + journal; workbook จะถูกเขียนตอน flush)
+        """
+        record = {'id': str(test_case_id), 'status': str(status), 'message': str(message),
+                  'time': time.strftime('%Y-%m-%d %H:%M:%S'), 'ts': time.time()}
+        with self._lock:
+            self._pending.append(record)
+            journal = self._open_journal()
+            journal.write(json.dumps(record, ensure_ascii=False) + '\n')
+            journal.flush()
+
+    @keyword
+    def flush_test_results(self) -> int:
+        """
+        เขียนผลที่ค้างอยู่ของ process นี้ลง workbook ในการ save ครั้งเดียว คืนค่าจำนวน record ที่เขียน
+        """
+        with self._lock:
+            self._close_journal()
+            self._pending.clear()
+            return self._merge(f"results.{os.getpid()}.jsonl")
+
+    @keyword
+    def get_pending_test_results(self) -> List[Dict[str, Any]]:
+        """ผลที่ยังไม่ได้เขียนลง workbook (ของ process นี้)"""
+        with self._lock:
+            return list(self._pending)
+
+    # ---------- internal helpers ----------
+
+    def _workbook(self) -> Path:
+        path = self._workbook_path or self.get_setting('DRDB_environment', 'rewrite_file')
+        if not path:
+            raise ValueError("No result workbook configured (workbook_path or DRDB_environment.rewrite_file)")
+        return self.resolve_path(str(path))
+
+    def _merge(self, pattern: str) -> int:
+        return merge_journals(self._workbook(), self._journal_path(), self._sheet_name,
+                              id_column=self.ID_COLUMN,
+                              columns=(self.RESULT_COLUMN, self.MESSAGE_COLUMN, self.TIME_COLUMN),
+                              pattern=pattern)
+
+    def _journal_path(self) -> Path:
+        if self._journal_dir:
+            return self.resolve_path(self._journal_dir)
+        return self._workbook().parent / _JOURNAL_SUBDIR
+
+    def _open_journal(self):
+        if self._journal is None:
+            journal_dir = self._journal_path()
+            journal_dir.mkdir(parents=True, exist_ok=True)
+            self._journal = open(journal_dir / f"results.{os.getpid()}.jsonl", 'a', encoding='utf-8')
+        return self._journal
+
+    def _close_journal(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def _under_pabot(self) -> bool:
+        try:
+            from robot.libraries.BuiltIn import BuiltIn
+            return BuiltIn().get_variable_value('${PABOTQUEUEINDEX}') is not None
+        except Exception:
+            return False
+
+
+class _ResultWriterListener:
+    """library listener: flush ตอนจบ suite/run ตาม flush_on (แยก class เพื่อไม่ให้กลายเป็น keyword)"""
+    ROBOT_LISTENER_API_VERSION = 3
+
+    def __init__(self, writer: ResultWriter):
+        self.writer = writer
+
+    def end_suite(self, data, result):
+        if self.writer._flush_on == 'suite' and self.writer._pending:
+            self.writer.flush_test_results()
+
+    def close(self):
+        writer = self.writer
+        if writer._flush_on == 'manual' or not writer._pending or writer._under_pabot():
+            # ภายใต้ pabot รอ merge ครั้งเดียวหลังทุก process จบ (python result_writer.py merge)
+            writer._close_journal()
+            return
+        writer.flush_test_results()
+
+
+def acquire_lock(lock_file: Path, timeout: float = 120.0) -> None:
+    """lock ข้าม process แบบง่าย (สร้างไฟล์ด้วย O_EXCL) ใช้ได้ทั้ง Windows/Linux"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            os.close(os.open(lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return
+        except FileExistsError:
+            try:
+                if time.time() - lock_file.stat().st_mtime > _LOCK_STALE_SECONDS:
+                    lock_file.unlink(missing_ok=True)
+                    continue
+            except FileNotFoundError:
+                continue
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Timed out waiting for lock: {lock_file}")
+            time.sleep(0.05)
+
+
+def _read_journals(journal_files: List[Path]) -> Dict[str, Dict[str, Any]]:
+    """รวม journal ทุกไฟล์ -> {test id: record ล่าสุด} (ข้ามบรรทัดที่เขียนไม่ครบตอน crash)"""
+    records: List[Dict[str, Any]] = []
+    for journal in journal_files:
+        with open(journal, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    records.sort(key=lambda r: r.get('ts', 0))
+    return {r['id']: r for r in records if 'id' in r}
+
+
+def merge_journals(
+    workbook_path: Path,
+    journal_dir: Path,
+    sheet_name: Optional[str] = None,
+    id_column: str = ResultWriter.ID_COLUMN,
+    columns=(ResultWriter.RESULT_COLUMN, ResultWriter.MESSAGE_COLUMN, ResultWriter.TIME_COLUMN),
+    pattern: str = 'results.*.jsonl',
+) -> int:
+    """
+    เขียนผลจาก journal ใน journal_dir (ตาม pattern; default = ทุก process) ลง workbook
+    ด้วยการ load/save ครั้งเดียว แล้วลบ journal ที่เขียนแล้ว
+    """
+    if not journal_dir.is_dir():
+        return 0
+    lock_file = journal_dir / 'merge.lock'
+    acquire_lock(lock_file)
+    try:
+        journal_files = sorted(journal_dir.glob(pattern))
+        results = _read_journals(journal_files)
+        if results:
+            _apply_results(workbook_path, sheet_name, id_column, columns, results)
+        for journal in journal_files:
+            journal.unlink(missing_ok=True)
+        return len(results)
+    finally:
+        lock_file.unlink(missing_ok=True)
+
+
+def _apply_results(workbook_path: Path, sheet_name: Optional[str], id_column: str, columns,
+                   results: Dict[str, Dict[str, Any]]) -> None:
+    try:
+        import openpyxl
+    except ImportError:
+        raise ImportError("ResultWriter requires openpyxl (pip install openpyxl)") from None
+
+    if workbook_path.exists():
+        wb = openpyxl.load_workbook(workbook_path)
+        ws = wb[sheet_name] if sheet_name else wb.worksheets[0]
+    else:
+        workbook_path.parent.mkdir(parents=True, exist_ok=True)
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        if sheet_name:
+            ws.title = sheet_name
+        ws.append([id_column])
+
+    header = [cell.value for cell in ws[1]]
+    col_of: Dict[str, int] = {}
+    for name in (id_column,) + tuple(columns):
+        if name not in header:
+            header.append(name)
+            ws.cell(row=1, column=len(header), value=name)
+        col_of[name] = header.index(name) + 1
+
+    id_col = col_of[id_column]
+    row_of: Dict[str, int] = {}
+    for row_number, (value,) in enumerate(
+            ws.iter_rows(min_row=2, min_col=id_col, max_col=id_col, values_only=True), start=2):
+        if value is not None:
+            row_of.setdefault(str(value).strip(), row_number)
+
+    result_col, message_col, time_col = (col_of[c] for c in columns)
+    for test_id, record in results.items():
+        row = row_of.get(test_id)
+        if row is None:
+            row = ws.max_row + 1
+            ws.cell(row=row, column=id_col, value=test_id)
+            row_of[test_id] = row
+        ws.cell(row=row, column=result_col, value=record.get('status'))
+        ws.cell(row=row, column=message_col, value=record.get('message'))
+        ws.cell(row=row, column=time_col, value=record.get('time'))
+
+    tmp = workbook_path.with_name(f".{workbook_path.name}.{os.getpid()}.tmp")
+    wb.save(tmp)
+    os.replace(tmp, workbook_path)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI: python result_writer.py merge [--workbook PATH] [--journal-dir DIR] [--sheet NAME]"""
+    parser = argparse.ArgumentParser(prog="result_writer.py", description="ResultWriter command line tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    merge = commands.add_parser("merge", help="apply all pending result journals to the workbook in one save")
+    merge.add_argument("--workbook", dest="workbook_path", default=None,
+                       help="result workbook (default: DRDB_environment.rewrite_file)")
+    merge.add_argument("--journal-dir", dest="journal_dir", default=None,
+                       help=f"journal directory (default: {_JOURNAL_SUBDIR}/ next to the workbook)")
+    merge.add_argument("--sheet", dest="sheet_name", default=None)
+    args = parser.parse_args(argv)
+
+    writer = ResultWriter(args.workbook_path, args.sheet_name, args.journal_dir, flush_on='manual')
+    print(f"{writer._merge('results.*.jsonl')} result(s) written to {writer._workbook()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,358 @@
+"""
+Run-history store (SQLite) for Robot Framework results
+เก็บเวลาของทุก test และเวลารวมต่อ keyword ของแต่ละ run จาก output.xml (อ่านแบบ stream ด้วย output_stats.iter_output)
+ลงฐานข้อมูล SQLite ไฟล์เดียว เพื่อดูแนวโน้มข้าม run: test ที่ช้าที่สุด, test ที่ช้าลงเทียบกับ baseline และ test ที่ flaky
+
+    python run_history.py ingest output.xml [--db FILE] [--label NAME] [--keep N]
+    python run_history.py slowest [--top 10] [--runs 10] [--kind test|kw]
+    python run_history.py regressions [--window 10] [--threshold 0.25] [--min-seconds 0.5]
+    python run_history.py flaky [--runs 20] [--min-flips 1]
+
+    robot --listener run_history.HistoryListener:results/run_history.sqlite ...   (ingest เมื่อ output.xml เขียนเสร็จ)
+
+ชื่อ test/keyword ถูกเก็บครั้งเดียวในตาราง names; ผลต่อ run เก็บเป็น (name, run) -> calls/fails/elapsed
+keyword ถูกรวมต่อ run (จำนวนครั้ง + เวลารวม + เวลาสูงสุด) ไม่ได้เก็บทุกครั้งที่เรียก ฐานข้อมูลจึงโตตามจำนวนชื่อ x run
+query ทุกแบบอ่านเฉพาะ run ล่าสุดตาม window จึงไม่ช้าลงเมื่อมี run สะสมเป็นพันๆ run
+"""
+import argparse
+import hashlib
+import json
+import sqlite3
+import sys
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+_lib_dir = Path(__file__).resolve().parent
+if str(_lib_dir) not in sys.path:
+    sys.path.insert(0, str(_lib_dir))
+from base_library import BaseLibrary, keyword
+from output_stats import iter_output
+from settings_schema import DrdbEnvironment
+
+DEFAULT_DATABASE = 'run_history.sqlite'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    digest TEXT NOT NULL UNIQUE,
+    label TEXT,
+    source TEXT,
+    started TEXT,
+    ingested TEXT NOT NULL,
+    tests INTEGER NOT NULL,
+    failed INTEGER NOT NULL,
+    elapsed REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS names (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    UNIQUE (kind, name)
+);
+CREATE TABLE IF NOT EXISTS results (
+    name_id INTEGER NOT NULL REFERENCES names (id),
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    calls INTEGER NOT NULL,
+    fails INTEGER NOT NULL,
+    skips INTEGER NOT NULL,
+    elapsed REAL NOT NULL,
+    max_elapsed REAL NOT NULL,
+    PRIMARY KEY (name_id, run_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_run ON results (run_id, name_id);
+"""
+
+
+def connect(database) -> sqlite3.Connection:
+    """เปิด (หรือสร้าง) ฐานข้อมูล run history"""
+    Path(database).parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(str(database))
+    db.execute('PRAGMA journal_mode=WAL')
+    db.execute('PRAGMA synchronous=NORMAL')
+    db.execute('PRAGMA foreign_keys=ON')
+    db.executescript(_SCHEMA)
+    return db
+
+
+def _file_digest(path: Path) -> str:
+    """hash ของ output.xml (กัน ingest run เดียวกันซ้ำ)"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _aggregate(source: Path) -> Tuple[Dict[Tuple[str, str], List[float]], Dict[str, Any]]:
+    """
+    stream output.xml -> {(kind, name): [calls, fails, skips, elapsed, max_elapsed]} และข้อมูลของ run
+    (ข้อมูลของ run มาจาก suite นอกสุด ซึ่งเป็น record สุดท้ายที่ iter_output ส่งออกมา)
+    """
+    rows: Dict[Tuple[str, str], List[float]] = {}
+    run: Dict[str, Any] = {'started': None, 'elapsed': 0.0, 'tests': 0, 'failed': 0}
+    for record in iter_output(source):
+        if record.kind == 'suite':
+            run['started'] = record.start.isoformat() if record.start else None
+            run['elapsed'] = record.elapsed
+            continue
+        if record.kind == 'test':
+            run['tests'] += 1
+            run['failed'] += record.status == 'FAIL'
+        row = rows.get((record.kind, record.name))
+        if row is None:
+            row = rows[(record.kind, record.name)] = [0, 0, 0, 0.0, 0.0]
+        row[0] += 1
+        row[1] += record.status == 'FAIL'
+        row[2] += record.status == 'SKIP'
+        row[3] += record.elapsed
+        if record.elapsed > row[4]:
+            row[4] = record.elapsed
+    return rows, run
+
+
+def ingest(db: sqlite3.Connection, output_xml, label: Optional[str] = None, keep: Optional[int] = None) -> Optional[int]:
+    """
+    เพิ่ม run จาก output.xml (ใน transaction เดียว) คืนค่า run id หรือ None ถ้าไฟล์นี้ถูก ingest ไปแล้ว
+    keep: เก็บไว้เฉพาะ N run ล่าสุด (ลบ run ที่เก่ากว่าและชื่อที่ไม่ถูกอ้างถึงแล้ว)
+    """
+    source = Path(output_xml)
+    digest = _file_digest(source)
+    if db.execute('SELECT 1 FROM runs WHERE digest = ?', (digest,)).fetchone():
+        return None
+    rows, run = _aggregate(source)
+    with db:
+        cursor = db.execute(
+            'INSERT INTO runs (digest, label, source, started, ingested, tests, failed, elapsed) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (digest, label, str(source.resolve()), run['started'], time.strftime('%Y-%m-%dT%H:%M:%S'),
+             run['tests'], run['failed'], run['elapsed']))
+        run_id = cursor.lastrowid
+        db.executemany('INSERT OR IGNORE INTO names (kind, name) VALUES (?, ?)', rows.keys())
+        name_ids = _name_ids(db, rows.keys())
+        db.executemany(
+            'INSERT INTO results (name_id, run_id, calls, fails, skips, elapsed, max_elapsed) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            ((name_ids[key], run_id, *row) for key, row in rows.items()))
+        if keep:
+            prune(db, keep)
+    return run_id
+
+
+def _name_ids(db: sqlite3.Connection, keys: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], int]:
+    wanted = set(keys)
+    ids: Dict[Tuple[str, str], int] = {}
+    for kind in {kind for kind, _ in wanted}:
+        for name_id, name in db.execute('SELECT id, name FROM names WHERE kind = ?', (kind,)):
+            if (kind, name) in wanted:
+                ids[(kind, name)] = name_id
+    return ids
+
+
+def prune(db: sqlite3.Connection, keep: int) -> int:
+    """ลบ run ที่เก่ากว่า N run ล่าสุด คืนค่าจำนวน run ที่ลบ"""
+    cutoff = db.execute('SELECT id FROM runs ORDER BY id DESC LIMIT 1 OFFSET ?', (keep - 1,)).fetchone()
+    if cutoff is None:
+        return 0
+    deleted = db.execute('DELETE FROM runs WHERE id < ?', (cutoff[0],)).rowcount
+    if deleted:
+        db.execute('DELETE FROM names WHERE id NOT IN (SELECT DISTINCT name_id FROM results)')
+    return deleted
+
+
+def _recent_runs(db: sqlite3.Connection, runs: int) -> List[int]:
+    return [row[0] for row in db.execute('SELECT id FROM runs ORDER BY id DESC LIMIT ?', (runs,))]
+
+
+def _window_rows(db: sqlite3.Connection, kind: str, run_ids: List[int]):
+    """(name, run_id, calls, fails, skips, elapsed) ของ run ใน window เรียงตามชื่อแล้วตาม run"""
+    if not run_ids:
+        return []
+    return db.execute(
+        'SELECT n.name, r.run_id, r.calls, r.fails, r.skips, r.elapsed FROM results r '
+        'JOIN names n ON n.id = r.name_id '
+        'WHERE n.kind = ? AND r.run_id >= ? ORDER BY n.name, r.run_id',
+        (kind, min(run_ids)))
+
+
+def slowest(db: sqlite3.Connection, top: int = 10, runs: int = 10, kind: str = 'test') -> List[Dict[str, Any]]:
+    """test (หรือ keyword) ที่ใช้เวลาเฉลี่ยต่อ run มากที่สุดใน N run ล่าสุด"""
+    run_ids = _recent_runs(db, runs)
+    if not run_ids:
+        return []
+    rows = db.execute(
+        'SELECT n.name, COUNT(*), AVG(r.elapsed), MAX(r.max_elapsed), SUM(r.calls) FROM results r '
+        'JOIN names n ON n.id = r.name_id WHERE n.kind = ? AND r.run_id >= ? '
+        'GROUP BY r.name_id ORDER BY AVG(r.elapsed) DESC LIMIT ?',
+        (kind, min(run_ids), top))
+    return [{'name': name, 'runs': count, 'mean_seconds': round(mean, 4), 'max_seconds': round(peak, 4),
+             'calls': calls} for name, count, mean, peak, calls in rows]
+
+
+def regressions(db: sqlite3.Connection, window: int = 10, threshold: float = 0.25, min_seconds: float = 0.5,
+                kind: str = 'test') -> List[Dict[str, Any]]:
+    """
+    test ที่ run ล่าสุดช้ากว่า baseline (median ของ window run ก่อนหน้าที่ test นั้นรัน) เกิน threshold
+    และช้าลงอย่างน้อย min_seconds (กัน test สั้นๆ ที่แกว่งเป็นสัดส่วนสูง)
+    """
+    run_ids = _recent_runs(db, window + 1)
+    if len(run_ids) < 2:
+        return []
+    import statistics
+
+    latest = run_ids[0]
+    history: Dict[str, List[Tuple[int, float]]] = {}
+    for name, run_id, calls, _, _, elapsed in _window_rows(db, kind, run_ids):
+        # keyword: เทียบเวลาเฉลี่ยต่อครั้ง (จำนวนครั้งที่เรียกต่าง run กันได้)
+        history.setdefault(name, []).append((run_id, elapsed / calls if kind == 'kw' else elapsed))
+    found = []
+    for name, points in history.items():
+        if points[-1][0] != latest or len(points) < 2:
+            continue
+        current = points[-1][1]
+        baseline = statistics.median(value for _, value in points[:-1])
+        if current - baseline >= min_seconds and current > baseline * (1 + threshold):
+            found.append({'name': name, 'seconds': round(current, 4), 'baseline_seconds': round(baseline, 4),
+                          'change': round(current / baseline - 1, 4) if baseline else None,
+                          'baseline_runs': len(points) - 1})
+    found.sort(key=lambda item: item['seconds'] - item['baseline_seconds'], reverse=True)
+    return found
+
+
+def flaky(db: sqlite3.Connection, runs: int = 20, min_flips: int = 1) -> List[Dict[str, Any]]:
+    """
+    test ที่ทั้ง pass และ fail ใน N run ล่าสุด เรียงตามจำนวนครั้งที่ผลสลับ (pass<->fail) แล้วตามสัดส่วน fail
+    (run ที่ test ถูก skip ไม่นับ)
+    """
+    history: Dict[str, List[bool]] = {}
+    for name, _, calls, fails, skips, _ in _window_rows(db, 'test', _recent_runs(db, runs)):
+        if skips < calls:
+            history.setdefault(name, []).append(fails > 0)
+    found = []
+    for name, failed in history.items():
+        flips = sum(a != b for a, b in zip(failed, failed[1:]))
+        if flips >= min_flips and any(failed) and not all(failed):
+            found.append({'name': name, 'runs': len(failed), 'failures': sum(failed), 'flips': flips,
+                          'fail_ratio': round(sum(failed) / len(failed), 4), 'last_failed': failed[-1]})
+    found.sort(key=lambda item: (item['flips'], item['fail_ratio']), reverse=True)
+    return found
+
+
+class RunHistory(BaseLibrary):
+    """
+    Robot Framework library สำหรับ run history
+
+    - database: ไฟล์ SQLite (default: <DRDB_environment.output_dir>/run_history.sqlite จาก project root)
+    """
+
+    ROBOT_LIBRARY_SCOPE = 'GLOBAL'
+    ROBOT_LIBRARY_VERSION = '1.0'
+
+    def __init__(self, database: Optional[str] = None):
+        self._database = database
+
+    @keyword
+    def ingest_run_output(self, output_xml: str, label: Optional[str] = None, keep: Optional[int] = None) -> Optional[int]:
+        """เพิ่ม output.xml ของ run ก่อนหน้าลง history คืนค่า run id (None ถ้าไฟล์นี้ถูกเพิ่มไปแล้ว)"""
+        with closing(connect(self._database_path())) as db:
+            return ingest(db, self.resolve_path(output_xml), label, int(keep) if keep else None)
+
+    @keyword
+    def get_slowest_tests(self, top: int = 10, runs: int = 10, kind: str = 'test') -> List[Dict[str, Any]]:
+        """test (kind=kw: keyword) ที่ใช้เวลาเฉลี่ยมากที่สุดใน N run ล่าสุด"""
+        with closing(connect(self._database_path())) as db:
+            return slowest(db, int(top), int(runs), kind)
+
+    @keyword
+    def get_duration_regressions(self, window: int = 10, threshold: float = 0.25, min_seconds: float = 0.5,
+                                 kind: str = 'test') -> List[Dict[str, Any]]:
+        """test ที่ run ล่าสุดช้ากว่า median ของ window run ก่อนหน้าเกิน threshold (0.25 = 25%)"""
+        with closing(connect(self._database_path())) as db:
+            return regressions(db, int(window), float(threshold), float(min_seconds), kind)
+
+    @keyword
+    def get_flaky_tests(self, runs: int = 20, min_flips: int = 1) -> List[Dict[str, Any]]:
+        """test ที่ผลสลับระหว่าง pass/fail ใน N run ล่าสุด"""
+        with closing(connect(self._database_path())) as db:
+            return flaky(db, int(runs), int(min_flips))
+
+    def _database_path(self) -> Path:
+        if self._database:
+            return self.resolve_path(self._database)
+        output_dir = DrdbEnvironment.coerce_field('output_dir', self.get_setting('DRDB_environment', 'output_dir'))
+        return self.resolve_path(output_dir) / DEFAULT_DATABASE
+
+
+class HistoryListener:
+    """
+    listener ที่ ingest output.xml ของ run นี้ทันทีที่ Robot เขียนเสร็จ
+        robot --listener run_history.HistoryListener[:database[:keep]] ...
+    """
+
+    ROBOT_LISTENER_API_VERSION = 2
+
+    def __init__(self, database: Optional[str] = None, keep: Optional[str] = None):
+        self._history = RunHistory(database)
+        self._keep = int(keep) if keep else None
+
+    def output_file(self, path):
+        self._history.ingest_run_output(path, keep=self._keep)
+
+
+def _print_rows(rows: List[Dict[str, Any]], as_json: bool) -> None:
+    if as_json:
+        print(json.dumps(rows, indent=2, ensure_ascii=False))
+        return
+    if not rows:
+        print('(no results)')
+        return
+    columns = list(rows[0])
+    widths = {c: max(len(c), *(len(str(row[c])) for row in rows)) for c in columns}
+    print('  '.join(c.ljust(widths[c]) for c in columns))
+    for row in rows:
+        print('  '.join(str(row[c]).ljust(widths[c]) for c in columns))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI: python run_history.py ingest|slowest|regressions|flaky ... (ดู --help)"""
+    parser = argparse.ArgumentParser(prog="run_history.py", description="Robot Framework run-history store")
+    parser.add_argument("--db", dest="database", default=None,
+                        help=f"SQLite database (default: <DRDB_environment.output_dir>/{DEFAULT_DATABASE})")
+    parser.add_argument("--json", action="store_true", help="print query results as JSON")
+    commands = parser.add_subparsers(dest="command", required=True)
+    add = commands.add_parser("ingest", help="append the timings of an output.xml")
+    add.add_argument("output_xml", nargs="+")
+    add.add_argument("--label", default=None, help="label stored with the run (e.g. build number)")
+    add.add_argument("--keep", type=int, default=None, help="keep only the N most recent runs")
+    top = commands.add_parser("slowest", help="highest mean duration over the recent runs")
+    top.add_argument("--top", type=int, default=10)
+    top.add_argument("--runs", type=int, default=10)
+    top.add_argument("--kind", choices=("test", "kw"), default="test")
+    reg = commands.add_parser("regressions", help="latest run slower than the rolling median")
+    reg.add_argument("--window", type=int, default=10, help="previous runs in the baseline")
+    reg.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown (0.25 = 25%%)")
+    reg.add_argument("--min-seconds", type=float, default=0.5, help="ignore slowdowns smaller than this")
+    reg.add_argument("--kind", choices=("test", "kw"), default="test")
+    flk = commands.add_parser("flaky", help="tests that flip between pass and fail")
+    flk.add_argument("--runs", type=int, default=20)
+    flk.add_argument("--min-flips", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    history = RunHistory(args.database)
+    if args.command == "ingest":
+        for output_xml in args.output_xml:
+            run_id = history.ingest_run_output(output_xml, args.label, args.keep)
+            print(f"{output_xml}: " + (f"run {run_id}" if run_id is not None else "already ingested"))
+    elif args.command == "slowest":
+        _print_rows(history.get_slowest_tests(args.top, args.runs, args.kind), args.json)
+    elif args.command == "regressions":
+        _print_rows(history.get_duration_regressions(args.window, args.threshold, args.min_seconds, args.kind),
+                    args.json)
+    else:
+        _print_rows(history.get_flaky_tests(args.runs, args.min_flips), args.json)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
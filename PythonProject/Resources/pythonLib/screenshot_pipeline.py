@@ -0,0 +1,298 @@
+"""
+Asynchronous screenshot pipeline for Robot Framework
+keyword ดึงภาพจาก browser (base64 ตามที่ WebDriver ส่งมา) แล้วคืนทันที: การ decode, ย่อขนาด (ถ้ากำหนด max_width)
+และเขียนไฟล์ทำใน background thread ภาพที่เหมือนกันถูกเก็บเป็นไฟล์เดียว (ชื่อไฟล์ = hash ของภาพ)
+ส่วน test ที่อ้างถึงภาพนั้นถูกบันทึกใน screenshots.json; คิวถูก flush ตอนจบทุก suite
+
+    Library    screenshot_pipeline.ScreenshotPipeline    max_width=1280
+
+    Test Teardown    Take Screenshot For Test Status    ${TEST STATUS}
+
+การถ่ายภาพอัตโนมัติเป็นไปตาม DRDB_environment: capture_screenshots (สวิตช์หลัก), screenshot_on_failure,
+screenshot_on_pass; โฟลเดอร์เก็บภาพคือ ${OUTPUT DIR}/screenshots (นอก Robot: DRDB_environment.output_dir)
+"""
+import base64
+import hashlib
+import importlib.util
+import io
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+_lib_dir = Path(__file__).resolve().parent
+if str(_lib_dir) not in sys.path:
+    sys.path.insert(0, str(_lib_dir))
+from base_library import BaseLibrary, keyword
+from result_writer import acquire_lock
+from settings_schema import DrdbEnvironment
+
+_SCREENSHOT_SUBDIR = 'screenshots'
+_MANIFEST_NAME = 'screenshots.json'
+
+
+class ScreenshotPipeline(BaseLibrary):
+    """
+    Robot Framework library สำหรับถ่าย screenshot โดยไม่ให้การ encode/เขียนไฟล์อยู่บน critical path ของ test
+
+    - screenshot_dir: โฟลเดอร์เก็บภาพ (default ${OUTPUT DIR}/screenshots)
+    - max_width: ย่อภาพที่กว้างกว่านี้ (ต้องมี Pillow); None = เก็บ PNG จาก browser ตามเดิม
+    """
+
+    ROBOT_LIBRARY_SCOPE = 'GLOBAL'
+    ROBOT_LIBRARY_VERSION = '1.0'
+
+    def __init__(self, screenshot_dir: Optional[str] = None, max_width: Optional[int] = None):
+        if max_width and importlib.util.find_spec('PIL') is None:
+            raise ImportError("ScreenshotPipeline max_width requires Pillow (pip install Pillow)")
+        self.ROBOT_LIBRARY_LISTENER = _ScreenshotListener(self)
+        self._screenshot_dir = screenshot_dir
+        self._resolved_dir: Optional[Path] = None
+        self._max_width = int(max_width) if max_width else None
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        # hash -> {'file': ชื่อไฟล์, 'references': [{'test', 'name', 'time'}]}
+        self._manifest: Dict[str, Dict[str, Any]] = {}
+        # hash -> จำนวน reference ที่รวมลง screenshots.json แล้ว
+        self._merged: Dict[str, int] = {}
+        self._errors: List[str] = []
+        self._stats = {'captured': 0, 'unique': 0, 'duplicates': 0, 'written': 0, 'bytes_written': 0,
+                       'capture_seconds': 0.0, 'background_seconds': 0.0}
+
+    # ---------- public keywords ----------
+
+    @keyword
+    def capture_screenshot(self, name: Optional[str] = None) -> str:
+        """
+        ถ่าย screenshot ของ browser ปัจจุบันแล้วคืนทันที (ไฟล์ถูกเขียนใน background) คืนค่า path ของไฟล์
+        ภาพที่เหมือนภาพก่อนหน้าทุก pixel จะอ้างถึงไฟล์เดิม
+        """
+        start = time.perf_counter()
+        data = self._selenium().driver.get_screenshot_as_base64()
+        digest = hashlib.blake2b(data.encode('ascii'), digest_size=16).hexdigest()
+        path = self._directory() / f"{digest}.png"
+        reference = {'test': self._current_test(), 'name': name, 'time': time.strftime('%Y-%m-%d %H:%M:%S')}
+        with self._lock:
+            self._stats['captured'] += 1
+            self._stats['capture_seconds'] += time.perf_counter() - start
+            known = self._manifest.get(digest)
+            if known is None:
+                self._manifest[digest] = {'file': path.name, 'references': [reference]}
+                self._stats['unique'] += 1
+            else:
+                known['references'].append(reference)
+                self._stats['duplicates'] += 1
+        if known is None:
+            self._ensure_worker()
+            self._queue.put((data, path))
+        self._log_image(path, name)
+        return str(path)
+
+    @keyword
+    def take_screenshot_on_failure(self, name: Optional[str] = None) -> Optional[str]:
+        """ถ่าย screenshot ถ้า DRDB_environment เปิด capture_screenshots และ screenshot_on_failure"""
+        if self._drdb_setting('capture_screenshots') and self._drdb_setting('screenshot_on_failure'):
+            return self._capture_quietly(name)
+        return None
+
+    @keyword
+    def take_screenshot_for_test_status(self, status: str, name: Optional[str] = None) -> Optional[str]:
+        """
+        สำหรับ Test Teardown: ถ่าย screenshot ตาม ${TEST STATUS} และ flag ใน DRDB_environment
+        (FAIL -> screenshot_on_failure, PASS -> screenshot_on_pass; ทั้งหมดต้องเปิด capture_screenshots)
+        """
+        status = str(status).upper()
+        wanted = ((status == 'FAIL' and self._drdb_setting('screenshot_on_failure'))
+                  or (status == 'PASS' and self._drdb_setting('screenshot_on_pass')))
+        if self._drdb_setting('capture_screenshots') and wanted:
+            return self._capture_quietly(name)
+        return None
+
+    @keyword
+    def flush_screenshots(self) -> Dict[str, Any]:
+        """รอให้ภาพที่ค้างในคิวถูกเขียนครบ แล้วบันทึก screenshots.json; คืนค่า statistics"""
+        self._queue.join()
+        self._write_manifest()
+        return self.get_screenshot_stats()
+
+    @keyword
+    def get_screenshot_stats(self) -> Dict[str, Any]:
+        """จำนวนภาพที่ถ่าย/ไม่ซ้ำ/ซ้ำ/เขียนแล้ว/ค้างในคิว และเวลาที่ใช้ใน test (capture) กับใน background"""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats['pending'] = self._queue.unfinished_tasks
+            stats['errors'] = list(self._errors)
+        return stats
+
+    # ---------- internal helpers ----------
+
+    def _capture_quietly(self, name: Optional[str]) -> Optional[str]:
+        """ใช้ใน teardown: ถ้าไม่มี browser เปิดอยู่ให้ warn แทนการทำให้ teardown fail"""
+        try:
+            return self.capture_screenshot(name)
+        except Exception as error:
+            from robot.api import logger
+            logger.warn(f"Could not capture screenshot: {error}")
+            return None
+
+    def _directory(self) -> Path:
+        """โฟลเดอร์เก็บภาพ (resolve ครั้งแรกที่ใช้ แล้วใช้ค่าเดิมตลอด run รวมถึงตอน close ที่ไม่มี ${OUTPUT DIR} แล้ว)"""
+        if self._resolved_dir is None:
+            if self._screenshot_dir:
+                directory = self.resolve_path(self._screenshot_dir)
+            else:
+                output_dir = self._robot_variable('${OUTPUT DIR}')
+                if output_dir:
+                    directory = Path(output_dir) / _SCREENSHOT_SUBDIR
+                else:
+                    directory = self.resolve_path(self._drdb_setting('output_dir'))
+                    directory = directory / _SCREENSHOT_SUBDIR
+            self._resolved_dir = directory
+        return self._resolved_dir
+
+    def _drdb_setting(self, name: str) -> Any:
+        """DRDB_environment.<name> แปลงตาม type ใน DrdbEnvironment (ไม่มีหรือแปลงไม่ได้ -> default ของ schema)"""
+        return DrdbEnvironment.coerce_field(name, self.get_setting('DRDB_environment', name))
+
+    def _current_test(self) -> Optional[str]:
+        return self._robot_variable('${TEST NAME}') or self._robot_variable('${SUITE NAME}')
+
+    def _robot_variable(self, name: str) -> Optional[str]:
+        try:
+            from robot.libraries.BuiltIn import BuiltIn, RobotNotRunningError
+        except ImportError:
+            return None
+        try:
+            return BuiltIn().get_variable_value(name)
+        except RobotNotRunningError:
+            return None
+
+    def _log_image(self, path: Path, name: Optional[str]) -> None:
+        """แสดงภาพใน log.html (path relative กับ log; ไฟล์จะมีครบเมื่อคิวถูก flush ตอนจบ suite)"""
+        log_file = self._robot_variable('${LOG FILE}')
+        if not log_file or log_file == 'NONE':
+            return
+        from robot.api import logger
+        src = os.path.relpath(path, os.path.dirname(log_file)).replace(os.sep, '/')
+        title = name or path.stem
+        logger.info(f'<a href="{src}"><img src="{src}" width="800px" title="{title}"></a>', html=True)
+
+    def _selenium(self):
+        from robot.libraries.BuiltIn import BuiltIn
+        return BuiltIn().get_library_instance('SeleniumLibrary')
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or not self._worker.is_alive():
+            with self._lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(target=self._run_worker, name='screenshot-writer', daemon=True)
+                    self._worker.start()
+
+    def _run_worker(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                start = time.perf_counter()
+                try:
+                    self._write_image(*item)
+                except Exception as error:
+                    with self._lock:
+                        self._errors.append(f"{item[1]}: {error}")
+                with self._lock:
+                    self._stats['background_seconds'] += time.perf_counter() - start
+            finally:
+                self._queue.task_done()
+
+    def _write_image(self, data: str, path: Path) -> None:
+        if path.exists():
+            # ภาพเดียวกันจาก run ก่อนหน้า (ชื่อไฟล์คือ hash ของภาพ)
+            return
+        png = base64.b64decode(data)
+        if self._max_width:
+            png = self._downscale(png)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(png)
+        os.replace(tmp, path)
+        with self._lock:
+            self._stats['written'] += 1
+            self._stats['bytes_written'] += len(png)
+
+    def _downscale(self, png: bytes) -> bytes:
+        from PIL import Image
+
+        with Image.open(io.BytesIO(png)) as image:
+            if image.width <= self._max_width:
+                return png
+            height = round(image.height * self._max_width / image.width)
+            resized = image.resize((self._max_width, height), Image.LANCZOS)
+        buffer = io.BytesIO()
+        resized.save(buffer, format='PNG', optimize=True)
+        return buffer.getvalue()
+
+    def _write_manifest(self) -> None:
+        """
+        รวม reference ใหม่ของ process นี้เข้ากับ screenshots.json ที่มีอยู่ (ภายใต้ lock ข้าม process)
+        เพื่อไม่ให้ pabot process อื่นหรือ run ก่อนหน้าที่ใช้โฟลเดอร์เดียวกันหายไป
+        """
+        with self._lock:
+            pending = {digest: (entry['file'], entry['references'][self._merged.get(digest, 0):])
+                       for digest, entry in self._manifest.items()
+                       if len(entry['references']) > self._merged.get(digest, 0)}
+        if not pending:
+            return
+        directory = self._directory()
+        directory.mkdir(parents=True, exist_ok=True)
+        manifest_path = directory / _MANIFEST_NAME
+        lock_file = directory / f"{_MANIFEST_NAME}.lock"
+        acquire_lock(lock_file)
+        try:
+            manifest = _read_manifest(manifest_path)
+            for digest, (file_name, references) in pending.items():
+                entry = manifest.setdefault(digest, {'file': file_name, 'references': []})
+                entry['references'].extend(references)
+            tmp = directory / f".{_MANIFEST_NAME}.{os.getpid()}.tmp"
+            tmp.write_text(json.dumps(manifest, indent=2, ensure_ascii=False), encoding='utf-8')
+            os.replace(tmp, manifest_path)
+        finally:
+            lock_file.unlink(missing_ok=True)
+        with self._lock:
+            for digest, (_, references) in pending.items():
+                self._merged[digest] = self._merged.get(digest, 0) + len(references)
+
+    def _stop_worker(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            self._queue.put(None)
+            self._worker.join()
+        self._worker = None
+
+
+def _read_manifest(manifest_path: Path) -> Dict[str, Dict[str, Any]]:
+    """อ่าน screenshots.json เดิม (ไฟล์ไม่มีหรืออ่านไม่ได้ = เริ่มใหม่)"""
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+
+class _ScreenshotListener:
+    """library listener: flush คิวตอนจบทุก suite และหยุด worker ตอนจบ run"""
+    ROBOT_LISTENER_API_VERSION = 3
+
+    def __init__(self, pipeline: ScreenshotPipeline):
+        self.pipeline = pipeline
+
+    def end_suite(self, data, result):
+        self.pipeline.flush_screenshots()
+
+    def close(self):
+        self.pipeline.flush_screenshots()
+        self.pipeline._stop_worker()
@@ -0,0 +1,292 @@
+"""
+WebDriver session pool for Robot Framework
+เก็บ browser ที่เปิดไว้แล้ว (แยกตาม browser + options) ให้ suite ถัดไปหยิบไปใช้ต่อได้
+แทนการเปิด/ปิด browser ใหม่ทุก suite
+
+    Library    session_pool.WebDriverPool    settings_path=../LDP_UI.yaml
+
+    Suite Setup       Open Pooled Browser    ${BASE_URL}
+    Suite Teardown    Release Pooled Browser
+
+driver ถูกสร้างผ่าน factory ที่เปลี่ยนได้ (default: selenium_driver_factory) เพื่อให้ทดสอบ logic ของ pool
+ด้วย fake driver ได้โดยไม่ต้องมี browser จริง
+"""
+import importlib
+import sys
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+_lib_dir = Path(__file__).resolve().parent
+if str(_lib_dir) not in sys.path:
+    sys.path.insert(0, str(_lib_dir))
+from base_library import BaseLibrary, keyword
+from config_reader import ConfigReader
+
+DriverFactory = Callable[[str, Dict[str, Any]], Any]
+ProfileKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+_RESET_STORAGE_JS = (
+    "try { window.localStorage.clear(); } catch (e) {}"
+    "try { window.sessionStorage.clear(); } catch (e) {}"
+)
+
+
+def selenium_driver_factory(browser_name: str, options: Dict[str, Any]):
+    """สร้าง Selenium WebDriver จากชื่อ browser และ options แบบใน LDP_UI.yaml (headless, window_size)"""
+    from selenium import webdriver
+
+    name = browser_name.lower()
+    headless = bool(options.get('headless'))
+    if name in ('firefox', 'ff'):
+        browser_options = webdriver.FirefoxOptions()
+        if headless:
+            browser_options.add_argument('-headless')
+        driver_class = webdriver.Firefox
+    elif name in ('edge', 'msedge'):
+        browser_options = webdriver.EdgeOptions()
+        if headless:
+            browser_options.add_argument('--headless=new')
+        driver_class = webdriver.Edge
+    elif name in ('chrome', 'googlechrome', 'gc'):
+        browser_options = webdriver.ChromeOptions()
+        if headless:
+            browser_options.add_argument('--headless=new')
+        driver_class = webdriver.Chrome
+    else:
+        raise ValueError(f"Unsupported browser for the pool: {browser_name}")
+
+    driver = driver_class(options=browser_options)
+    window_size = options.get('window_size')
+    if window_size:
+        width, height = (int(v) for v in str(window_size).split(','))
+        driver.set_window_size(width, height)
+    return driver
+
+
+def reset_driver(driver) -> None:
+    """ล้าง state ของ session: cookies, localStorage/sessionStorage แล้วไปที่ about:blank"""
+    driver.delete_all_cookies()
+    driver.execute_script(_RESET_STORAGE_JS)
+    driver.get('about:blank')
+
+
+def _profile_key(browser_name: str, options: Dict[str, Any]) -> ProfileKey:
+    return browser_name.lower(), tuple(sorted((str(k), repr(v)) for k, v in options.items()))
+
+
+class SessionPool:
+    """
+    Pool ของ driver ที่ว่างอยู่ แยกตาม profile (browser + options)
+    ไม่ผูกกับ Robot/Selenium: ใช้ได้กับ driver อะไรก็ได้ที่ factory สร้าง
+    """
+
+    def __init__(self, factory: DriverFactory, max_idle_per_profile: int = 2,
+                 reset: Callable[[Any], None] = reset_driver):
+        self._factory = factory
+        self._reset = reset
+        self._max_idle = max_idle_per_profile
+        self._idle: Dict[ProfileKey, List[Any]] = defaultdict(list)
+        self._in_use: Dict[int, Tuple[ProfileKey, Any]] = {}
+        self._lock = threading.Lock()
+        self.stats = {'created': 0, 'reused': 0, 'released': 0, 'discarded': 0}
+
+    def acquire(self, browser_name: str, options: Dict[str, Any]):
+        """หยิบ driver ที่ว่างของ profile นี้ (หรือสร้างใหม่ถ้าไม่มี)"""
+        key = _profile_key(browser_name, options)
+        driver = None
+        while driver is None:
+            with self._lock:
+                idle = self._idle[key]
+                if not idle:
+                    break
+                driver = idle.pop()
+            if not self._alive(driver):
+                self._discard(driver)
+                driver = None
+        if driver is not None:
+            with self._lock:
+                self.stats['reused'] += 1
+        else:
+            driver = self._factory(browser_name, options)
+            with self._lock:
+                self.stats['created'] += 1
+        with self._lock:
+            self._in_use[id(driver)] = (key, driver)
+        return driver
+
+    def release(self, driver) -> bool:
+        """
+        reset state แล้วคืน driver เข้า pool; ถ้า reset ไม่สำเร็จหรือ pool เต็มจะปิด driver ทิ้ง
+        คืนค่า True ถ้า driver ถูกเก็บไว้ใช้ต่อ
+        """
+        with self._lock:
+            key, _ = self._in_use.pop(id(driver), (None, None))
+        if key is None:
+            raise ValueError("Driver was not acquired from this pool")
+        try:
+            self._reset(driver)
+        except Exception:
+            self._discard(driver)
+            return False
+        with self._lock:
+            if len(self._idle[key]) < self._max_idle:
+                self._idle[key].append(driver)
+                self.stats['released'] += 1
+                return True
+        self._discard(driver)
+        return False
+
+    def close_all(self) -> None:
+        """ปิด driver ทุกตัวใน pool (ทั้งที่ว่างและที่ยังถูกใช้อยู่)"""
+        with self._lock:
+            drivers = [d for idle in self._idle.values() for d in idle]
+            drivers += [d for _, d in self._in_use.values()]
+            self._idle.clear()
+            self._in_use.clear()
+        for driver in drivers:
+            self._discard(driver)
+
+    def idle_count(self) -> int:
+        with self._lock:
+            return sum(len(idle) for idle in self._idle.values())
+
+    def _alive(self, driver) -> bool:
+        """browser ที่ว่างอยู่อาจถูกปิดไปแล้ว (crash/timeout) ตรวจด้วย round trip เดียวก่อนใช้ซ้ำ"""
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, driver) -> None:
+        self.stats['discarded'] += 1
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+
+class _PooledDriver:
+    """
+    driver ที่ยืมจาก pool ตามที่ลงทะเบียนกับ SeleniumLibrary: ส่งทุก attribute ต่อไปที่ driver จริง
+    ยกเว้น quit() ที่คืน driver เข้า pool แทนการปิด browser ดังนั้น Close Browser / Close All Browsers
+    (และ Release Pooled Browser) ผ่าน path ปกติของ SeleniumLibrary ได้ครบ
+    สร้าง wrapper ใหม่ทุกครั้งที่ยืม: wrapper ที่ SeleniumLibrary ปิดไปแล้วไม่ถูกลงทะเบียนซ้ำ
+    """
+
+    def __init__(self, pool: SessionPool, driver):
+        object.__setattr__(self, '_pool', pool)
+        object.__setattr__(self, '_driver', driver)
+
+    def __getattr__(self, name: str):
+        return getattr(self._driver, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._driver, name, value)
+
+    def quit(self) -> None:
+        try:
+            self._pool.release(self._driver)
+        except ValueError:
+            # pool ถูกปิดไปแล้ว (Close Browser Pool / จบ run) และ quit driver จริงไปแล้ว
+            pass
+
+
+def _resolve_factory(factory: Union[None, str, DriverFactory]) -> DriverFactory:
+    """factory เป็น callable หรือ dotted path 'module.function' (ส่งจาก Robot เป็น string)"""
+    if factory is None:
+        return selenium_driver_factory
+    if callable(factory):
+        return factory
+    module_name, _, attr = factory.rpartition('.')
+    return getattr(importlib.import_module(module_name), attr)
+
+
+class WebDriverPool(BaseLibrary):
+    """
+    Robot Framework library ที่ยืม/คืน browser จาก SessionPool และลงทะเบียนกับ SeleniumLibrary
+    browser/options มาจาก ConfigReader (browser.name, browsers.<name>.options) ของ settings_path
+    """
+
+    ROBOT_LIBRARY_SCOPE = 'GLOBAL'
+    ROBOT_LIBRARY_VERSION = '1.0'
+
+    # pool ใช้ร่วมกันทุก instance/suite ใน process
+    _pool: Optional[SessionPool] = None
+    _pool_lock = threading.Lock()
+
+    def __init__(self, settings_path: Optional[str] = None,
+                 driver_factory: Union[None, str, DriverFactory] = None,
+                 max_idle_per_profile: int = 2):
+        self._config = ConfigReader()
+        if settings_path:
+            self._config.DEFAULT_SETTINGS_PATH = settings_path
+        self._factory = _resolve_factory(driver_factory)
+        self._max_idle = int(max_idle_per_profile)
+        self.ROBOT_LIBRARY_LISTENER = _PoolListener()
+
+    @keyword
+    def open_pooled_browser(self, url: Optional[str] = None, browser: Optional[str] = None,
+                            alias: Optional[str] = None) -> int:
+        """
+        ยืม browser จาก pool (สร้างใหม่ถ้าไม่มีตัวว่าง) แล้วลงทะเบียนเป็น browser ปัจจุบันของ SeleniumLibrary
+        คืนค่า index ของ browser ใน SeleniumLibrary
+        """
+        browser = browser or self._config.get_browser_name()
+        options = self._config.get_browser_options(browser) or self._config.get_browser_options()
+        pool = self._get_pool()
+        driver = _PooledDriver(pool, pool.acquire(browser, options or {}))
+        index = self._selenium().register_driver(driver, alias)
+        if url:
+            driver.get(url)
+        return index
+
+    @keyword
+    def release_pooled_browser(self) -> None:
+        """
+        คืน browser ปัจจุบันเข้า pool (reset cookies/storage และไปที่ about:blank) โดยไม่ปิด browser
+        ใช้แทน Close Browser / Close All Browsers ใน Suite Teardown (ซึ่งก็คืน browser ที่ยืมมาเข้า pool เช่นกัน)
+        """
+        selenium = self._selenium()
+        if not isinstance(selenium.driver, _PooledDriver):
+            raise ValueError("Current browser was not opened with Open Pooled Browser")
+        selenium.close_browser()
+
+    @keyword
+    def close_browser_pool(self) -> None:
+        """ปิด browser ทุกตัวใน pool"""
+        pool = WebDriverPool._pool
+        if pool is not None:
+            pool.close_all()
+
+    @keyword
+    def get_browser_pool_stats(self) -> Dict[str, int]:
+        """จำนวน browser ที่สร้าง/ใช้ซ้ำ/คืน/ทิ้ง และจำนวนที่ว่างอยู่ใน pool"""
+        pool = self._get_pool()
+        stats = dict(pool.stats)
+        stats['idle'] = pool.idle_count()
+        return stats
+
+    # ---------- internal helpers ----------
+
+    def _get_pool(self) -> SessionPool:
+        with WebDriverPool._pool_lock:
+            if WebDriverPool._pool is None:
+                WebDriverPool._pool = SessionPool(self._factory, self._max_idle)
+            return WebDriverPool._pool
+
+    def _selenium(self):
+        from robot.libraries.BuiltIn import BuiltIn
+        return BuiltIn().get_library_instance('SeleniumLibrary')
+
+
+class _PoolListener:
+    """library listener: ปิด browser ทั้ง pool ตอนจบ run"""
+    ROBOT_LISTENER_API_VERSION = 3
+
+    def close(self):
+        pool = WebDriverPool._pool
+        if pool is not None:
+            pool.close_all()
@@ -0,0 +1,137 @@
+"""
+Layered settings (overlays on top of the settings file)
+ลำดับ layer: ไฟล์ settings หลัก -> ไฟล์ของ environment -> local override -> environment variables
+layer หลังทับ layer ก่อนหน้าแบบ deep merge (dict ถูก merge ทีละ key, ค่าอื่นรวมถึง list ถูกแทนทั้งก้อน)
+ผลลัพธ์เป็น FrozenSettings (dict ที่แก้ไม่ได้) ซึ่ง lookup ของ BaseLibrary ใช้ตรงๆ
+
+กำหนด layer ได้ 2 แบบ (comma separated, path relative กับ project root):
+    ROBOT_SETTINGS_LAYERS=Environment/DRDB_Config.uat.yaml,Environment/DRDB_Config.local.yaml,env:DRDB
+    Set Settings Layers    Environment/DRDB_Config.uat.yaml    env:DRDB
+
+    - ไฟล์ overlay ที่ไม่มีอยู่ถูกข้าม (เช่น local override) และถูกโหลดเมื่อสร้างไฟล์ภายหลัง
+    - env:PREFIX = environment variable PREFIX__Section__key=value (value อ่านเป็น YAML scalar)
+
+ผล merge ถึงแต่ละ layer ถูก memoize ตาม signature ของ layer ก่อนหน้า: เมื่อ layer หนึ่งเปลี่ยนจะ merge ใหม่
+เฉพาะ layer นั้นกับ layer หลังจากนั้น (shared snapshot ของ ROBOT_SETTINGS_SHARED ใช้เฉพาะไฟล์ที่ไม่มี overlay)
+"""
+import os
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+LAYERS_ENV = 'ROBOT_SETTINGS_LAYERS'
+ENV_LAYER_PREFIX = 'env:'
+# ตัวคั่น section/key ในชื่อ environment variable (ชื่อ section มี '_' อยู่แล้ว)
+ENV_KEY_SEPARATOR = '__'
+
+
+def _readonly(self, *args, **kwargs):
+    raise TypeError(f"{type(self).__name__} is read-only")
+
+
+class FrozenSettings(dict):
+    """dict ที่แก้ไขไม่ได้ (merged view ของ layer ซึ่ง subtree ที่ไม่เปลี่ยนถูกใช้ร่วมกันระหว่าง merge)"""
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
+
+    def __reduce__(self):
+        return FrozenSettings, (dict(self),)
+
+    def __copy__(self) -> "FrozenSettings":
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "FrozenSettings":
+        return self
+
+
+def freeze(value: Any) -> Any:
+    """แปลง dict/list ทั้ง tree เป็น FrozenSettings/tuple"""
+    if isinstance(value, FrozenSettings):
+        return value
+    if isinstance(value, dict):
+        return FrozenSettings((key, freeze(child)) for key, child in value.items())
+    if isinstance(value, list):
+        return tuple(freeze(child) for child in value)
+    return value
+
+
+def deep_merge(base: Optional[Mapping[str, Any]], overlay: Mapping[str, Any]) -> FrozenSettings:
+    """
+    merge overlay ทับ base (ทั้งคู่ไม่ถูกแก้) คืน FrozenSettings ใหม่
+    copy เฉพาะ dict ที่ overlay แตะ: subtree อื่นของ base ถูกใช้ร่วมกัน
+    """
+    if not base:
+        return freeze(overlay)
+    merged = dict(base)
+    for key, value in overlay.items():
+        current = merged.get(key)
+        if isinstance(value, dict) and isinstance(current, dict):
+            merged[key] = deep_merge(current, value)
+        else:
+            merged[key] = freeze(value)
+    return FrozenSettings(merged)
+
+
+def parse_layers(spec: Optional[str]) -> Tuple[str, ...]:
+    """ROBOT_SETTINGS_LAYERS (comma separated) -> tuple ของ layer"""
+    if not spec:
+        return ()
+    return tuple(part.strip() for part in spec.split(',') if part.strip())
+
+
+def env_layer_prefix(layer: str) -> Optional[str]:
+    """prefix ของ environment variable layer (env:PREFIX) หรือ None ถ้าเป็นไฟล์"""
+    if layer.startswith(ENV_LAYER_PREFIX):
+        return layer[len(ENV_LAYER_PREFIX):] + ENV_KEY_SEPARATOR
+    return None
+
+
+def env_layer_items(prefix: str) -> Tuple[Tuple[str, str], ...]:
+    """environment variable ของ layer (เรียงตามชื่อ) ใช้เป็นทั้ง signature และข้อมูลของ layer"""
+    return tuple(sorted((name, value) for name, value in os.environ.items() if name.startswith(prefix)))
+
+
+def env_layer_data(prefix: str, items: Tuple[Tuple[str, str], ...]) -> Dict[str, Any]:
+    """PREFIX__Section__key=value -> {'Section': {'key': value}}"""
+    data: Dict[str, Any] = {}
+    for name, text in items:
+        keys = [key for key in name[len(prefix):].split(ENV_KEY_SEPARATOR) if key]
+        if not keys:
+            continue
+        node = data
+        for key in keys[:-1]:
+            child = node.get(key)
+            if not isinstance(child, dict):
+                child = node[key] = {}
+            node = child
+        node[keys[-1]] = _env_value(text)
+    return data
+
+
+def _env_value(text: str) -> Any:
+    """ค่าของ environment variable อ่านเป็น YAML scalar (30 -> int, true -> bool) ถ้าอ่านไม่ได้ใช้ string เดิม"""
+    if not text.strip():
+        return text
+    import yaml
+    try:
+        value = yaml.load(text, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+    except yaml.YAMLError:
+        return text
+    return text if value is None and text.strip() not in ('null', '~') else value
+
+
+def describe_layers(layers: Tuple[str, ...]) -> Iterator[Dict[str, Any]]:
+    for layer in layers:
+        prefix = env_layer_prefix(layer)
+        if prefix is None:
+            yield {'layer': layer, 'type': 'file'}
+        else:
+            yield {'layer': layer, 'type': 'env', 'variables': [name for name, _ in env_layer_items(prefix)]}
+
+
+def layer_list(value: Any) -> List[str]:
+    """argument ของ keyword: หลาย argument หรือ string เดียวแบบ comma separated"""
+    layers: List[str] = []
+    for item in value:
+        layers.extend(parse_layers(item))
+    return layers
@@ -0,0 +1,211 @@
+"""
+Typed settings schema (optional layer on top of BaseLibrary settings)
+แปลง section ใน YAML เป็น object แบบ immutable ที่ใช้ __slots__ ครั้งเดียวตอนโหลดไฟล์:
+ค่าแต่ละ field ถูก coerce/validate เป็น type ที่ประกาศไว้ (เช่น timeout -> int) และเติม default
+ค่าผิด type จะ error ตอนโหลด (SettingsValidationError) ไม่ใช่กลาง run
+
+library ที่ต้องการใช้ตั้ง SETTINGS_SCHEMA (ดู TypedConfigReader) แล้วอ่านค่าด้วย attribute:
+    self.get_typed_section('LDP_environment').timeout
+library ที่ไม่ได้ตั้ง schema (ไฟล์ settings ไม่ถูก validate) แปลงค่าทีละตัวได้ด้วย
+<Section>.coerce_field() หรือ coerce_value()
+"""
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+_TRUE = ('true', 'yes', 'on', '1')
+_FALSE = ('false', 'no', 'off', '0', 'none', '')
+
+
+class SettingsValidationError(ValueError):
+    """ค่าใน settings ไม่ตรงกับ schema (รวมทุก field ที่ผิดไว้ใน error เดียว)"""
+
+    def __init__(self, settings_file: Any, problems: List[str]):
+        self.problems = problems
+        super().__init__(f"Invalid settings in {settings_file}:\n  " + "\n  ".join(problems))
+
+
+def _to_int(value: Any) -> int:
+    if isinstance(value, bool):
+        raise TypeError
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        return int(value.strip())
+    raise TypeError
+
+
+def _to_float(value: Any) -> float:
+    if isinstance(value, bool):
+        raise TypeError
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        return float(value.strip())
+    raise TypeError
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in _TRUE:
+            return True
+        if text in _FALSE:
+            return False
+    raise ValueError
+
+
+def _to_str(value: Any) -> str:
+    if isinstance(value, (str, int, float)) and not isinstance(value, bool):
+        return str(value)
+    raise TypeError
+
+
+def _to_mapping(value: Any) -> Mapping[str, Any]:
+    if isinstance(value, Mapping):
+        return MappingProxyType(dict(value))
+    raise TypeError
+
+
+_COERCERS: Dict[type, Callable[[Any], Any]] = {int: _to_int, float: _to_float, bool: _to_bool,
+                                               str: _to_str, dict: _to_mapping}
+
+
+def coerce_value(value: Any, type_: type, default: Any = None) -> Any:
+    """แปลงค่าเดียวแบบเดียวกับ schema แต่ไม่ raise: None หรือค่าที่แปลงไม่ได้ (เช่น placeholder) ได้ default"""
+    if value is None:
+        return default
+    try:
+        return _COERCERS[type_](value)
+    except (TypeError, ValueError):
+        return default
+
+
+class Field(NamedTuple):
+    """type ของ field (int/float/bool/str/dict) และค่า default เมื่อไม่มีใน YAML (หรือเป็น null)"""
+    type: type
+    default: Any = None
+
+
+class SchemaSection:
+    """
+    Base class ของ section แบบ typed: subclass ประกาศ FIELDS และ __slots__ = tuple(FIELDS)
+    สร้างผ่าน from_mapping() เท่านั้น; แก้ค่าไม่ได้หลังสร้าง
+    """
+    __slots__ = ()
+    FIELDS: Dict[str, Field] = {}
+
+    @classmethod
+    def from_mapping(cls, data: Optional[Mapping[str, Any]], path: str, problems: List[str]) -> "SchemaSection":
+        """สร้าง section จาก dict ของ YAML; field ที่ผิด type ถูกเพิ่มใน problems (และใช้ default แทน)"""
+        section = object.__new__(cls)
+        if data is not None and not isinstance(data, Mapping):
+            problems.append(f"{path}: expected a mapping, got {type(data).__name__}")
+            data = None
+        for name, field in cls.FIELDS.items():
+            value = data.get(name) if data is not None else None
+            if value is None:
+                value = field.default
+            else:
+                try:
+                    value = _COERCERS[field.type](value)
+                except (TypeError, ValueError):
+                    problems.append(f"{path}.{name}: expected {field.type.__name__}, got {value!r}")
+                    value = field.default
+            object.__setattr__(section, name, value)
+        return section
+
+    @classmethod
+    def coerce_field(cls, name: str, value: Any) -> Any:
+        """ค่าของ field name ตัวเดียว (สำหรับ library ที่ไม่ได้ตั้ง SETTINGS_SCHEMA): แปลงไม่ได้ -> default ของ field"""
+        field = cls.FIELDS[name]
+        return coerce_value(value, field.type, field.default)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    def __eq__(self, other: Any) -> bool:
+        return type(other) is type(self) and other.as_dict() == self.as_dict()
+
+    def __hash__(self) -> int:
+        return hash((type(self), tuple(self.as_dict().items())))
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{name}={value!r}" for name, value in self.as_dict().items())
+        return f"{type(self).__name__}({fields})"
+
+
+class LdpEnvironment(SchemaSection):
+    FIELDS = {
+        'ldp_base_url': Field(str, ''),
+        'timeout': Field(int, 30),
+        'implicit_wait': Field(int, 10),
+    }
+    __slots__ = tuple(FIELDS)
+
+
+class DrdbEnvironment(SchemaSection):
+    FIELDS = {
+        'drdb_base_url': Field(str, ''),
+        'timeout': Field(int, 30),
+        'implicit_wait': Field(int, 10),
+        'capture_screenshots': Field(bool, False),
+        'rewrite_file': Field(str, ''),
+        'test_data_file': Field(str, ''),
+        'sheet_name': Field(str, ''),
+        'output_dir': Field(str, 'results'),
+        'screenshot_on_failure': Field(bool, True),
+        'screenshot_on_pass': Field(bool, False),
+    }
+    __slots__ = tuple(FIELDS)
+
+
+class SmsSmartEnvironment(SchemaSection):
+    FIELDS = {
+        'username': Field(str, ''),
+        'password': Field(str, ''),
+        'sms_url': Field(str, ''),
+    }
+    __slots__ = tuple(FIELDS)
+
+
+class BrowserSection(SchemaSection):
+    FIELDS = {
+        'name': Field(str, 'Chrome'),
+        'options': Field(dict, MappingProxyType({})),
+    }
+    __slots__ = tuple(FIELDS)
+
+
+# section ของ DRDB_Config.yaml / LDP_UI.yaml ที่ ConfigReader ใช้ (section ที่ไม่มีในไฟล์ได้ค่า default ทั้งหมด)
+CONFIG_SCHEMA: Tuple[Tuple[str, type], ...] = (
+    ('LDP_environment', LdpEnvironment),
+    ('DRDB_environment', DrdbEnvironment),
+    ('SMSSmart_environment', SmsSmartEnvironment),
+    ('browser', BrowserSection),
+)
+
+
+def compile_settings(data: Mapping[str, Any], schema: Tuple[Tuple[str, type], ...],
+                     settings_file: Any = '<settings>') -> Mapping[str, SchemaSection]:
+    """
+    แปลง settings ที่โหลดแล้วเป็น {section: SchemaSection} (read-only)
+    raise SettingsValidationError ถ้ามี field ใดผิด type (รายงานทุก field ในครั้งเดียว)
+    """
+    problems: List[str] = []
+    sections = {name: section_class.from_mapping(data.get(name), name, problems)
+                for name, section_class in schema}
+    if problems:
+        raise SettingsValidationError(settings_file, problems)
+    return MappingProxyType(sections)
@@ -0,0 +1,28 @@
+"""
+Robot Framework variable file for the settings YAML
+
+    *** Settings ***
+    Variables    ${CURDIR}/Resources/pythonLib/settings_variables.py
+    Variables    ${CURDIR}/Resources/pythonLib/settings_variables.py    Environment/Other.yaml
+
+ตัวแปรทุก section (เช่น ${INPUT_TEST_DATA_GDR_INPUTFILENAME}) พร้อมใช้ตั้งแต่ตอน parse โดยไม่ต้องเรียก keyword
+ไฟล์ที่ generate จะถูกสร้างใหม่อัตโนมัติเมื่อ hash ของ YAML เปลี่ยน (ดู DataReader.generate_variable_file)
+"""
+import importlib.util
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+_lib_dir = Path(__file__).resolve().parent
+if str(_lib_dir) not in sys.path:
+    sys.path.insert(0, str(_lib_dir))
+
+
+def get_variables(settings_path: Optional[str] = None, output_path: Optional[str] = None) -> Dict[str, Any]:
+    from data_reader import DataReader
+
+    output = DataReader().generate_variable_file(output_path, settings_path=settings_path)
+    spec = importlib.util.spec_from_file_location(f"_settings_variables_{Path(output).stem}", output)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return {name: getattr(module, name) for name in module.__all__}
@@ -0,0 +1,295 @@
+"""
+Duration-balanced test sharding for parallel Robot Framework runs
+แบ่ง test (หรือ suite) เป็น N shard ตามเวลาที่เคยใช้ใน output.xml ของ run ก่อนหน้า (อ่านแบบ stream ด้วย
+output_stats.iter_output) ด้วย heuristic longest-processing-time-first: หน่วยที่นานที่สุดถูกใส่ shard ที่ว่างที่สุดก่อน
+
+    python shard_scheduler.py plan test.robot tests/ --history results/output.xml --shards 4 --out-dir shards
+    python shard_scheduler.py run shards/plan.json test.robot tests/ --outputdir results/shards [-- robot options]
+    python shard_scheduler.py report shards/plan.json results/shards/shard_*/output.xml
+
+- --group-tag TAG (ใส่ได้หลายครั้ง, default ไม่มี): test ที่มี group tag เดียวกันอยู่ shard เดียวกันเสมอ
+  (test ที่มีหลาย group tag เชื่อม group เหล่านั้นเข้าด้วยกัน) ใช้เฉพาะ tag ที่ test ต้องรันต่อกันจริง
+  tag กว้างๆ อย่าง smoke หรือ authentication รวม test เกือบทั้ง suite เป็นหน่วยเดียวจนแบ่ง shard ไม่ได้
+- --by suite: หน่วยที่แบ่งคือไฟล์ suite ทั้งไฟล์ แทน test ทีละ test
+- test ที่ไม่มีใน history ใช้ median ของเวลาที่รู้ (หรือ --default-seconds)
+- แต่ละ shard ได้ argument file (--test/--suite ทีละบรรทัด) สำหรับ robot --argumentfile
+- report เทียบ makespan ที่คาดไว้ใน plan.json กับเวลาจริงจาก output.xml ของแต่ละ shard
+"""
+import argparse
+import heapq
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+_lib_dir = Path(__file__).resolve().parent
+if str(_lib_dir) not in sys.path:
+    sys.path.insert(0, str(_lib_dir))
+from output_stats import iter_output
+
+# grouping เป็น opt-in: tag ที่ใช้กันทั่วไปเชื่อม test ส่วนใหญ่เข้าด้วยกัน
+DEFAULT_GROUP_TAGS: Tuple[str, ...] = ()
+DEFAULT_SECONDS = 1.0
+PLAN_FILE = 'plan.json'
+
+
+class TestCase(NamedTuple):
+    name: str            # full name (Suite.Sub.Test)
+    suite: str           # full name ของ suite ที่อยู่
+    tags: Tuple[str, ...]
+
+
+class Unit(NamedTuple):
+    """หน่วยที่ถูกจัดลง shard: test/suite หนึ่งตัว หรือหลายตัวที่ต้องอยู่ด้วยกันตาม group tag"""
+    key: str
+    tests: Tuple[str, ...]
+    suites: Tuple[str, ...]
+    seconds: float
+
+
+def load_durations(outputs: Iterable[Any]) -> Dict[str, float]:
+    """full test name -> median ของเวลาที่รันจริง (PASS/FAIL) จาก output.xml หลายไฟล์"""
+    samples: Dict[str, List[float]] = {}
+    for output in outputs:
+        for record in iter_output(str(output)):
+            if record.kind == 'test' and record.status in ('PASS', 'FAIL'):
+                samples.setdefault(record.name, []).append(record.elapsed)
+    return {name: _median(values) for name, values in samples.items()}
+
+
+def _median(values: List[float]) -> float:
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    return ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+
+
+def discover_tests(paths: Sequence[str]) -> List[TestCase]:
+    """test ทั้งหมดใน path (parse อย่างเดียว ไม่รัน) ชื่อเหมือนใน output.xml ของ robot ที่รันด้วย path ชุดเดียวกัน"""
+    from robot.api import TestSuite
+
+    suite = TestSuite.from_file_system(*paths)
+    tests = []
+    for test in suite.all_tests:
+        full_name = getattr(test, 'full_name', None) or test.longname
+        parent = getattr(test.parent, 'full_name', None) or test.parent.longname
+        tests.append(TestCase(full_name, parent, tuple(str(tag) for tag in test.tags)))
+    return tests
+
+
+def build_units(tests: Sequence[TestCase], durations: Dict[str, float], by: str = 'test',
+                group_tags: Sequence[str] = DEFAULT_GROUP_TAGS,
+                default_seconds: Optional[float] = None) -> List[Unit]:
+    """
+    รวม test เป็นหน่วย: เริ่มจาก test (หรือ suite ถ้า by='suite') แล้วเชื่อมหน่วยที่มี group tag เดียวกัน
+    (union-find) เวลาของหน่วย = ผลรวมเวลาของ test ในหน่วย
+    """
+    if default_seconds is None:
+        default_seconds = _median(list(durations.values())) if durations else DEFAULT_SECONDS
+    wanted = {tag.lower() for tag in group_tags}
+    parent: Dict[str, str] = {}
+
+    def find(key: str) -> str:
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    def union(a: str, b: str) -> None:
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            # root ของหน่วยที่รวมกันเป็นชื่อ group tag (ใช้เป็น key ของหน่วยใน plan.json)
+            keep, drop = sorted((root_a, root_b), key=lambda key: (not key.startswith('tag:'), key))
+            parent[drop] = keep
+
+    base_key = {test.name: (test.suite if by == 'suite' else test.name) for test in tests}
+    for key in base_key.values():
+        parent.setdefault(key, key)
+    for test in tests:
+        for tag in test.tags:
+            if tag.lower() in wanted:
+                group = f"tag:{tag.lower()}"
+                parent.setdefault(group, group)
+                union(group, base_key[test.name])
+
+    members: Dict[str, List[TestCase]] = {}
+    for test in tests:
+        members.setdefault(find(base_key[test.name]), []).append(test)
+    units = []
+    for root, group in members.items():
+        seconds = sum(durations.get(test.name, default_seconds) for test in group)
+        units.append(Unit(root, tuple(t.name for t in group), tuple(dict.fromkeys(t.suite for t in group)),
+                          seconds))
+    return units
+
+
+def schedule(units: Sequence[Unit], shards: int) -> List[List[Unit]]:
+    """LPT: เรียงหน่วยจากนานไปสั้น แล้วใส่ shard ที่ load น้อยที่สุด ณ ขณะนั้น (เท่ากันเลือก index น้อยกว่า)"""
+    heap = [(0.0, index) for index in range(shards)]
+    assigned: List[List[Unit]] = [[] for _ in range(shards)]
+    for unit in sorted(units, key=lambda u: (-u.seconds, u.key)):
+        load, index = heapq.heappop(heap)
+        assigned[index].append(unit)
+        heapq.heappush(heap, (load + unit.seconds, index))
+    return assigned
+
+
+def _pattern(name: str) -> str:
+    """full name -> pattern ของ --test/--suite ที่ match ชื่อนั้นเท่านั้น (escape wildcard ของ robot)"""
+    return ''.join(f"[{char}]" if char in '*?[' else char for char in name)
+
+
+def write_argument_file(path: Path, shard: Sequence[Unit], by: str) -> None:
+    """argument file ของ shard: --suite ต่อไฟล์ (by suite) หรือ --test ต่อ test"""
+    lines = [f"# {path.stem}: {sum(u.seconds for u in shard):.1f}s predicted"]
+    if by == 'suite':
+        lines += [f"--suite {_pattern(suite)}" for unit in shard for suite in unit.suites]
+    else:
+        lines += [f"--test {_pattern(test)}" for unit in shard for test in unit.tests]
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+
+def plan(paths: Sequence[str], history: Sequence[str], shards: int, out_dir: Path, by: str = 'test',
+         group_tags: Sequence[str] = DEFAULT_GROUP_TAGS, default_seconds: Optional[float] = None) -> Dict[str, Any]:
+    """สร้าง argument file ต่อ shard และ plan.json (เวลาที่คาดของแต่ละ shard) ใน out_dir; คืนค่า plan"""
+    tests = discover_tests(paths)
+    durations = load_durations(history)
+    units = build_units(tests, durations, by, group_tags, default_seconds)
+    # shard ว่างไม่มีประโยชน์ (robot ที่ไม่มี test ให้รันจะ error)
+    assigned = [shard for shard in schedule(units, max(1, min(shards, len(units)))) if shard]
+    out_dir.mkdir(parents=True, exist_ok=True)
+    result: Dict[str, Any] = {'created': time.strftime('%Y-%m-%d %H:%M:%S'), 'by': by, 'paths': list(paths),
+                              'group_tags': list(group_tags), 'history': [str(h) for h in history],
+                              'unknown_tests': sorted(t.name for t in tests if t.name not in durations),
+                              'shards': []}
+    for index, shard in enumerate(assigned, 1):
+        argfile = out_dir / f"shard_{index}.args"
+        write_argument_file(argfile, shard, by)
+        result['shards'].append({'index': index, 'argfile': str(argfile),
+                                 'predicted': round(sum(u.seconds for u in shard), 3),
+                                 'units': [u.key for u in shard],
+                                 'tests': [t for u in shard for t in u.tests]})
+    loads = [shard['predicted'] for shard in result['shards']]
+    result['total_seconds'] = round(sum(loads), 3)
+    result['predicted_makespan'] = max(loads, default=0.0)
+    result['lower_bound'] = round(max(sum(loads) / max(len(loads), 1), max((u.seconds for u in units), default=0.0)), 3)
+    (out_dir / PLAN_FILE).write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding='utf-8')
+    return result
+
+
+def _run_elapsed(output: Any) -> float:
+    """เวลาจริงของ run = elapsed ของ suite นอกสุด (record สุดท้ายที่ iter_output ส่งออกมา)"""
+    elapsed = 0.0
+    for record in iter_output(str(output)):
+        if record.kind == 'suite':
+            elapsed = record.elapsed
+    return elapsed
+
+
+def report(plan_data: Dict[str, Any], outputs: Sequence[str]) -> Dict[str, Any]:
+    """
+    เทียบ predicted กับ actual ต่อ shard (output.xml ตามลำดับ shard) และ makespan ทั้ง run
+    error = actual/predicted - 1
+    raise ValueError ถ้าจำนวน output.xml ไม่เท่ากับจำนวน shard ใน plan
+    """
+    if len(outputs) != len(plan_data['shards']):
+        raise ValueError(f"Plan has {len(plan_data['shards'])} shard(s) but {len(outputs)} output file(s) were given; "
+                         "pass one output.xml per shard, in shard order")
+    rows = []
+    for shard, output in zip(plan_data['shards'], outputs):
+        # shard ที่ไม่มี output.xml (robot ล้มก่อนเขียนผล) ไม่ถูกนับใน makespan
+        actual = round(_run_elapsed(output), 3) if Path(output).exists() else None
+        predicted = shard['predicted']
+        rows.append({'shard': shard['index'], 'tests': len(shard['tests']), 'predicted': predicted,
+                     'actual': actual,
+                     'error': round(actual / predicted - 1, 3) if predicted and actual is not None else None})
+    finished = [row['actual'] for row in rows if row['actual'] is not None]
+    predicted = plan_data['predicted_makespan']
+    actual = max(finished, default=0.0)
+    return {'shards': rows, 'predicted_makespan': predicted, 'actual_makespan': actual,
+            'makespan_error': round(actual / predicted - 1, 3) if predicted else None,
+            'idle_seconds': round(sum(actual - value for value in finished), 3)}
+
+
+def run(plan_data: Dict[str, Any], paths: Sequence[str], output_dir: Path, robot_args: Sequence[str]) -> List[str]:
+    """รัน robot หนึ่ง process ต่อ shard พร้อมกัน (output ใน output_dir/shard_N) คืนค่า path ของ output.xml"""
+    processes = []
+    outputs = []
+    for shard in plan_data['shards']:
+        shard_dir = output_dir / f"shard_{shard['index']}"
+        command = [sys.executable, '-m', 'robot', '--argumentfile', shard['argfile'], '--outputdir', str(shard_dir),
+                   '--console', 'dotted', *robot_args, *paths]
+        processes.append(subprocess.Popen(command, env=dict(os.environ, ROBOT_SHARD=str(shard['index']))))
+        outputs.append(str(shard_dir / 'output.xml'))
+    for process in processes:
+        process.wait()
+    return outputs
+
+
+def _print_report(data: Dict[str, Any]) -> None:
+    print(f"{'shard':>5}  {'tests':>5}  {'predicted':>10}  {'actual':>10}  {'error':>7}")
+    for row in data['shards']:
+        error = f"{row['error']:+.1%}" if row['error'] is not None else '-'
+        actual = f"{row['actual']:>9.2f}s" if row['actual'] is not None else f"{'-':>10}"
+        print(f"{row['shard']:>5}  {row['tests']:>5}  {row['predicted']:>9.2f}s  {actual}  {error:>7}")
+    error = f"{data['makespan_error']:+.1%}" if data['makespan_error'] is not None else '-'
+    print(f"makespan: predicted {data['predicted_makespan']:.2f}s, actual {data['actual_makespan']:.2f}s ({error}); "
+          f"idle worker time {data['idle_seconds']:.1f}s")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI: python shard_scheduler.py plan|run|report ... (ดู --help)"""
+    parser = argparse.ArgumentParser(prog="shard_scheduler.py", description="Duration-balanced Robot test sharding")
+    commands = parser.add_subparsers(dest="command", required=True)
+    pln = commands.add_parser("plan", help="split tests into shards and write argument files")
+    pln.add_argument("paths", nargs="+", help="suite files/directories (same as given to robot)")
+    pln.add_argument("--history", nargs="*", default=[], help="output.xml files of previous runs")
+    pln.add_argument("--shards", type=int, required=True)
+    pln.add_argument("--out-dir", type=Path, default=Path("shards"))
+    pln.add_argument("--by", choices=("test", "suite"), default="test")
+    pln.add_argument("--group-tag", action="append", dest="group_tags", default=None,
+                     help="tag whose tests must share a shard (repeatable, default: no grouping)")
+    pln.add_argument("--default-seconds", type=float, default=None,
+                     help="duration of tests without history (default: median of known tests)")
+    rn = commands.add_parser("run", help="run every shard of a plan in parallel, then report")
+    rn.add_argument("plan", type=Path)
+    rn.add_argument("paths", nargs="+")
+    rn.add_argument("--outputdir", type=Path, default=Path("results/shards"))
+    rep = commands.add_parser("report", help="compare predicted and actual makespan")
+    rep.add_argument("plan", type=Path)
+    rep.add_argument("outputs", nargs="+", help="output.xml of each shard, in shard order")
+    for command in (rn, rep):
+        command.add_argument("--json", action="store_true", help="print the report as JSON")
+
+    argv = list(sys.argv[1:] if argv is None else argv)
+    robot_args: List[str] = []
+    if '--' in argv:
+        argv, robot_args = argv[:argv.index('--')], argv[argv.index('--') + 1:]
+    args = parser.parse_args(argv)
+
+    if args.command == "plan":
+        data = plan(args.paths, args.history, args.shards, args.out_dir, args.by,
+                    tuple(args.group_tags or DEFAULT_GROUP_TAGS), args.default_seconds)
+        for shard in data['shards']:
+            print(f"shard {shard['index']}: {len(shard['tests'])} tests, {shard['predicted']:.1f}s -> {shard['argfile']}")
+        print(f"predicted makespan {data['predicted_makespan']:.1f}s (lower bound {data['lower_bound']:.1f}s); "
+              f"{len(data['unknown_tests'])} test(s) without history")
+        return 0
+
+    plan_data = json.loads(args.plan.read_text(encoding='utf-8'))
+    outputs = run(plan_data, args.paths, args.outputdir, robot_args) if args.command == "run" else args.outputs
+    try:
+        data = report(plan_data, outputs)
+    except ValueError as error:
+        parser.error(str(error))
+    if args.json:
+        print(json.dumps(data, indent=2, ensure_ascii=False))
+    else:
+        _print_report(data)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+"""
+Shared read-only settings snapshot for parallel (pabot) workers
+
+process แรกที่โหลด settings จะเขียน flat index (ดู base_library._flatten_settings) ลงไฟล์ snapshot
+process อื่น ๆ attach ด้วย mmap แบบ read-only: ไม่ต้อง parse YAML และไม่ต้องสร้าง dict tree ทั้งก้อน
+ค่าแต่ละ key ถูก decode เฉพาะตอนถูกเรียกใช้ (และ memo ไว้ใน process)
+
+เปิดใช้ด้วย environment variable ROBOT_SETTINGS_SHARED:
+    "1"/"true" = เก็บใน <tempdir>/robot_settings_shared-<uid>, ค่าอื่น = path ของ directory
+directory ต้องเป็นของ user ที่รันและ user อื่นเขียนไม่ได้ (ไม่งั้นปิด shared mode) เพราะค่าถูก decode ด้วย
+marshal/pickle; BaseLibrary.load_settings ยังคืน dict จริง (สร้างจาก snapshot ตอนถูกเรียกครั้งแรก)
+
+File layout (little-endian):
+    header   magic(4) format(u32) mtime_ns(u64) size(u64) inode(u64) exact(u32) count(u32)
+    key_offsets    (count + 1) x u64   -> offsets ใน key blob (key เรียงตาม byte order)
+    value_offsets  (count + 1) x u64   -> offsets ใน value blob
+    key blob       utf-8 ของ dotted path ต่อกัน
+    value blob     tag(1) + marshal/pickle ของค่าแต่ละ key
+"""
+import hashlib
+import marshal
+import mmap
+import os
+import pickle
+import stat
+import struct
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+SHARED_ENV = 'ROBOT_SETTINGS_SHARED'
+
+_MAGIC = b'RSSN'
+_FORMAT = 1
+_HEADER = struct.Struct('<4sIQQQII')
+_OFFSET = struct.Struct('<Q')
+_TOP_KEYS = '\x00top'  # key พิเศษเก็บรายชื่อ top-level section ตามลำดับในไฟล์
+_TAG_MARSHAL = b'M'
+_TAG_PICKLE = b'P'
+_MISSING = object()
+
+
+def shared_snapshot_dir() -> Optional[Path]:
+    """
+    Directory for shared snapshots, or None when the shared mode is off or the directory
+    is not private to the current user (ค่าใน snapshot ถูก unmarshal/unpickle จึงต้องไม่ให้ user อื่นเขียนได้)
+    """
+    option = os.environ.get(SHARED_ENV, '')
+    if not option or option.lower() in ('0', 'false', 'no'):
+        return None
+    if option.lower() in ('1', 'true', 'yes'):
+        import tempfile
+        # แยก directory ต่อ user: <tempdir> ใช้ร่วมกันทุก user
+        suffix = f"-{os.getuid()}" if hasattr(os, 'getuid') else ''
+        path = Path(tempfile.gettempdir()) / f"robot_settings_shared{suffix}"
+    else:
+        path = Path(option)
+    return path if private_dir(path) else None
+
+
+def private_dir(path: Path) -> bool:
+    """สร้าง directory (mode 0700) ถ้ายังไม่มี แล้วตรวจว่าเป็นของ user ปัจจุบันและ user อื่นเขียนไม่ได้"""
+    try:
+        path.mkdir(mode=0o700, parents=True, exist_ok=True)
+        st = os.lstat(path)
+    except OSError:
+        return False
+    if not hasattr(os, 'getuid'):
+        # Windows: temp directory เป็นของแต่ละ user อยู่แล้ว และไม่มี uid/mode แบบ POSIX
+        return True
+    return stat.S_ISDIR(st.st_mode) and st.st_uid == os.getuid() and not st.st_mode & 0o022
+
+
+def snapshot_file(shared_dir: Path, settings_file: Path) -> Path:
+    """ไฟล์ snapshot ของ settings file หนึ่งไฟล์ (ชื่อผูกกับ path เต็มของ YAML)"""
+    digest = hashlib.blake2b(str(settings_file).encode('utf-8'), digest_size=8).hexdigest()
+    return shared_dir / f"{settings_file.name}.{digest}.snapshot"
+
+
+def _encode(value: Any) -> bytes:
+    try:
+        return _TAG_MARSHAL + marshal.dumps(value)
+    except ValueError:
+        # marshal ไม่รองรับบาง type ที่ YAML สร้างได้ (เช่น datetime)
+        return _TAG_PICKLE + pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _decode(raw: bytes) -> Any:
+    if raw[:1] == _TAG_MARSHAL:
+        return marshal.loads(raw[1:])
+    return pickle.loads(raw[1:])
+
+
+def write_snapshot(path: Path, signature: Tuple[int, int, int], data: Dict[str, Any],
+                   index: Dict[str, Any], exact: bool) -> None:
+    """เขียน snapshot แบบ atomic (tmp + os.replace) ให้ process อื่น attach ได้"""
+    entries = dict(index)
+    entries[_TOP_KEYS] = list(data)
+    keys = sorted(entries, key=lambda k: k.encode('utf-8'))
+
+    key_blob: List[bytes] = []
+    value_blob: List[bytes] = []
+    key_offsets = [0]
+    value_offsets = [0]
+    for key in keys:
+        encoded_key = key.encode('utf-8')
+        encoded_value = _encode(entries[key])
+        key_blob.append(encoded_key)
+        value_blob.append(encoded_value)
+        key_offsets.append(key_offsets[-1] + len(encoded_key))
+        value_offsets.append(value_offsets[-1] + len(encoded_value))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, _FORMAT, *signature, int(exact), len(keys)))
+        f.write(struct.pack(f'<{len(key_offsets)}Q', *key_offsets))
+        f.write(struct.pack(f'<{len(value_offsets)}Q', *value_offsets))
+        f.write(b''.join(key_blob))
+        f.write(b''.join(value_blob))
+    os.replace(tmp, path)
+
+
+class SnapshotIndex(Mapping):
+    """
+    Read-only mapping view (dotted path -> value) บน mmap ของไฟล์ snapshot
+    ค้นหา key ด้วย binary search บน offset table โดยไม่ copy ข้อมูลทั้งไฟล์
+    """
+
+    def __init__(self, mm: mmap.mmap, count: int, exact: bool):
+        self._mm = mm
+        self._count = count
+        self.exact = exact
+        key_table = _HEADER.size
+        value_table = key_table + (count + 1) * _OFFSET.size
+        self._key_table = key_table
+        self._value_table = value_table
+        self._key_base = value_table + (count + 1) * _OFFSET.size
+        self._value_base = self._key_base + self._offset(key_table, count)
+        self._memo: Dict[str, Any] = {}
+
+    def _offset(self, table: int, i: int) -> int:
+        return _OFFSET.unpack_from(self._mm, table + i * _OFFSET.size)[0]
+
+    def _key_at(self, i: int) -> bytes:
+        start = self._key_base + self._offset(self._key_table, i)
+        end = self._key_base + self._offset(self._key_table, i + 1)
+        return self._mm[start:end]
+
+    def _find(self, key: str) -> int:
+        target = key.encode('utf-8')
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_at(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._count and self._key_at(lo) == target:
+            return lo
+        return -1
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self._memo.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        if not isinstance(key, str):
+            return default
+        i = self._find(key)
+        if i < 0:
+            return default
+        start = self._value_base + self._offset(self._value_table, i)
+        end = self._value_base + self._offset(self._value_table, i + 1)
+        value = _decode(self._mm[start:end])
+        self._memo[key] = value
+        return value
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(self._count):
+            key = self._key_at(i).decode('utf-8')
+            if key != _TOP_KEYS:
+                yield key
+
+    def __len__(self) -> int:
+        return self._count - 1
+
+
+class SnapshotSettings(Mapping):
+    """Top-level settings view: section -> value โดย decode เฉพาะ section ที่ถูกใช้"""
+
+    def __init__(self, index: SnapshotIndex):
+        self._index = index
+        self._keys = index[_TOP_KEYS]
+        self._key_set = frozenset(self._keys)
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._key_set:
+            raise KeyError(key)
+        return self._index[str(key)]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._index.get(str(key), default) if key in self._key_set else default
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._key_set
+
+
+def attach_snapshot(path: Path, signature: Tuple[int, int, int]) -> Optional[SnapshotIndex]:
+    """
+    mmap snapshot ที่มีอยู่แบบ read-only; คืน None ถ้าไม่มีไฟล์ เสีย หรือ version stamp ไม่ตรงกับ YAML ปัจจุบัน
+    """
+    try:
+        with open(path, 'rb') as f:
+            if hasattr(os, 'getuid') and os.fstat(f.fileno()).st_uid != os.getuid():
+                return None
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if len(mm) < _HEADER.size:
+        mm.close()
+        return None
+    magic, fmt, mtime_ns, size, inode, exact, count = _HEADER.unpack_from(mm, 0)
+    if magic != _MAGIC or fmt != _FORMAT or (mtime_ns, size, inode) != tuple(signature):
+        mm.close()
+        return None
+    return SnapshotIndex(mm, count, bool(exact))
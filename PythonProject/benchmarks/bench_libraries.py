@@ -0,0 +1,172 @@
+"""
+Benchmark harness for BaseLibrary / ConfigReader / DataReader keywords
+
+    python benchmarks/bench_libraries.py [--sizes 10,1000,10000,100000] [--depth 4] [--sections 50]
+                                         [--output results.json] [--baseline baseline.json]
+                                         [--save-baseline] [--threshold 0.25]
+
+สร้าง config สังเคราะห์ตามขนาดที่กำหนด แล้ววัดเวลาต่อการเรียก (ค่าต่ำสุดจากหลายรอบ) ของ
+    load_settings (cold = หลัง clear_cache, warm = cache hit), get_setting, get_from_settings,
+    ConfigReader getter, load_all_sections_from_settings, build_section_paths_from_settings
+โดยแทน BuiltIn ของ Robot ด้วย stub (ไม่ต้องรันใน Robot)
+
+--baseline + --save-baseline  เขียนผลเป็น baseline (JSON)
+--baseline                    เทียบกับ baseline: exit code 1 ถ้ามีตัวไหนช้ากว่า baseline เกิน threshold
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import yaml
+
+from synthetic import generate_settings, leaf_paths
+
+# ผลต้องไม่ขึ้นกับ snapshot/shared mode/instrumentation ที่อาจเปิดไว้ใน environment (ต้องล้างก่อน import library)
+for _name in ("ROBOT_SETTINGS_SNAPSHOT", "ROBOT_SETTINGS_SHARED", "ROBOT_LIBRARY_METRICS"):
+    os.environ.pop(_name, None)
+
+import data_reader  # Resources/pythonLib ถูกเพิ่มใน sys.path โดย synthetic
+from base_library import BaseLibrary
+from config_reader import ConfigReader
+from data_reader import DataReader
+
+PATH_SECTION = "Input_Test_Data"
+
+
+class StubBuiltIn:
+    """แทน robot.libraries.BuiltIn.BuiltIn เท่าที่ DataReader ใช้ (variable store + ${SUITE_NAME})"""
+    store: Dict[str, Any] = {"${SUITE_NAME}": "Benchmark"}
+
+    def get_variable_value(self, name: str, default: Any = None) -> Any:
+        return self.store.get(name, default)
+
+    def set_suite_variable(self, name: str, value: Any) -> None:
+        self.store[name] = value
+
+    def set_global_variable(self, name: str, value: Any) -> None:
+        self.store[name] = value
+
+
+def write_config(path: Path, keys: int, sections: int, depth: int) -> Dict[str, Any]:
+    """config สังเคราะห์ + section ของ path ไฟล์ (ใช้กับ build_section_paths_from_settings)"""
+    settings = generate_settings(keys, sections=min(sections, max(1, keys)), depth=depth)
+    settings[PATH_SECTION] = {f"File_{i}": f"data/file_{i}.xlsx" for i in range(min(keys, 200))}
+    settings["browser"] = {"name": "Chrome", "options": {"headless": True}}
+    with open(path, "w", encoding="utf-8") as f:
+        yaml.safe_dump(settings, f, sort_keys=False)
+    return settings
+
+
+def measure(func: Callable[[], Any], repeat: int, number: int, setup: Callable[[], Any] = None) -> float:
+    """วินาทีต่อการเรียก: ค่าต่ำสุดของ `repeat` รอบ รอบละ `number` ครั้ง"""
+    best = float("inf")
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def run_size(keys: int, depth: int, sections: int, repeat: int, tmp: Path) -> Dict[str, float]:
+    settings_file = tmp / f"config_{keys}.yaml"
+    settings = write_config(settings_file, keys, sections, depth)
+    path = str(settings_file)
+    rng = random.Random(keys)
+    dotted = [".".join(p) for p in leaf_paths(settings)]
+    workload = [rng.choice(dotted) for _ in range(1000)]
+    key_workload = [tuple(d.split(".")) for d in workload]
+
+    lib, reader, config = BaseLibrary(), DataReader(), ConfigReader()
+    config.DEFAULT_SETTINGS_PATH = path
+    cold_number = 1 if keys >= 10_000 else 10
+    dotted_cycle, keys_cycle = itertools.cycle(workload), itertools.cycle(key_workload)
+
+    def unpublish():
+        DataReader._published_versions.clear()
+
+    results = {
+        "load_settings.cold": measure(lambda: (lib.clear_cache(path), lib.load_settings(path)), repeat, cold_number),
+        "load_settings.warm": measure(lambda: lib.load_settings(path), repeat, 10_000),
+        "get_setting": measure(lambda: lib.get_setting(*next(keys_cycle), settings_path=path), repeat, 10_000),
+        "get_from_settings": measure(lambda: reader.get_from_settings(next(dotted_cycle), None, path), repeat, 10_000),
+        "config_reader.get_browser_name": measure(config.get_browser_name, repeat, 10_000),
+        "load_all_sections_from_settings": measure(
+            lambda: reader.load_all_sections_from_settings(settings_path=path), repeat, 5, setup=unpublish),
+        "load_all_sections_from_settings.republish": measure(
+            lambda: reader.load_all_sections_from_settings(settings_path=path), repeat, 100),
+        "build_section_paths_from_settings": measure(
+            lambda: reader.build_section_paths_from_settings(PATH_SECTION, str(tmp), settings_path=path), repeat, 20),
+    }
+    lib.clear_cache()
+    return {f"{name}[keys={keys}]": seconds for name, seconds in results.items()}
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], threshold: float) -> List[str]:
+    """รายการที่ช้ากว่า baseline เกิน threshold (สัดส่วน เช่น 0.25 = 25%)"""
+    regressions = []
+    for name, seconds in results.items():
+        reference = baseline.get(name)
+        if reference and seconds > reference * (1 + threshold):
+            regressions.append(f"{name}: {seconds * 1e6:.1f} us vs baseline {reference * 1e6:.1f} us "
+                               f"(+{(seconds / reference - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10,1000,10000,100000", help="comma separated key counts")
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--sections", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5, help="rounds per measurement (best is kept)")
+    parser.add_argument("--output", default=None, help="write this run's results as JSON")
+    parser.add_argument("--baseline", default=None, help="baseline JSON to compare against (or write)")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results to --baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown vs baseline (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    data_reader.BuiltIn = StubBuiltIn
+
+    results: Dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for keys in (int(s) for s in args.sizes.split(",") if s.strip()):
+            results.update(run_size(keys, args.depth, args.sections, args.repeat, Path(tmp)))
+
+    for name, seconds in results.items():
+        print(f"  {name:<62} {seconds * 1e6:12.2f} us")
+
+    report = {
+        "meta": {"python": platform.python_version(), "platform": platform.platform(),
+                 "depth": args.depth, "sections": args.sections, "created": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    if args.baseline and args.save_baseline:
+        Path(args.baseline).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"baseline written to {args.baseline}")
+        return 0
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"no regressions over {args.threshold:.0%} vs {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
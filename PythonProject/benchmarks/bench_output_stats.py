@@ -0,0 +1,113 @@
+"""
+Benchmark: Robot result model vs. streaming output_stats on a large output.xml
+
+    python benchmarks/bench_output_stats.py [--tests 5000] [--keywords 40]
+
+Writes a synthetic RF 7 output.xml, then in separate processes measures time and
+peak RSS of (a) robot.api.ExecutionResult + a keyword visitor and (b) output_stats.analyze_output.
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from xml.sax.saxutils import quoteattr
+
+from synthetic import LIB_DIR
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_KEYWORDS = (("Get From Settings", None), ("Wait Until Element Is Visible", "SeleniumLibrary"),
+             ("Execute JavaScript", "SeleniumLibrary"), ("Log", "BuiltIn"), ("Input Text", "SeleniumLibrary"))
+
+
+def write_output(path: Path, tests: int, keywords: int) -> Path:
+    """output.xml สังเคราะห์: 1 suite, `tests` tests, แต่ละ test มี `keywords` keyword พร้อม msg/arg"""
+    clock = datetime(2026, 1, 1)
+
+    def status(elapsed: float, result: str = "PASS") -> str:
+        return f'<status status="{result}" start="{clock.isoformat()}" elapsed="{elapsed:.6f}"/>\n'
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<robot generator="Robot 7.2.2" schemaversion="5">\n')
+        f.write('<suite id="s1" name="Synthetic" source="synthetic.robot">\n')
+        for t in range(tests):
+            f.write(f'<test id="s1-t{t}" name="Test {t}" line="1">\n')
+            for k in range(keywords):
+                name, owner = _KEYWORDS[k % len(_KEYWORDS)]
+                owner_attr = f" owner={quoteattr(owner)}" if owner else ""
+                f.write(f"<kw name={quoteattr(name)}{owner_attr}>\n")
+                f.write(f'<msg time="{clock.isoformat()}" level="INFO">message {t}-{k} {"x" * 80}</msg>\n')
+                f.write(f"<arg>argument_{k}</arg>\n")
+                f.write(status(0.001 * ((t * 7 + k * 13) % 97 + 1)))
+                f.write("</kw>\n")
+                clock += timedelta(milliseconds=5)
+            f.write(f"<tag>smoke</tag>\n{status(0.2, 'FAIL' if t % 50 == 0 else 'PASS')}</test>\n")
+        f.write(f"{status(tests * 0.2)}</suite>\n<statistics></statistics>\n<errors></errors>\n</robot>\n")
+    return path
+
+
+def _peak_rss_mb() -> float:
+    if resource is None:
+        return 0.0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _result_model(path: str):
+    from robot.api import ExecutionResult, ResultVisitor
+
+    class KeywordTimes(ResultVisitor):
+        def __init__(self):
+            self.times = {}
+
+        def visit_keyword(self, kw):
+            self.times.setdefault(kw.full_name, []).append(kw.elapsed_time.total_seconds())
+            super().visit_keyword(kw)
+
+    start = time.perf_counter()
+    visitor = KeywordTimes()
+    ExecutionResult(path).visit(visitor)
+    return time.perf_counter() - start, _peak_rss_mb(), len(visitor.times)
+
+
+def _streaming(path: str):
+    import sys
+    sys.path.insert(0, str(LIB_DIR))
+    from output_stats import analyze_output, summarize
+
+    start = time.perf_counter()
+    report = summarize(analyze_output(path))
+    return time.perf_counter() - start, _peak_rss_mb(), len(report["kw"])
+
+
+def _isolated(func, path: str):
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(1) as pool:
+        return pool.apply(func, (path,))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tests", type=int, default=5000)
+    parser.add_argument("--keywords", type=int, default=40)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(write_output(Path(tmp) / "output.xml", args.tests, args.keywords))
+        size_mb = os.path.getsize(path) / 1024 / 1024
+        model = _isolated(_result_model, path)
+        stream = _isolated(_streaming, path)
+
+    print(f"{args.tests} tests x {args.keywords} keywords, output.xml {size_mb:.1f} MB")
+    print(f"  {'mode':<16}{'time':>10}{'peak RSS':>12}")
+    for label, (elapsed, rss, _) in (("result model", model), ("streaming", stream)):
+        print(f"  {label:<16}{elapsed:>9.2f}s{rss:>9.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark: per-test workbook save vs. buffered single-flush Update Test Result
+
+    python benchmarks/bench_result_writeback.py [--tests 1000]
+
+  per-test save   open + update + save the workbook once per test (previous behaviour)
+  buffered        ResultWriter.update_test_result per test + one flush_test_results
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import openpyxl
+
+import synthetic  # noqa: F401  (เพิ่ม Resources/pythonLib ใน sys.path)
+from result_writer import ResultWriter
+
+
+def _make_workbook(path: Path, tests: int) -> None:
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append([ResultWriter.ID_COLUMN, "ID_Card", "Phone_Number", ResultWriter.RESULT_COLUMN])
+    for i in range(tests):
+        ws.append([f"TC_{i:05d}", "1-2345-67890-12-3", "082-999-9999", None])
+    wb.save(path)
+
+
+def per_test_save(path: Path, tests: int) -> float:
+    start = time.perf_counter()
+    for i in range(tests):
+        wb = openpyxl.load_workbook(path)
+        ws = wb.active
+        for row in ws.iter_rows(min_row=2):
+            if row[0].value == f"TC_{i:05d}":
+                row[3].value = "Pass"
+                break
+        wb.save(path)
+    return time.perf_counter() - start
+
+
+def buffered(path: Path, tests: int) -> float:
+    writer = ResultWriter(str(path), flush_on="manual")
+    start = time.perf_counter()
+    for i in range(tests):
+        writer.update_test_result(f"TC_{i:05d}", "Pass")
+    writer.flush_test_results()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tests", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        naive_wb = Path(tmp) / "naive.xlsx"
+        buffered_wb = Path(tmp) / "buffered.xlsx"
+        _make_workbook(naive_wb, args.tests)
+        _make_workbook(buffered_wb, args.tests)
+        naive = per_test_save(naive_wb, args.tests)
+        batched = buffered(buffered_wb, args.tests)
+
+    print(f"{args.tests} tests")
+    print(f"  per-test save  {naive:9.2f}s")
+    print(f"  buffered       {batched:9.2f}s")
+    print(f"  saved          {naive - batched:9.2f}s ({naive / batched:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
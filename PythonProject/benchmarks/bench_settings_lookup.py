@@ -0,0 +1,68 @@
+"""
+Benchmark: flat dotted-path index vs. walking the nested settings dicts
+
+    python benchmarks/bench_settings_lookup.py [--keys 10000] [--lookups 200000]
+"""
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from synthetic import leaf_paths, write_settings
+
+from base_library import BaseLibrary  # Resources/pythonLib ถูกเพิ่มใน sys.path โดย synthetic
+
+
+def walk_lookup(settings: Dict[str, Any], dotted_path: str, default: Any = None) -> Any:
+    """The previous get_from_settings/get_setting algorithm (split + nested walk)"""
+    value: Any = settings
+    for key in [p for p in dotted_path.split(".") if p]:
+        if isinstance(value, dict):
+            value = value.get(key, default)
+        else:
+            return default
+    return value
+
+
+def _timed(func, workload: List[str]) -> float:
+    start = time.perf_counter()
+    for dotted in workload:
+        func(dotted)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keys", type=int, default=10_000)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--lookups", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        settings_file = write_settings(Path(tmp) / "synthetic.yaml", args.keys, depth=args.depth)
+        lib = BaseLibrary()
+        settings = lib.load_settings(str(settings_file))
+
+        rng = random.Random(0)
+        paths = [".".join(p) for p in leaf_paths(settings)]
+        workload = [rng.choice(paths) for _ in range(args.lookups)]
+
+        walk = _timed(lambda d: walk_lookup(lib.load_settings(str(settings_file)), d), workload)
+        keys = [tuple(d.split(".")) for d in workload]
+        start = time.perf_counter()
+        for k in keys:
+            lib.get_setting(*k, settings_path=str(settings_file))
+        index_keys = time.perf_counter() - start
+        index_dotted = _timed(
+            lambda d: lib._lookup_setting(d, None, str(settings_file)), workload)
+
+    print(f"{len(paths)} leaf keys, depth {args.depth}, {args.lookups} lookups")
+    for label, seconds in (("nested walk", walk), ("get_setting (index)", index_keys),
+                           ("dotted path (index)", index_dotted)):
+        print(f"  {label:<22} {seconds:8.3f}s  {seconds / args.lookups * 1e9:8.0f} ns/lookup")
+
+
+if __name__ == "__main__":
+    main()
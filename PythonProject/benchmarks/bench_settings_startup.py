@@ -0,0 +1,68 @@
+"""
+Benchmark: settings startup cost (cold parse, warm cache hit, parsed snapshot)
+
+    python benchmarks/bench_settings_startup.py [--keys 50000] [--repeat 5]
+
+  cold (pure Python)  yaml.SafeLoader, as load_settings did before
+  cold (loader)       load_settings with an empty cache (CSafeLoader when libyaml is present)
+  snapshot            load_settings with an empty cache and ROBOT_SETTINGS_SNAPSHOT enabled
+  warm                load_settings with the file already cached in-process
+"""
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+from synthetic import write_settings
+
+import base_library  # Resources/pythonLib ถูกเพิ่มใน sys.path โดย synthetic
+from base_library import BaseLibrary
+
+
+def _best(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keys", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        settings_file = str(write_settings(Path(tmp) / "synthetic.yaml", args.keys, depth=3))
+        lib = BaseLibrary()
+
+        def pure_python():
+            with open(settings_file, "r", encoding="utf-8") as f:
+                yaml.load(f, Loader=yaml.SafeLoader)
+
+        def cold():
+            lib.clear_cache()
+            lib.load_settings(settings_file)
+
+        os.environ.pop(base_library.SNAPSHOT_ENV, None)
+        results = [("cold (pure Python)", _best(pure_python, args.repeat)),
+                   (f"cold ({base_library._yaml_loader().__name__})", _best(cold, args.repeat))]
+
+        os.environ[base_library.SNAPSHOT_ENV] = str(Path(tmp) / "snapshots")
+        cold()  # เขียน snapshot ครั้งแรก
+        results.append(("snapshot", _best(cold, args.repeat)))
+        results.append(("warm", _best(lambda: lib.load_settings(settings_file), args.repeat)))
+        os.environ.pop(base_library.SNAPSHOT_ENV, None)
+
+    print(f"{args.keys} keys, best of {args.repeat}")
+    for label, seconds in results:
+        print(f"  {label:<24} {seconds * 1000:10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark: per-worker settings startup with and without the shared mmap snapshot
+
+    python benchmarks/bench_shared_snapshot.py [--workers 32] [--keys 50000]
+
+Starts N fresh worker processes (like pabot) that each load the settings and run
+a batch of lookups, and reports mean/max startup time and private (unshared)
+memory per worker.
+"""
+import argparse
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import LIB_DIR, leaf_paths, generate_settings, write_settings
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _private_memory_kb() -> int:
+    """หน่วยความจำที่ไม่ได้แชร์กับ process อื่น (Linux: smaps_rollup); ที่อื่นใช้ peak RSS แทน"""
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            return sum(int(line.split()[1]) for line in f if line.startswith(("Private_Clean", "Private_Dirty")))
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else 0
+
+
+def _worker(args):
+    settings_file, shared_dir, lookups = args
+    import sys
+    sys.path.insert(0, str(LIB_DIR))
+    if shared_dir:
+        os.environ["ROBOT_SETTINGS_SHARED"] = shared_dir
+    else:
+        os.environ.pop("ROBOT_SETTINGS_SHARED", None)
+    from base_library import BaseLibrary
+
+    start = time.perf_counter()
+    lib = BaseLibrary()
+    for dotted in lookups:
+        lib._lookup_setting(dotted, None, settings_file)
+    elapsed = time.perf_counter() - start
+    return elapsed, _private_memory_kb()
+
+
+def _run(workers: int, settings_file: str, shared_dir: str, lookups) -> tuple:
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(workers) as pool:
+        results = pool.map(_worker, [(settings_file, shared_dir, lookups)] * workers)
+    times = [r[0] for r in results]
+    memory = [r[1] for r in results]
+    return statistics.mean(times), max(times), statistics.mean(memory)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--keys", type=int, default=50_000)
+    parser.add_argument("--lookups", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        settings_file = str(write_settings(Path(tmp) / "synthetic.yaml", args.keys, depth=3))
+        paths = [".".join(p) for p in leaf_paths(generate_settings(args.keys, depth=3))]
+        lookups = paths[:: max(1, len(paths) // args.lookups)][: args.lookups]
+        shared_dir = str(Path(tmp) / "shared")
+
+        private = _run(args.workers, settings_file, "", lookups)
+        _worker((settings_file, shared_dir, lookups[:1]))  # process แรกสร้าง snapshot
+        shared = _run(args.workers, settings_file, shared_dir, lookups)
+
+    print(f"{args.workers} workers, {args.keys} keys, {len(lookups)} lookups per worker")
+    print(f"  {'mode':<18}{'mean startup':>14}{'max startup':>14}{'private mem':>14}")
+    for label, (mean_t, max_t, memory) in (("per-process parse", private), ("shared snapshot", shared)):
+        print(f"  {label:<18}{mean_t * 1000:>11.1f} ms{max_t * 1000:>11.1f} ms{memory / 1024:>11.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Import-time budget check for the Robot keyword libraries
+
+    python benchmarks/check_import_time.py [--budget-ms 30] [--repeat 5] [--standalone] [library ...]
+
+Imports each library in a fresh interpreter with ``-X importtime`` after preloading what
+Robot Framework itself has already imported (robot.api, pathlib, re), so only the
+library's own import cost is measured (--standalone: plain interpreter, as for the CLIs,
+benchmarks and variable files; robot itself then also counts as a deferred dependency). Fails (exit code 1) when
+    - the best-of-N cumulative import time of a library exceeds its budget, or
+    - importing a library pulls in a heavy dependency that should be deferred to first use
+      (yaml, xReader, openpyxl, selenium) and that Robot has not already loaded.
+
+library ใน pythonLib ระบุด้วยชื่อ module ส่วน library ระดับ root ของ repo (config_reader.py, js_batch.py,
+adaptive_wait.py) ระบุเป็น root:<module>; tests/test_import_time.py ใช้ check_library() ตรวจ budget เดียวกัน
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from synthetic import LIB_DIR
+
+ROOT_DIR = LIB_DIR.parent.parent.parent
+ROOT_PREFIX = "root:"
+LIBRARIES = ("base_library", "config_reader", "data_reader", "excel_index", "result_writer", "session_pool",
+             "screenshot_pipeline", "run_history", "browser_state",
+             "api_seeder",
+             "root:config_reader", "root:js_batch", "root:adaptive_wait")
+DEFERRED = ("yaml", "xReader", "openpyxl", "selenium")
+PRELOAD = "import robot.api, robot.libraries.BuiltIn, pathlib, re"
+BUDGET_MS = 30.0
+
+
+def _location(library: str) -> Tuple[str, Path]:
+    """(ชื่อ module, directory ที่ import จาก) ของ library: root:<module> = ไฟล์ที่ root ของ repo"""
+    if library.startswith(ROOT_PREFIX):
+        return library[len(ROOT_PREFIX):], ROOT_DIR
+    return library, LIB_DIR
+
+
+def measure(library: str, preload: str = PRELOAD, deferred: Tuple[str, ...] = DEFERRED) -> Tuple[int, List[str]]:
+    """(cumulative import time ของ library หน่วย us, dependency หนักที่ library นี้ import เพิ่ม)"""
+    module, directory = _location(library)
+    script = (f"{preload}\nimport sys, json\nbefore = set(sys.modules)\nimport {module}\n"
+              f"print(json.dumps([m for m in {deferred!r} if m in sys.modules and m not in before]))")
+    # library ระดับ root import base_library จาก pythonLib (เหมือนตอนรันด้วย --pythonpath)
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(LIB_DIR), os.environ.get("PYTHONPATH")])))
+    # วัดแบบมี .pyc แล้ว (รอบแรกเขียน cache ให้รอบถัดไป) ไม่ใช่เวลา compile source ที่เพิ่งแก้
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", script], cwd=str(directory), env=env,
+                          capture_output=True, text=True, check=True)
+    cumulative = 0
+    for line in proc.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package (top-level ไม่มีช่องว่างนำหน้าชื่อ)
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].rstrip() == f" {module}":
+            cumulative = int(parts[1])
+    return cumulative, json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def check_library(library: str, repeat: int = 5, standalone: bool = False) -> Tuple[float, List[str]]:
+    """(best-of-repeat import time ของ library หน่วย ms, dependency หนักที่ import ตอน import library)"""
+    preload, deferred = ("", DEFERRED + ("robot",)) if standalone else (PRELOAD, DEFERRED)
+    runs = [measure(library, preload, deferred) for _ in range(repeat)]
+    return min(us for us, _ in runs) / 1000, runs[0][1]
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS, help="max import time per library")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per library (best is kept)")
+    parser.add_argument("--standalone", action="store_true", help="do not preload Robot Framework")
+    parser.add_argument("modules", nargs="*", default=list(LIBRARIES),
+                        help="pythonLib module names, or root:<module> for the repo-root libraries")
+    args = parser.parse_args(argv)
+
+    failures: List[str] = []
+    results: Dict[str, float] = {}
+    for module in args.modules:
+        best_ms, heavy = check_library(module, args.repeat, args.standalone)
+        results[module] = best_ms
+        status = "ok"
+        if best_ms > args.budget_ms:
+            status = "OVER BUDGET"
+            failures.append(f"{module}: {best_ms:.1f} ms > {args.budget_ms:.1f} ms")
+        if heavy:
+            status = "EAGER IMPORT"
+            failures.append(f"{module}: imports {', '.join(heavy)} at import time")
+        print(f"  {module:<20} {best_ms:8.1f} ms  {status}")
+
+    if failures:
+        print("import-time budget exceeded:")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
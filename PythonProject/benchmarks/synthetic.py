@@ -0,0 +1,55 @@
+"""
+Synthetic configuration generator for the library benchmarks
+สร้างไฟล์ YAML ขนาดใหญ่ (จำนวน key / ความลึก / จำนวน section ตามที่กำหนด)
+"""
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+import yaml
+
+# ให้ benchmark import base_library / data_reader / config_reader ได้โดยตรง
+LIB_DIR = Path(__file__).resolve().parent.parent / "Resources" / "pythonLib"
+if str(LIB_DIR) not in sys.path:
+    sys.path.insert(0, str(LIB_DIR))
+
+
+def generate_settings(num_keys: int = 10_000, sections: int = 20, depth: int = 2) -> Dict[str, Any]:
+    """
+    Build a nested settings dict with roughly num_keys leaf values spread over
+    `sections` top-level sections; each leaf sits `depth` levels below its section.
+    """
+    settings: Dict[str, Any] = {}
+    per_section = max(1, num_keys // sections)
+    for s in range(sections):
+        section: Dict[str, Any] = {}
+        for k in range(per_section):
+            node = section
+            for level in range(depth - 1):
+                node = node.setdefault(f"group_{level}_{k % 10}", {})
+            node[f"key_{k}"] = f"value_{s}_{k}"
+        section["list_values"] = [f"item_{i}" for i in range(5)]
+        settings[f"Section_{s}"] = section
+    return settings
+
+
+def write_settings(path: Path, num_keys: int = 10_000, sections: int = 20, depth: int = 2) -> Path:
+    """Write a synthetic settings file to `path` and return it"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        yaml.safe_dump(generate_settings(num_keys, sections, depth), f, sort_keys=False)
+    return path
+
+
+def leaf_paths(settings: Dict[str, Any]) -> List[List[str]]:
+    """All key paths that lead to scalar leaves (used as lookup workload)"""
+    paths: List[List[str]] = []
+    stack = [([], settings)]
+    while stack:
+        prefix, value = stack.pop()
+        if isinstance(value, dict):
+            for key, child in value.items():
+                stack.append((prefix + [str(key)], child))
+        elif not isinstance(value, list):
+            paths.append(prefix)
+    return paths
@@ -0,0 +1,136 @@
+"""
+Stand-in ของ seeding API (stdlib http.server) สำหรับ test ของ ApiSeeder หรือรัน suite ในเครื่องโดยไม่มี app จริง
+
+    python tests/seeding_server.py --port 8099
+    (แล้วตั้ง LDP_environment.ldp_base_url: http://127.0.0.1:8099)
+
+- endpoint ใน api_seeder.DEFAULT_ENDPOINTS: 201 + JSON {'id', 'method', 'path', 'json'}
+- /status/<code>: ตอบ status นั้น (text)
+- /text: 200 text/plain, /bad-json: 200 Content-Type JSON แต่ body ไม่ใช่ JSON
+- path อื่น: 404
+ใช้ HTTP/1.1 keep-alive; connections นับจำนวน TCP connection ที่ client เปิดจริง
+"""
+import argparse
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Resources" / "pythonLib"))
+from api_seeder import DEFAULT_ENDPOINTS
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "_Server"
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _handle(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        body = json.loads(raw) if raw else None
+        with self.server.lock:
+            self.server.requests.append((self.command, self.path, body))
+            request_id = len(self.server.requests)
+        if self.path in self.server.endpoints:
+            self._reply(201, "application/json",
+                        json.dumps({"id": request_id, "method": self.command, "path": self.path, "json": body}))
+        elif self.path.startswith("/status/"):
+            self._reply(int(self.path.rsplit("/", 1)[1]), "text/plain", f"status {self.path}")
+        elif self.path == "/text":
+            self._reply(200, "text/plain", "plain text")
+        elif self.path == "/bad-json":
+            self._reply(200, "application/json", "{not json")
+        else:
+            self._reply(404, "text/plain", f"no endpoint {self.path}")
+
+    def _reply(self, status: int, content_type: str, text: str) -> None:
+        data = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int]):
+        super().__init__(address, _Handler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests: List[Tuple[str, str, Any]] = []
+        self.endpoints = set(DEFAULT_ENDPOINTS.values())
+
+
+class SeedingServer:
+    """server ใน background thread: ``with SeedingServer() as server: ... server.url``"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self._server = _Server((host, port))
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def connections(self) -> int:
+        return self._server.connections
+
+    @property
+    def requests(self) -> List[Tuple[str, str, Any]]:
+        with self._server.lock:
+            return list(self._server.requests)
+
+    def start(self) -> "SeedingServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), name="seeding-server",
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "SeedingServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI: python seeding_server.py [--host HOST] [--port PORT]"""
+    parser = argparse.ArgumentParser(prog="seeding_server.py", description="Stand-in seeding API for ApiSeeder")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    args = parser.parse_args(argv)
+    server = _Server((args.host, args.port))
+    print(f"Seeding API stand-in on http://{args.host}:{server.server_address[1]} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+adaptive_wait: เกิน adaptive deadline = warning (poll ต่อถึง ceiling), timeout ถูกบันทึก, locator แบบ SeleniumLibrary
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+import adaptive_wait
+from adaptive_wait import AdaptiveWait, _locator
+
+
+class _FakeDriver:
+    """execute_script คืน False จนถึง poll ที่ ready_after (None = ไม่พร้อมเลย)"""
+
+    def __init__(self, ready_after):
+        self.ready_after = ready_after
+        self.polls = 0
+        self.checks = None
+
+    def execute_script(self, script, checks):
+        self.polls += 1
+        self.checks = checks
+        ready = self.ready_after is not None and self.polls >= self.ready_after
+        return [ready] * len(checks)
+
+
+@pytest.fixture
+def waiter(tmp_path, monkeypatch):
+    monkeypatch.setattr(adaptive_wait, "DEADLINE_FLOOR", 0.0)
+    monkeypatch.setattr(adaptive_wait, "POLL_MAX", 0.01)
+    warnings = []
+    monkeypatch.setattr("robot.api.logger.warn", warnings.append)
+    library = AdaptiveWait(str(tmp_path / "history.json"))
+    library.warnings = warnings
+    # ceiling ของ report (ปกติมาจาก settings)
+    library._ceiling = 5.0
+    for _ in range(adaptive_wait.MIN_SAMPLES):
+        library._record("visible id=go", 0.001)
+    return library
+
+
+def _use_driver(monkeypatch, library, driver):
+    monkeypatch.setattr(library, "_selenium", lambda: type("Selenium", (), {"driver": driver})())
+
+
+def test_wait_past_adaptive_deadline_warns_instead_of_failing(waiter, monkeypatch):
+    deadline = waiter.get_wait_deadline("visible", "id=go", ceiling="5s")
+    assert deadline < 0.01
+    _use_driver(monkeypatch, waiter, _FakeDriver(ready_after=4))
+
+    elapsed = waiter.wait_until_ready("id=go", ceiling="5s")
+
+    assert elapsed > deadline
+    assert len(waiter.warnings) == 1 and "adaptive deadline" in waiter.warnings[0]
+    row = next(r for r in waiter.get_adaptive_wait_report() if r["key"] == "visible id=go")
+    assert (row["waits"], row["late"], row["timeouts"], row["samples"]) == (1, 1, 0, adaptive_wait.MIN_SAMPLES + 1)
+
+
+def test_timeout_at_ceiling_is_recorded(waiter, monkeypatch):
+    _use_driver(monkeypatch, waiter, _FakeDriver(ready_after=None))
+
+    with pytest.raises(AssertionError, match="ceiling 0.05s"):
+        waiter.wait_until_ready("id=go", ceiling="0.05s")
+
+    row = next(r for r in waiter.get_adaptive_wait_report() if r["key"] == "visible id=go")
+    assert (row["waits"], row["timeouts"], row["samples"]) == (0, 1, adaptive_wait.MIN_SAMPLES + 1)
+    assert max(waiter._load_history()["visible id=go"]) >= 0.05
+
+
+@pytest.mark.parametrize("locator, expected", [
+    ("submit", ["identifier", "submit"]),
+    ("id=submit", ["id", "submit"]),
+    ("id:submit", ["id", "submit"]),
+    ("name=username", ["name", "username"]),
+    ("Partial Link=Forgot", ["partial link", "Forgot"]),
+    ("css=div.a[x='1']", ["css", "div.a[x='1']"]),
+    ("//button[@type='submit']", ["xpath", "//button[@type='submit']"]),
+    ("(//a)[2]", ["xpath", "(//a)[2]"]),
+    ("data=qa:login", ["xpath", '//*[@data-qa="login"]']),
+    ("foo=bar", ["identifier", "foo=bar"]),
+])
+def test_locator_follows_seleniumlibrary_syntax(locator, expected):
+    assert _locator(locator) == expected
+
+
+@pytest.mark.parametrize("locator", ["dom=document.forms[0]", "jquery=#a", "css=form >> id=go", "data=qa"])
+def test_unsupported_locator_is_rejected_before_polling(waiter, monkeypatch, locator):
+    driver = _FakeDriver(ready_after=1)
+    _use_driver(monkeypatch, waiter, driver)
+    with pytest.raises(ValueError):
+        waiter.wait_until_ready(locator, ceiling="1s")
+    assert driver.polls == 0
@@ -0,0 +1,90 @@
+"""
+ApiSeeder กับ stand-in server (seeding_server.py): request เดี่ยว, bulk, การรวม failure และการใช้ connection ซ้ำ
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("requests")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Resources" / "pythonLib"))
+from api_seeder import DEFAULT_ENDPOINTS, ApiSeeder, SeedingError
+from seeding_server import SeedingServer
+
+
+@pytest.fixture
+def server():
+    with SeedingServer() as running:
+        yield running
+
+
+@pytest.fixture
+def seeder(server, tmp_path):
+    settings = tmp_path / "settings.yaml"
+    settings.write_text(f"LDP_environment:\n  ldp_base_url: {server.url}\n", encoding="utf-8")
+    library = ApiSeeder(str(settings), pool_size=4, max_workers=4, timeout=5)
+    yield library
+    library.close_seeding_session()
+
+
+def test_single_request(seeder, server):
+    body = seeder.seed_lockout("0829999999", attempts=3)
+
+    assert body["path"] == DEFAULT_ENDPOINTS["lockout"]
+    assert body["json"] == {"phone": "0829999999", "attempts": 3}
+    assert seeder.seed_request("GET", "/text") == "plain text"
+    assert seeder.seed_request("GET", f"{server.url}/status/204", expected_status="204") is None
+
+
+def test_bulk_requests_keep_order(seeder, server):
+    accounts = [{"name": f"user{n}"} for n in range(12)]
+
+    bodies = seeder.seed_test_accounts(*accounts)
+
+    assert [body["json"] for body in bodies] == accounts
+    assert len(server.requests) == 12
+    assert seeder.get_seeding_stats()["bulk_batches"] == 1
+
+
+def test_bulk_failures_are_reported_together(seeder, server):
+    with pytest.raises(SeedingError) as error:
+        seeder.seed_requests({"method": "GET", "path": "/text"},
+                             {"method": "GET", "path": "/status/500"},
+                             {"method": "GET", "path": "/bad-json"},
+                             {"method": "GET", "path": "/missing"})
+
+    message = str(error.value)
+    assert message.startswith("3/4 seeding request(s) failed")
+    assert "#2" in message and "HTTP 500" in message
+    assert "#3" in message and "invalid JSON response" in message
+    assert "#4" in message and "HTTP 404" in message
+    assert len(server.requests) == 4
+    assert seeder.get_seeding_stats()["failed"] == 3
+
+
+def test_invalid_items_fail_before_sending(seeder, server):
+    with pytest.raises(SeedingError) as error:
+        seeder.seed_requests({"method": "GET", "path": "/text"},
+                             {"method": "POST"},
+                             {"method": "FETCH", "path": "/text"},
+                             {"path": "/text", "body": {}},
+                             "not a dict")
+
+    message = str(error.value)
+    assert "nothing was sent" in message
+    for expected in ("#2 missing 'path'", "#3 unknown method 'FETCH'", "#4 unknown key(s) body", "#5 expected a dictionary"):
+        assert expected in message
+    assert "#1" not in message
+    assert server.requests == []
+
+
+def test_keep_alive_connections_are_reused(seeder, server):
+    for n in range(10):
+        seeder.seed_request("POST", DEFAULT_ENDPOINTS["otp"], {"phone": str(n)})
+    seeder.seed_requests(*[{"path": DEFAULT_ENDPOINTS["account"], "json": {"n": n}} for n in range(20)])
+
+    stats = seeder.get_seeding_stats()
+    assert stats["requests"] == 30
+    assert 1 <= stats["connections_opened"] <= 4
+    assert server.connections == stats["connections_opened"]
@@ -0,0 +1,49 @@
+"""
+DataReader.generate_variable_file: ไฟล์ที่ generate ต้องถูกเขียนใหม่เมื่อ overlay ที่ active เปลี่ยน
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Resources" / "pythonLib"))
+from base_library import BaseLibrary
+from data_reader import DataReader
+
+
+@pytest.fixture
+def reader(monkeypatch):
+    monkeypatch.setattr(BaseLibrary, "_settings_layers", ())
+    monkeypatch.setattr(BaseLibrary, "SETTINGS_CHECK_INTERVAL", 0)
+    return DataReader()
+
+
+def _generated_value(path: str, name: str):
+    namespace = {}
+    exec(Path(path).read_text(encoding="utf-8"), namespace)
+    return namespace[name]
+
+
+def test_variable_file_follows_settings_layers(reader, tmp_path, monkeypatch):
+    base = tmp_path / "base.yaml"
+    base.write_text("S:\n  a: 1\n", encoding="utf-8")
+    overlay = tmp_path / "overlay.yaml"
+    overlay.write_text("S:\n  a: 2\n", encoding="utf-8")
+    output = str(tmp_path / "vars.py")
+
+    reader.generate_variable_file(output, settings_path=str(base))
+    assert _generated_value(output, "S_A") == 1
+
+    reader.set_settings_layers(str(overlay))
+    assert reader.get_from_settings("S.a", settings_path=str(base)) == 2
+    reader.generate_variable_file(output, settings_path=str(base))
+    assert _generated_value(output, "S_A") == 2
+
+    monkeypatch.setenv("OVR__S__a", "3")
+    reader.set_settings_layers(str(overlay), "env:OVR")
+    reader.generate_variable_file(output, settings_path=str(base))
+    assert _generated_value(output, "S_A") == 3
+
+    reader.set_settings_layers()
+    reader.generate_variable_file(output, settings_path=str(base))
+    assert _generated_value(output, "S_A") == 1
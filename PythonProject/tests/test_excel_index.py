@@ -0,0 +1,45 @@
+"""
+ExcelIndex.prefetch_test_data: ค่า None และไฟล์ที่ไม่มีอยู่ต้องไม่กินโควตา INDEX_CACHE_SIZE
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+openpyxl = pytest.importorskip("openpyxl")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Resources" / "pythonLib"))
+from excel_index import ExcelIndex
+
+
+def _workbook(path: Path) -> None:
+    wb = openpyxl.Workbook()
+    wb.active.append(["Test_Case_ID", "Value"])
+    wb.active.append(["TC1", path.stem])
+    wb.save(path)
+
+
+@pytest.fixture
+def excel(monkeypatch):
+    monkeypatch.setattr(ExcelIndex, "INDEX_CACHE_SIZE", 2)
+    library = ExcelIndex()
+    library.clear_test_data_cache()
+    yield library
+    library.clear_test_data_cache()
+
+
+def test_prefetch_caps_after_dropping_empty_and_missing(excel, tmp_path):
+    for name in ("a", "b", "c"):
+        _workbook(tmp_path / f"{name}.xlsx")
+    settings = tmp_path / "settings.yaml"
+    settings.write_text(
+        "Data:\n  none: null\n  gone: gone.xlsx\n  a: a.xlsx\n  b: b.xlsx\n  c: c.xlsx\n", encoding="utf-8")
+
+    started = excel.prefetch_test_data("Data", str(tmp_path), settings_path=str(settings))
+
+    assert [Path(path).name for path in started] == ["a.xlsx", "b.xlsx"]
+    for name in ("a", "b"):
+        assert excel.get_test_case_data_by_id("TC1", str(tmp_path / f"{name}.xlsx"))["Value"] == name
+    statuses = {Path(f["source"].split(" [")[0]).name: f["status"]
+                for f in excel.get_test_data_prefetch_report()["files"]}
+    assert statuses == {"gone.xlsx": "missing", "a.xlsx": "done", "b.xlsx": "done", "c.xlsx": "skipped"}
@@ -0,0 +1,18 @@
+"""
+Keyword library ต้องไม่ import dependency หนัก (ดู DEFERRED ใน benchmarks/check_import_time.py) ตอน import
+(รันใน interpreter ใหม่ที่ preload สิ่งที่ Robot import ไว้แล้ว) ผลไม่ขึ้นกับความเร็วเครื่อง
+budget เป็นมิลลิวินาทีตรวจด้วย python benchmarks/check_import_time.py เท่านั้น (เวลาจริงไม่นิ่งบน CI ที่โหลดหนัก)
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+from check_import_time import LIBRARIES, check_library
+
+
+@pytest.mark.parametrize("library", LIBRARIES)
+def test_library_defers_heavy_imports(library):
+    _, heavy = check_library(library, repeat=1)
+    assert not heavy, f"{library} imports {', '.join(heavy)} at import time"
@@ -0,0 +1,56 @@
+"""
+PathResolver: listing ที่ cache ไว้ต้องไม่ทำให้ไฟล์ที่เพิ่งถูกสร้างถูกรายงานว่าไม่มี
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Resources" / "pythonLib"))
+import data_reader
+from data_reader import DataReader
+from path_resolver import PathResolver
+
+
+class _StubBuiltIn:
+    store = {"${SUITE_NAME}": "Paths"}
+
+    def get_variable_value(self, name, default=None):
+        return self.store.get(name, default)
+
+    def set_suite_variable(self, name, value):
+        self.store[name] = value
+
+    set_global_variable = set_suite_variable
+
+
+def test_file_created_after_listing_is_found(tmp_path):
+    resolver = PathResolver(ttl=60, max_workers=1)
+    (tmp_path / "a.xlsx").write_text("a")
+    assert [r.exists for r in resolver.resolve_all(str(tmp_path), [("a", "a.xlsx"), ("b", "b.xlsx")])] == [True, False]
+
+    (tmp_path / "b.xlsx").write_text("b")
+
+    assert [r.exists for r in resolver.resolve_all(str(tmp_path), [("a", "a.xlsx"), ("b", "b.xlsx")])] == [True, True]
+    # ไฟล์ที่เจอแล้วไม่ทำให้ list ใหม่ (ใช้ listing ที่ cache ไว้)
+    listings = resolver.stats["listings"]
+    assert all(r.exists for r in resolver.resolve_all(str(tmp_path), [("a", "a.xlsx"), ("b", "b.xlsx")]))
+    assert resolver.stats["listings"] == listings
+
+
+def test_ensure_exists_sees_workbook_created_by_setup(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_reader, "BuiltIn", _StubBuiltIn)
+    monkeypatch.setattr(DataReader, "_path_resolver", PathResolver(ttl=60))
+    settings = tmp_path / "settings.yaml"
+    settings.write_text("Data:\n  first: data/first.xlsx\n  second: data/second.xlsx\n", encoding="utf-8")
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "first.xlsx").write_text("1")
+    reader = DataReader()
+
+    with pytest.raises(FileNotFoundError, match="second"):
+        reader.build_section_paths_from_settings("Data", str(tmp_path), ensure_exists=True, settings_path=str(settings))
+    (tmp_path / "data" / "second.xlsx").write_text("2")
+
+    paths = reader.build_section_paths_from_settings("Data", str(tmp_path), ensure_exists=True,
+                                                     settings_path=str(settings))
+    assert Path(paths["second"]).name == "second.xlsx"
@@ -0,0 +1,53 @@
+"""
+ScreenshotPipeline: screenshots.json ต้องรวม reference ของทุก process/run ที่ใช้โฟลเดอร์เดียวกัน ไม่ใช่เขียนทับ
+"""
+import base64
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Resources" / "pythonLib"))
+from screenshot_pipeline import ScreenshotPipeline
+
+
+def make_pipeline(directory, monkeypatch, image):
+    pipeline = ScreenshotPipeline(screenshot_dir=str(directory))
+    driver = SimpleNamespace(get_screenshot_as_base64=lambda: base64.b64encode(image).decode("ascii"))
+    monkeypatch.setattr(pipeline, "_selenium", lambda: SimpleNamespace(driver=driver))
+    return pipeline
+
+
+def references(directory):
+    manifest = json.loads((directory / "screenshots.json").read_text(encoding="utf-8"))
+    return {digest: [ref["name"] for ref in entry["references"]] for digest, entry in manifest.items()}
+
+
+def test_pipelines_sharing_a_directory_keep_each_others_references(tmp_path, monkeypatch):
+    first = make_pipeline(tmp_path, monkeypatch, b"same")
+    second = make_pipeline(tmp_path, monkeypatch, b"same")
+    other = make_pipeline(tmp_path, monkeypatch, b"other")
+
+    first.capture_screenshot("first")
+    first.flush_screenshots()
+    second.capture_screenshot("second")
+    other.capture_screenshot("other")
+    second.flush_screenshots()
+    other.flush_screenshots()
+
+    assert sorted(references(tmp_path).values()) == [["first", "second"], ["other"]]
+    assert not list(tmp_path.glob("*.lock"))
+    for pipeline in (first, second, other):
+        pipeline._stop_worker()
+
+
+def test_repeated_flush_does_not_duplicate_references(tmp_path, monkeypatch):
+    pipeline = make_pipeline(tmp_path, monkeypatch, b"image")
+    pipeline.capture_screenshot("a")
+    pipeline.flush_screenshots()
+    pipeline.flush_screenshots()
+    pipeline.capture_screenshot("b")
+    pipeline.flush_screenshots()
+    pipeline._stop_worker()
+
+    assert list(references(tmp_path).values()) == [["a", "b"]]
@@ -0,0 +1,116 @@
+"""
+SessionPool / WebDriverPool กับ fake driver: ใช้ซ้ำหลัง quit, ทิ้ง session ที่ตายแล้ว และจำกัดจำนวนตัวว่างต่อ profile
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Resources" / "pythonLib"))
+from session_pool import SessionPool, WebDriverPool, _PooledDriver
+
+
+class FakeDriver:
+    def __init__(self):
+        self.current_url = "about:blank"
+        self.session_id = "fake"
+        self.quits = 0
+        self.dead = False
+
+    def __getattribute__(self, name):
+        if name == "current_url" and object.__getattribute__(self, "dead"):
+            raise ConnectionError("session is gone")
+        return object.__getattribute__(self, name)
+
+    def get(self, url):
+        self.current_url = url
+
+    def delete_all_cookies(self):
+        pass
+
+    def execute_script(self, *args):
+        return None
+
+    def quit(self):
+        self.quits += 1
+
+
+def make_driver(browser, options):
+    return FakeDriver()
+
+
+def test_released_driver_is_reused():
+    pool = SessionPool(make_driver)
+    first = pool.acquire("chrome", {"headless": True})
+    assert pool.release(first)
+
+    assert pool.acquire("chrome", {"headless": True}) is first
+    assert pool.acquire("firefox", {}) is not first
+    assert pool.stats["created"] == 2 and pool.stats["reused"] == 1
+    assert first.quits == 0
+
+
+def test_dead_idle_session_is_evicted():
+    pool = SessionPool(make_driver)
+    first = pool.acquire("chrome", {})
+    pool.release(first)
+    first.dead = True
+
+    second = pool.acquire("chrome", {})
+
+    assert second is not first
+    assert first.quits == 1
+    assert (pool.stats["discarded"], pool.stats["created"], pool.stats["reused"]) == (1, 2, 0)
+    assert pool.idle_count() == 0
+
+
+def test_idle_drivers_are_capped_per_profile():
+    pool = SessionPool(make_driver, max_idle_per_profile=2)
+    drivers = [pool.acquire("chrome", {}) for _ in range(3)]
+
+    assert [pool.release(driver) for driver in drivers] == [True, True, False]
+    assert pool.idle_count() == 2
+    assert drivers[2].quits == 1
+    pool.close_all()
+    assert pool.idle_count() == 0 and all(driver.quits == 1 for driver in drivers)
+
+
+def test_release_of_foreign_driver_fails():
+    with pytest.raises(ValueError):
+        SessionPool(make_driver).release(FakeDriver())
+
+
+@pytest.fixture
+def library(monkeypatch):
+    SeleniumLibrary = pytest.importorskip("SeleniumLibrary").SeleniumLibrary
+    selenium = SeleniumLibrary()
+    monkeypatch.setattr(WebDriverPool, "_pool", None)
+    library = WebDriverPool(driver_factory=make_driver)
+    monkeypatch.setattr(library, "_selenium", lambda: selenium)
+    monkeypatch.setattr(library._config, "get_browser_options", lambda *args: {})
+    yield library, selenium
+    library.close_browser_pool()
+
+
+def test_selenium_close_browser_returns_driver_to_pool(library):
+    library, selenium = library
+    library.open_pooled_browser("http://a/", browser="chrome", alias="main")
+    first = selenium.driver
+    assert isinstance(first, _PooledDriver)
+    real = first._driver
+
+    library.release_pooled_browser()
+    library.open_pooled_browser("http://b/", browser="chrome", alias="main")
+    assert selenium.driver._driver is real and selenium.driver.current_url == "http://b/"
+
+    selenium.close_all_browsers()
+    stats = library.get_browser_pool_stats()
+    assert (stats["created"], stats["reused"], stats["idle"], stats["discarded"]) == (1, 1, 1, 0)
+    assert real.quits == 0
+
+
+def test_release_pooled_browser_rejects_unpooled_driver(library):
+    library, selenium = library
+    selenium.register_driver(FakeDriver(), None)
+    with pytest.raises(ValueError):
+        library.release_pooled_browser()
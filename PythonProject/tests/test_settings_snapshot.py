@@ -0,0 +1,66 @@
+"""
+BaseLibrary settings snapshot (pickle ของ YAML ที่ parse แล้ว): แยกตาม path, snapshot เสีย = cache miss,
+ใช้เฉพาะ directory ที่เป็นของ user ปัจจุบัน
+"""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Resources" / "pythonLib"))
+from base_library import BaseLibrary
+
+
+@pytest.fixture
+def library(tmp_path, monkeypatch):
+    snapshots = tmp_path / "snapshots"
+    monkeypatch.setattr(BaseLibrary, "SETTINGS_SNAPSHOT_DIR", str(snapshots))
+    library = BaseLibrary()
+    library.snapshots = snapshots
+    return library
+
+
+def _settings(directory: Path, value: int) -> Path:
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / "DRDB_Config.yaml"
+    path.write_text(f"S:\n  a: {value}\n", encoding="utf-8")
+    return path
+
+
+def test_same_file_name_in_different_directories_keeps_both_snapshots(library, tmp_path):
+    first, second = _settings(tmp_path / "one", 1), _settings(tmp_path / "two", 2)
+
+    assert library._parse_settings_file(first) == {"S": {"a": 1}}
+    assert library._parse_settings_file(second) == {"S": {"a": 2}}
+
+    assert len(list(library.snapshots.glob("*.pickle"))) == 2
+    loads = BaseLibrary._cache_stats["snapshot_loads"]
+    assert library._parse_settings_file(first) == {"S": {"a": 1}}
+    assert BaseLibrary._cache_stats["snapshot_loads"] == loads + 1
+
+
+@pytest.mark.parametrize("content", [
+    b"",                              # EOFError
+    b"\x80\x09.",                     # ValueError: unsupported pickle protocol
+    b"cno_such_module\nthing\n.",     # ModuleNotFoundError
+    b"cbuiltins\nno_such_attr\n.",    # AttributeError
+])
+def test_corrupt_snapshot_is_a_cache_miss(library, tmp_path, content):
+    settings = _settings(tmp_path / "one", 1)
+    library._parse_settings_file(settings)
+    (snapshot,) = library.snapshots.glob("*.pickle")
+    snapshot.write_bytes(content)
+
+    assert library._parse_settings_file(settings) == {"S": {"a": 1}}
+    assert snapshot.read_bytes() != content
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+def test_snapshot_dir_writable_by_others_is_not_used(library, tmp_path):
+    library.snapshots.mkdir()
+    library.snapshots.chmod(0o777)
+    settings = _settings(tmp_path / "one", 1)
+
+    assert library._parse_settings_file(settings) == {"S": {"a": 1}}
+    assert list(library.snapshots.iterdir()) == []
@@ -0,0 +1,45 @@
+"""
+shard_scheduler: grouping ตาม tag เป็น opt-in และ report ต้องได้ output.xml ครบทุก shard
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Resources" / "pythonLib"))
+from shard_scheduler import TestCase as Case, build_units, main, report
+
+TESTS = [
+    Case("Auth.Login", "Auth", ("authentication", "smoke")),
+    Case("Auth.Lockout", "Auth", ("authentication",)),
+    Case("Auth.Otp", "Auth", ("authentication",)),
+    Case("Auth.Health", "Auth", ("smoke",)),
+]
+
+
+def test_tests_are_not_grouped_by_default():
+    units = build_units(TESTS, {})
+    assert sorted(unit.tests for unit in units) == sorted((test.name,) for test in TESTS)
+
+
+def test_group_tags_keep_tests_together_when_asked():
+    units = build_units(TESTS, {}, group_tags=["authentication"])
+    assert sorted(len(unit.tests) for unit in units) == [1, 3]
+
+
+def test_report_rejects_missing_outputs(tmp_path):
+    plan_data = {"shards": [{"index": 1, "tests": ["a"], "predicted": 1.0},
+                            {"index": 2, "tests": ["b"], "predicted": 1.0}],
+                 "predicted_makespan": 1.0}
+    with pytest.raises(ValueError, match="2 shard"):
+        report(plan_data, [str(tmp_path / "shard_1" / "output.xml")])
+
+
+def test_cli_plan_without_group_tag_balances_suite(tmp_path):
+    suite = tmp_path / "auth.robot"
+    suite.write_text("*** Test Cases ***\n" + "".join(
+        f"{test.name.split('.')[1]}\n    [Tags]    {'    '.join(test.tags)}\n    No Operation\n" for test in TESTS),
+        encoding="utf-8")
+    out_dir = tmp_path / "shards"
+    assert main(["plan", str(suite), "--shards", "2", "--out-dir", str(out_dir)]) == 0
+    assert [len(path.read_text().splitlines()) - 1 for path in sorted(out_dir.glob("*.args"))] == [2, 2]
@@ -0,0 +1,359 @@
+"""
+Adaptive Wait Library for Robot Framework
+แทน Wait Until ... timeout=10s แบบตายตัว: poll ถี่ในช่วงแรกแล้วค่อยๆ ห่างขึ้น (backoff) และตรวจหลายเงื่อนไข
+ในการ poll ครั้งเดียว (Execute JavaScript 1 round trip ต่อรอบ) ใช้ locator จาก locators.robot ได้ตรงๆ
+
+    Library    ../libraries/adaptive_wait.py    WITH NAME    AdaptiveWait
+
+    AdaptiveWait.Wait Until Ready    ${AUTH_CONTINUE_BUTTON}    visible    enabled
+    AdaptiveWait.Wait For Conditions    visible    ${AUTH_ID_CARD_INPUT}    url_not_contains    authentication.html
+
+เวลาที่แต่ละ locator/เงื่อนไขใช้จนพร้อม (รวมถึงครั้งที่ timeout) ถูกบันทึก (latency history) ข้าม run ในไฟล์ JSON
+(ROBOT_WAIT_HISTORY, default wait_history.json) adaptive deadline = p95 ของ latency ล่าสุด x DEADLINE_MARGIN
+(ไม่น้อยกว่า DEADLINE_FLOOR) การรอที่เกิน adaptive deadline ไม่ fail: poll ต่อจนถึง ceiling
+(argument ceiling= หรือ timeout ใน settings ผ่าน ConfigReader) แล้ว log warning พร้อมเวลาที่ใช้จริง
+fail เมื่อถึง ceiling เท่านั้น ก่อนมี sample ครบ MIN_SAMPLES deadline = ceiling
+
+การตรวจทำใน JavaScript (ไม่ใช้ find_element) จึงไม่ซ้อนกับ implicit wait ของ SeleniumLibrary
+locator ใช้ syntax ของ SeleniumLibrary (strategy=value หรือ strategy:value, xpath ที่ขึ้นต้นด้วย // หรือ (//,
+ไม่มี strategy = id หรือ name) รองรับ id, name, identifier, xpath, css, class, tag, link, partial link, data;
+dom, jquery, sizzle, scLocator และ chained locator (>>) ถูก reject ตอนเรียก keyword
+(strategy ที่ add ผ่าน Add Location Strategy ใช้ไม่ได้: prefix ที่ไม่รู้จักถูกตีความเป็น id หรือ name แบบ SeleniumLibrary)
+"""
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+HISTORY_ENV = 'ROBOT_WAIT_HISTORY'
+DEFAULT_HISTORY_FILE = 'wait_history.json'
+# จำนวน latency ล่าสุดที่เก็บต่อ key
+HISTORY_SIZE = 50
+MIN_SAMPLES = 5
+PERCENTILE = 95
+DEADLINE_MARGIN = 3.0
+DEADLINE_FLOOR = 2.0
+# ช่วง poll: เริ่ม 25ms คูณ 2 ทุกรอบ สูงสุด 250ms
+POLL_START = 0.025
+POLL_FACTOR = 2.0
+POLL_MAX = 0.25
+
+# เงื่อนไข -> JavaScript expression (target = arguments ของเงื่อนไข: locator, URL fragment หรือข้อความ)
+_CONDITIONS = {
+    'present': "!!$find(t)",
+    'visible': "$visible($find(t))",
+    'hidden': "!$visible($find(t))",
+    'enabled': "(function(el) { return !!el && !el.disabled; })($find(t))",
+    'url_contains': "window.location.href.indexOf(t) !== -1",
+    'url_not_contains': "window.location.href.indexOf(t) === -1",
+    'page_contains': "!!document.body && document.body.innerText.indexOf(t) !== -1",
+}
+
+# เงื่อนไขที่ target เป็น locator: ส่งไป JavaScript เป็น [strategy, value] ที่ parse แล้ว
+_LOCATOR_CONDITIONS = ('present', 'visible', 'hidden', 'enabled')
+# prefix ของ SeleniumLibrary (caseless, spaceless) -> strategy ของ $find
+_STRATEGIES = {'identifier': 'identifier', 'default': 'identifier', 'id': 'id', 'name': 'name', 'xpath': 'xpath',
+               'css': 'css', 'class': 'class', 'tag': 'tag', 'link': 'link', 'partiallink': 'partial link',
+               'data': 'data'}
+_UNSUPPORTED_STRATEGIES = ('dom', 'jquery', 'sizzle', 'sclocator')
+_XPATH_RE = re.compile(r'\(*//')
+
+_POLL_JS = """
+function $find(locator) {
+    var strategy = locator[0], value = locator[1];
+    switch (strategy) {
+    case 'id': return document.getElementById(value);
+    case 'name': return document.getElementsByName(value)[0] || null;
+    case 'identifier': return document.getElementById(value) || document.getElementsByName(value)[0] || null;
+    case 'css': return document.querySelector(value);
+    case 'class': return document.getElementsByClassName(value)[0] || null;
+    case 'tag': return document.getElementsByTagName(value)[0] || null;
+    case 'link': return $link(value, true);
+    case 'partial link': return $link(value, false);
+    }
+    return document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+}
+function $link(text, exact) {
+    var links = document.getElementsByTagName('a');
+    for (var i = 0; i < links.length; i++) {
+        var label = (links[i].innerText || '').trim();
+        if (exact ? label === text : label.indexOf(text) !== -1) { return links[i]; }
+    }
+    return null;
+}
+function $visible(el) {
+    if (!el) { return false; }
+    var style = window.getComputedStyle(el);
+    if (style.display === 'none' || style.visibility === 'hidden' || style.opacity === '0') { return false; }
+    var rect = el.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0;
+}
+var checks = arguments[0], result = [];
+for (var n = 0; n < checks.length; n++) {
+    var t = checks[n][1];
+    try { result.push(!!CHECKS[checks[n][0]](t)); } catch (e) { result.push(false); }
+}
+return result;
+""".replace('CHECKS', '{' + ', '.join(f"{json.dumps(name)}: function(t) {{ return {code}; }}"
+                                        for name, code in _CONDITIONS.items()) + '}')
+
+
+def _locator(locator: str) -> List[str]:
+    """
+    SeleniumLibrary locator -> [strategy, value] สำหรับ $find (parse แบบเดียวกับ ElementFinder)
+    raise ValueError ถ้า strategy ตรวจใน JavaScript ไม่ได้
+    """
+    if ' >> ' in locator:
+        raise ValueError(f"Chained locators are not supported by adaptive waits: {locator!r}")
+    if _XPATH_RE.match(locator):
+        return ['xpath', locator]
+    separators = [i for i in (locator.find('='), locator.find(':')) if i != -1]
+    if separators:
+        index = min(separators)
+        prefix = locator[:index].strip().lower().replace(' ', '')
+        value = locator[index + 1:].lstrip()
+        if prefix in _UNSUPPORTED_STRATEGIES:
+            raise ValueError(f"Locator strategy {locator[:index].strip()!r} is not supported by adaptive waits; "
+                             f"use one of {', '.join(sorted(set(_STRATEGIES.values())))}")
+        strategy = _STRATEGIES.get(prefix)
+        if strategy == 'data':
+            name, _, data_value = value.partition(':')
+            if not name or not data_value:
+                raise ValueError(f"Provided selector ({value}) is malformed. Correct format: name:value.")
+            return ['xpath', f'//*[@data-{name}="{data_value}"]']
+        if strategy is not None:
+            return [strategy, value]
+    return ['identifier', locator]
+
+
+def _percentile(samples: List[float], percent: int) -> float:
+    """nearest-rank percentile"""
+    ordered = sorted(samples)
+    rank = max(1, -(-len(ordered) * percent // 100))
+    return ordered[rank - 1]
+
+
+def _new_stats() -> Dict[str, Any]:
+    return {'waits': 0, 'late': 0, 'timeouts': 0, 'polls': 0, 'waited_seconds': 0.0}
+
+
+class AdaptiveWait:
+    """Library for waits whose deadline comes from observed readiness latency"""
+
+    ROBOT_LIBRARY_SCOPE = 'GLOBAL'
+
+    def __init__(self, history_file: Optional[str] = None):
+        self._history_file = history_file or os.environ.get(HISTORY_ENV) or DEFAULT_HISTORY_FILE
+        self._history: Optional[Dict[str, Deque[float]]] = None
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._ceiling: Optional[float] = None
+        # key -> {'waits', 'late', 'timeouts', 'polls', 'waited_seconds'} ของ run นี้
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    # ---------- public keywords ----------
+
+    def wait_until_ready(self, locator: str, *states: str, ceiling: Optional[str] = None) -> float:
+        """
+        รอจน element อยู่ในทุก state ที่กำหนด (present, visible, hidden, enabled; default visible)
+        คืนค่าเวลาที่รอ (วินาที)
+        """
+        return self.wait_for_conditions(*[part for state in (states or ('visible',)) for part in (state, locator)],
+                                        ceiling=ceiling)
+
+    def wait_for_conditions(self, *conditions: str, ceiling: Optional[str] = None) -> float:
+        """
+        รอจนทุกเงื่อนไขเป็นจริงพร้อมกัน: argument เป็นคู่ condition target เช่น
+        ``visible ${LOCATOR} enabled ${BUTTON} url_not_contains authentication.html``
+        condition: present, visible, hidden, enabled (target = locator), url_contains, url_not_contains
+        (target = ส่วนของ URL), page_contains (target = ข้อความ) ทุกเงื่อนไขถูกตรวจใน round trip เดียวต่อรอบ
+        คืนค่าเวลาที่รอ (วินาที)
+        """
+        checks = self._parse_conditions(conditions)
+        key = ' & '.join(f"{name} {target}" for name, target in checks)
+        limit = self._ceiling_seconds(ceiling)
+        deadline, adaptive = self._deadline(key, limit)
+        script_checks = [[name, _locator(target) if name in _LOCATOR_CONDITIONS else target]
+                         for name, target in checks]
+        driver = self._selenium().driver
+        stats = self._entry(key)
+
+        start = time.perf_counter()
+        interval = POLL_START
+        while True:
+            results = driver.execute_script(_POLL_JS, script_checks) or []
+            stats['polls'] += 1
+            elapsed = time.perf_counter() - start
+            if len(results) == len(checks) and all(results):
+                break
+            if elapsed >= limit:
+                # timeout ก็เป็น sample: ถ้าเก็บเฉพาะครั้งที่สำเร็จ p95 จะต่ำกว่าความจริง
+                self._record(key, elapsed)
+                stats['timeouts'] += 1
+                stats['waited_seconds'] += elapsed
+                pending = [f"{name} {target}" for (name, target), ok in zip(checks, results) if not ok]
+                raise AssertionError(f"Conditions not met after {elapsed:.2f}s (ceiling {limit:.2f}s): "
+                                     f"{', '.join(pending) or key}")
+            time.sleep(min(interval, max(limit - elapsed, 0)))
+            interval = min(interval * POLL_FACTOR, POLL_MAX)
+
+        self._record(key, elapsed)
+        stats['waits'] += 1
+        stats['waited_seconds'] += elapsed
+        if adaptive and elapsed > deadline:
+            stats['late'] += 1
+            from robot.api import logger
+            logger.warn(f"'{key}' took {elapsed:.2f}s, longer than its adaptive deadline {deadline:.2f}s "
+                        f"(p{PERCENTILE} x {DEADLINE_MARGIN}); ceiling {limit:.2f}s")
+        return elapsed
+
+    def get_wait_deadline(self, *conditions: str, ceiling: Optional[str] = None) -> float:
+        """adaptive deadline (วินาที) ของเงื่อนไขชุดนี้ในตอนนี้: รอเกินนี้ได้ถึง ceiling แต่จะถูก log warning"""
+        key = ' & '.join(f"{name} {target}" for name, target in self._parse_conditions(conditions))
+        return self._deadline(key, self._ceiling_seconds(ceiling))[0]
+
+    def get_adaptive_wait_report(self) -> List[Dict[str, Any]]:
+        """
+        ต่อ key (ชุดเงื่อนไข): จำนวนครั้งที่รอ/เกิน adaptive deadline (late)/timeout/poll, เวลารอรวมใน run นี้,
+        p50/p95 ของ latency ใน history และ deadline ปัจจุบัน เรียงตามเวลารอรวมมากไปน้อย
+        """
+        history = self._load_history()
+        limit = self._ceiling_seconds(None)
+        rows = []
+        for key in sorted(set(history) | set(self._stats)):
+            samples = list(history.get(key, ()))
+            row: Dict[str, Any] = {'key': key, 'samples': len(samples),
+                                   'p50': _percentile(samples, 50) if samples else None,
+                                   f"p{PERCENTILE}": _percentile(samples, PERCENTILE) if samples else None,
+                                   'deadline': self._deadline(key, limit)[0]}
+            row.update(self._stats.get(key, _new_stats()))
+            rows.append(row)
+        rows.sort(key=lambda r: (-r['waited_seconds'], r['key']))
+        return rows
+
+    def save_wait_history(self) -> None:
+        """เขียน latency history ลงไฟล์ (เรียกอัตโนมัติตอนจบทุก suite)"""
+        with self._lock:
+            if not self._dirty or self._history is None:
+                return
+            data = {'version': 1, 'samples': {key: [round(s, 4) for s in samples]
+                                              for key, samples in self._history.items()}}
+            self._dirty = False
+        directory = os.path.dirname(os.path.abspath(self._history_file))
+        os.makedirs(directory, exist_ok=True)
+        tmp = os.path.join(directory, f".{os.path.basename(self._history_file)}.{os.getpid()}.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=1, ensure_ascii=False)
+        os.replace(tmp, self._history_file)
+
+    # ---------- internal helpers ----------
+
+    @staticmethod
+    def _parse_conditions(conditions: Tuple[str, ...]) -> List[Tuple[str, str]]:
+        if not conditions or len(conditions) % 2:
+            raise ValueError("Conditions must be given as condition/target pairs, "
+                             f"got {len(conditions)} argument(s)")
+        checks = []
+        for name, target in zip(conditions[::2], conditions[1::2]):
+            name = name.strip().lower().replace(' ', '_')
+            if name not in _CONDITIONS:
+                raise ValueError(f"Unknown wait condition {name!r}; expected one of {', '.join(_CONDITIONS)}")
+            checks.append((name, str(target)))
+        return checks
+
+    def _ceiling_seconds(self, ceiling: Optional[str]) -> float:
+        if ceiling:
+            from robot.utils import timestr_to_secs
+            return timestr_to_secs(ceiling)
+        if self._ceiling is None:
+            # ceiling ที่กำหนดไว้ใน settings (LDP_environment.timeout)
+            from config_reader import get_timeout
+            self._ceiling = float(get_timeout())
+        return self._ceiling
+
+    def _deadline(self, key: str, ceiling: float) -> Tuple[float, bool]:
+        """(deadline, มาจาก history หรือไม่)"""
+        samples = self._load_history().get(key)
+        if not samples or len(samples) < MIN_SAMPLES:
+            return ceiling, False
+        adaptive = max(DEADLINE_FLOOR, _percentile(list(samples), PERCENTILE) * DEADLINE_MARGIN)
+        if adaptive >= ceiling:
+            return ceiling, False
+        return adaptive, True
+
+    def _load_history(self) -> Dict[str, Deque[float]]:
+        if self._history is None:
+            with self._lock:
+                if self._history is None:
+                    try:
+                        with open(self._history_file, encoding='utf-8') as f:
+                            samples = json.load(f).get('samples', {})
+                    except (OSError, ValueError):
+                        samples = {}
+                    self._history = {key: deque((float(s) for s in values), maxlen=HISTORY_SIZE)
+                                     for key, values in samples.items()}
+        return self._history
+
+    def _record(self, key: str, latency: float) -> None:
+        history = self._load_history()
+        with self._lock:
+            samples = history.get(key)
+            if samples is None:
+                samples = history[key] = deque(maxlen=HISTORY_SIZE)
+            samples.append(latency)
+            self._dirty = True
+
+    def _entry(self, key: str) -> Dict[str, Any]:
+        entry = self._stats.get(key)
+        if entry is None:
+            entry = self._stats[key] = _new_stats()
+        return entry
+
+    @staticmethod
+    def _selenium():
+        from robot.libraries.BuiltIn import BuiltIn
+        return BuiltIn().get_library_instance('SeleniumLibrary')
+
+
+class _HistoryListener:
+    """library listener: บันทึก latency history ตอนจบทุก suite"""
+    ROBOT_LISTENER_API_VERSION = 3
+
+    def end_suite(self, data, result):
+        _adaptive_wait_instance.save_wait_history()
+
+    def close(self):
+        _adaptive_wait_instance.save_wait_history()
+
+
+# Module-level keyword wrappers (module-style library)
+_adaptive_wait_instance = AdaptiveWait()
+ROBOT_LIBRARY_LISTENER = _HistoryListener()
+
+
+def wait_until_ready(locator: str, *states: str, ceiling: Optional[str] = None) -> float:
+    """Wait until the element is in every given state (present, visible, hidden, enabled; default visible)"""
+    return _adaptive_wait_instance.wait_until_ready(locator, *states, ceiling=ceiling)
+
+
+def wait_for_conditions(*conditions: str, ceiling: Optional[str] = None) -> float:
+    """Wait until all condition/target pairs hold, checked together in one round trip per poll"""
+    return _adaptive_wait_instance.wait_for_conditions(*conditions, ceiling=ceiling)
+
+
+def get_wait_deadline(*conditions: str, ceiling: Optional[str] = None) -> float:
+    """Deadline (seconds) Wait For Conditions would use for these conditions now"""
+    return _adaptive_wait_instance.get_wait_deadline(*conditions, ceiling=ceiling)
+
+
+def get_adaptive_wait_report() -> List[Dict[str, Any]]:
+    """Per condition set: waits, late waits, timeouts, polls, waited seconds, latency p50/p95 and current deadline"""
+    return _adaptive_wait_instance.get_adaptive_wait_report()
+
+
+def save_wait_history() -> None:
+    """Write the latency history file (done automatically at the end of every suite)"""
+    _adaptive_wait_instance.save_wait_history()
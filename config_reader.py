@@ -51,50 +51,65 @@ class ConfigReader(BaseLibrary):
 
 
 # Module-level keyword wrappers (module-style library)
-_config_reader_instance = ConfigReader()
+# instance ถูกสร้างตอนเรียก keyword ครั้งแรก ไม่ใช่ตอน import (libdoc/dry-run ไม่ต้องสร้าง)
+_instance: Optional[ConfigReader] = None
+
+
+def _config_reader() -> ConfigReader:
+    global _instance
+    if _instance is None:
+        _instance = ConfigReader()
+    return _instance
+
+
+def __getattr__(name: str) -> Any:
+    # compatibility: _config_reader_instance เคยเป็นตัวแปร module-level
+    if name == '_config_reader_instance':
+        return _config_reader()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_browser_name() -> str:
     """Get default browser name from settings"""
-    return _config_reader_instance.get_browser_name()
+    return _config_reader().get_browser_name()
 
 
 def get_base_url() -> str:
     """Get base URL from settings"""
-    return _config_reader_instance.get_base_url()
+    return _config_reader().get_base_url()
 
 
 def get_timeout() -> int:
     """Get timeout from settings"""
-    return _config_reader_instance.get_timeout()
+    return _config_reader().get_timeout()
 
 
 def get_implicit_wait() -> int:
     """Get implicit wait from settings"""
-    return _config_reader_instance.get_implicit_wait()
+    return _config_reader().get_implicit_wait()
 
 
 def get_test_data_file() -> str:
     """Get test data Excel file path"""
-    return _config_reader_instance.get_test_data_file()
+    return _config_reader().get_test_data_file()
 
 
 def get_results_config() -> Dict[str, Any]:
     """Get results configuration"""
-    return _config_reader_instance.get_results_config()
+    return _config_reader().get_results_config()
 
 
 def get_multi_url_demo_google_url() -> str:
-    return _config_reader_instance.get_multi_url_demo_google_url()
+    return _config_reader().get_multi_url_demo_google_url()
 
 
 def get_multi_url_demo_facebook_url() -> str:
-    return _config_reader_instance.get_multi_url_demo_facebook_url()
+    return _config_reader().get_multi_url_demo_facebook_url()
 
 
 def get_multi_url_demo_youtube_url() -> str:
-    return _config_reader_instance.get_multi_url_demo_youtube_url()
+    return _config_reader().get_multi_url_demo_youtube_url()
 
 
 def get_multi_url_demo_facebook_credentials() -> Dict[str, str]:
-    return _config_reader_instance.get_multi_url_demo_facebook_credentials()
+    return _config_reader().get_multi_url_demo_facebook_credentials()
@@ -0,0 +1,279 @@
+"""
+JavaScript Batch Library for Robot Framework
+รวมหลายคำสั่ง DOM (set value, dispatch event, click, อ่าน style/property) เป็น script เดียว
+แล้วส่งผ่าน WebDriver ครั้งเดียว (1 round trip) คืนผลทั้งหมดเป็น dict
+
+    Library    ../libraries/js_batch.py    WITH NAME    JSBatch
+
+    JSBatch.Begin JS Batch
+    JSBatch.Queue Dispatch Event    ${AUTH_ID_CARD_INPUT}    blur
+    JSBatch.Queue Get Style    id_card_error    ${AUTH_ID_CARD_ERROR}    display
+    ${result}=    JSBatch.Run JS Batch
+    Should Be Equal    ${result}[id_card_error]    none
+
+locator รองรับ id=..., css=..., xpath=... (แบบ locators.robot) หรือ id ตรง ๆ
+
+นับ WebDriver round trip ต่อ keyword ด้วย listener (เขียนผลเป็น JSON และสรุปบน console ตอนจบ run):
+
+    robot --pythonpath libraries --listener js_batch.RoundTripCounter:roundtrips.json tests/
+"""
+import json
+import sys
+import threading
+from typing import Any, Dict, List, Optional
+
+
+_LOCATOR_JS = """
+function $el(locator) {
+    var strategy = 'id', value = locator, i = locator.indexOf('=');
+    if (i > 0 && /^(id|css|xpath)$/.test(locator.substring(0, i).trim())) {
+        strategy = locator.substring(0, i).trim();
+        value = locator.substring(i + 1).trim();
+    }
+    var el = null;
+    if (strategy === 'id') {
+        el = document.getElementById(value);
+    } else if (strategy === 'css') {
+        el = document.querySelector(value);
+    } else {
+        el = document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    if (!el) { throw new Error('Element not found: ' + locator); }
+    return el;
+}
+"""
+
+
+def _js(value: Any) -> str:
+    """ค่า Python -> JavaScript literal (ผ่าน JSON จึงไม่ต้อง escape quote เอง)"""
+    return json.dumps(value, ensure_ascii=False)
+
+
+class JSBatch:
+    """Library for batching DOM operations into a single Execute JavaScript round trip"""
+
+    ROBOT_LIBRARY_SCOPE = 'GLOBAL'
+
+    def __init__(self):
+        self._ops: List[Dict[str, str]] = []
+
+    # ---------- batch building ----------
+
+    def begin_js_batch(self) -> None:
+        """Start a new batch (discards operations queued but not run)"""
+        self._ops = []
+
+    def queue_js(self, script: str, *args: Any, name: Optional[str] = None) -> None:
+        """
+        Queue a raw JavaScript snippet; ``arguments[0..n]`` inside the snippet are ``args``.
+        If ``name`` is given, the snippet's return value is stored under that key of the result.
+        """
+        call = f"(function() {{ {script}\n}}).apply(null, {_js(list(args))})"
+        self._queue(f"snippet {script[:40]!r}", call, name)
+
+    def queue_set_value(self, locator: str, value: Any, events: str = 'input') -> None:
+        """Queue setting an input's value, then dispatching ``events`` (comma separated, may be empty)"""
+        statements = [f"var el = $el({_js(locator)}); el.value = {_js(str(value))};"]
+        statements += [self._dispatch('el', e) for e in events.split(',') if e.strip()]
+        self._queue(f"set value {locator}", ' '.join(statements))
+
+    def queue_dispatch_event(self, locator: str, event: str) -> None:
+        """Queue dispatching a bubbling DOM event (e.g. ``blur``, ``input``, ``change``)"""
+        self._queue(f"dispatch {event} on {locator}", self._dispatch(f"$el({_js(locator)})", event))
+
+    def queue_set_property(self, locator: str, property_name: str, value: Any) -> None:
+        """Queue setting an element property (e.g. ``disabled`` = ${False})"""
+        self._queue(f"set {property_name} on {locator}", f"$el({_js(locator)})[{_js(property_name)}] = {_js(value)};")
+
+    def queue_click(self, locator: str) -> None:
+        """Queue a JavaScript click on the element"""
+        self._queue(f"click {locator}", f"$el({_js(locator)}).click();")
+
+    def queue_get_property(self, name: str, locator: str, property_name: str) -> None:
+        """Queue reading an element property (e.g. ``value``, ``disabled``) into ``result[name]``"""
+        self._queue(f"get {property_name} of {locator}", f"$el({_js(locator)})[{_js(property_name)}]", name)
+
+    def queue_get_style(self, name: str, locator: str, style_property: str) -> None:
+        """Queue reading an inline style property (e.g. ``display``) into ``result[name]``"""
+        self._queue(f"get style {style_property} of {locator}",
+                    f"$el({_js(locator)}).style[{_js(style_property)}]", name)
+
+    # ---------- execution ----------
+
+    def run_js_batch(self) -> Dict[str, Any]:
+        """
+        Run all queued operations in order as one script (one WebDriver round trip).
+        Stops at the first failing operation and fails with its description.
+        Returns a dict of named results.
+        """
+        ops, self._ops = self._ops, []
+        if not ops:
+            return {}
+        outcome = self._selenium().driver.execute_script(self.build_script(ops)) or {}
+        error = outcome.get('error')
+        if error:
+            raise AssertionError(f"JS batch operation {error['index'] + 1}/{len(ops)} "
+                                 f"({ops[error['index']]['label']}) failed: {error['message']}")
+        return outcome.get('results') or {}
+
+    def execute_js_batch(self, *snippets: str) -> Dict[str, Any]:
+        """Run several raw JavaScript snippets in one round trip (replaces consecutive Execute JavaScript calls)"""
+        self.begin_js_batch()
+        for snippet in snippets:
+            self.queue_js(snippet)
+        return self.run_js_batch()
+
+    @staticmethod
+    def build_script(ops: List[Dict[str, str]]) -> str:
+        """script เดียวที่รันทุก operation ตามลำดับ; หยุดที่ operation แรกที่ error"""
+        body = []
+        for index, op in enumerate(ops):
+            statement = f"$r[{_js(op['name'])}] = {op['code']};" if op['name'] else op['code']
+            body.append(f"try {{ {statement} }} catch (e) {{ return {{results: $r, error: "
+                        f"{{index: {index}, message: String(e && e.message || e)}}}}; }}")
+        return _LOCATOR_JS + "var $r = {};\n" + "\n".join(body) + "\nreturn {results: $r};"
+
+    # ---------- internal helpers ----------
+
+    def _queue(self, label: str, code: str, name: Optional[str] = None) -> None:
+        self._ops.append({'label': label, 'code': code, 'name': name})
+
+    @staticmethod
+    def _dispatch(target: str, event: str) -> str:
+        return f"{target}.dispatchEvent(new Event({_js(event.strip())}, {{bubbles: true}}));"
+
+    @staticmethod
+    def _selenium():
+        from robot.libraries.BuiltIn import BuiltIn
+        return BuiltIn().get_library_instance('SeleniumLibrary')
+
+
+class RoundTripCounter:
+    """
+    Robot listener (API v2) ที่นับ WebDriver command (= HTTP round trip) ระหว่างแต่ละ keyword
+    นับแบบ inclusive: round trip ของ keyword ลูกถูกนับให้ keyword แม่ทุกชั้นด้วย
+    """
+
+    ROBOT_LISTENER_API_VERSION = 2
+
+    def __init__(self, output: str = 'roundtrips.json'):
+        self._output = output
+        self._stack: List[str] = []
+        self._lock = threading.Lock()
+        self.stats: Dict[str, Dict[str, int]] = {}
+        self._original_execute = None
+        self._patch_webdriver()
+
+    def start_keyword(self, name, attrs):
+        self._stack.append(name)
+        with self._lock:
+            self._entry(name)['calls'] += 1
+
+    def end_keyword(self, name, attrs):
+        if self._stack:
+            self._stack.pop()
+
+    def close(self):
+        self._unpatch_webdriver()
+        with open(self._output, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2, ensure_ascii=False)
+        rows = [r for r in self.report() if r['round_trips']]
+        sys.__stdout__.write(f"WebDriver round trips per keyword ({self._output}):\n")
+        for row in rows[:20]:
+            sys.__stdout__.write(f"  {row['round_trips']:>6} {row['per_call']:>8.1f}/call  {row['keyword']}\n")
+
+    def report(self) -> List[Dict[str, Any]]:
+        """[{keyword, calls, round_trips, per_call}] เรียงจาก round trip มากไปน้อย"""
+        with self._lock:
+            rows = [{'keyword': name, 'calls': s['calls'], 'round_trips': s['round_trips'],
+                     'per_call': s['round_trips'] / s['calls'] if s['calls'] else 0.0}
+                    for name, s in self.stats.items()]
+        rows.sort(key=lambda r: (-r['round_trips'], r['keyword']))
+        return rows
+
+    def record_round_trip(self) -> None:
+        with self._lock:
+            for name in set(self._stack):
+                self._entry(name)['round_trips'] += 1
+
+    def _entry(self, name: str) -> Dict[str, int]:
+        entry = self.stats.get(name)
+        if entry is None:
+            entry = self.stats[name] = {'calls': 0, 'round_trips': 0}
+        return entry
+
+    def _patch_webdriver(self) -> None:
+        """ทุก command ของ Selenium ผ่าน WebDriver.execute จุดเดียว จึงห่อ method นี้เพื่อนับ"""
+        try:
+            from selenium.webdriver.remote.webdriver import WebDriver
+        except ImportError:
+            return
+        original = WebDriver.execute
+        counter = self
+
+        def execute(driver, driver_command, params=None):
+            counter.record_round_trip()
+            return original(driver, driver_command, params)
+
+        WebDriver.execute = execute
+        self._original_execute = original
+
+    def _unpatch_webdriver(self) -> None:
+        if self._original_execute is not None:
+            from selenium.webdriver.remote.webdriver import WebDriver
+            WebDriver.execute = self._original_execute
+            self._original_execute = None
+
+
+# Module-level keyword wrappers (module-style library)
+_js_batch_instance = JSBatch()
+
+
+def begin_js_batch() -> None:
+    """Start a new batch (discards operations queued but not run)"""
+    _js_batch_instance.begin_js_batch()
+
+
+def queue_js(script: str, *args: Any, name: Optional[str] = None) -> None:
+    """Queue a raw JavaScript snippet (``arguments[i]`` = args); ``name`` stores its return value"""
+    _js_batch_instance.queue_js(script, *args, name=name)
+
+
+def queue_set_value(locator: str, value: Any, events: str = 'input') -> None:
+    """Queue setting an input's value, then dispatching ``events``"""
+    _js_batch_instance.queue_set_value(locator, value, events)
+
+
+def queue_dispatch_event(locator: str, event: str) -> None:
+    """Queue dispatching a bubbling DOM event"""
+    _js_batch_instance.queue_dispatch_event(locator, event)
+
+
+def queue_set_property(locator: str, property_name: str, value: Any) -> None:
+    """Queue setting an element property"""
+    _js_batch_instance.queue_set_property(locator, property_name, value)
+
+
+def queue_click(locator: str) -> None:
+    """Queue a JavaScript click on the element"""
+    _js_batch_instance.queue_click(locator)
+
+
+def queue_get_property(name: str, locator: str, property_name: str) -> None:
+    """Queue reading an element property into ``result[name]``"""
+    _js_batch_instance.queue_get_property(name, locator, property_name)
+
+
+def queue_get_style(name: str, locator: str, style_property: str) -> None:
+    """Queue reading an inline style property into ``result[name]``"""
+    _js_batch_instance.queue_get_style(name, locator, style_property)
+
+
+def run_js_batch() -> Dict[str, Any]:
+    """Run all queued operations as one script; returns the named results"""
+    return _js_batch_instance.run_js_batch()
+
+
+def execute_js_batch(*snippets: str) -> Dict[str, Any]:
+    """Run several raw JavaScript snippets in one round trip"""
+    return _js_batch_instance.execute_js_batch(*snippets)